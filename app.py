@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
-from employ_analysis import load_data
 from pathlib import Path
 
 st.set_page_config(
@@ -10,9 +9,6 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# 데이터 전처리 실행
-load_data.load_processed_data()
-
 # --- 페이지 시작 ---
 
 # 1. 제목 및 소개
@@ -40,11 +40,11 @@ area_data = {
     "제주특별자치도": 1849.0
 }
 
-# 시도명 통일 (GeoJSON과 데이터프레임 매핑을 위해)
+# 시도명 통일 (GeoJSON과 데이터프레임 매핑을 위해, 키는 GeoJSON의 name_eng 속성과 같음)
 province_geojson_name_map = {
     "Seoul": "서울특별시", "Busan": "부산광역시", "Daegu": "대구광역시",
     "Incheon": "인천광역시", "Gwangju": "광주광역시", "Daejeon": "대전광역시",
-    "Ulsan": "울산광역시", "Sejong": "세종특별자치시", "Gyeonggi-do": "경기도",
+    "Ulsan": "울산광역시", "Sejongsi": "세종특별자치시", "Gyeonggi-do": "경기도",
     "Gangwon-do": "강원도", "Chungcheongbuk-do": "충청북도", "Chungcheongnam-do": "충청남도",
     "Jeollabuk-do": "전라북도", "Jeollanam-do": "전라남도", "Gyeongsangbuk-do": "경상북도",
     "Gyeongsangnam-do": "경상남도", "Jeju-do": "제주특별자치도"
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+from employ_analysis.data_registry import register_dataset, dataset_path, get_dataset
+
+# 큐브 축 이름 -> 원본 CSV 컬럼명
+AXIS_COLUMNS = {
+    'region': '시도별',
+    'sex': '성별',
+    'type': '장애유형별',
+    'year': '연도',
+}
+
+class PopulationCube:
+    """
+    장애인구 통계를 (시도 x 성별 x 장애유형 x 연도) 정수 배열로 담는 큐브입니다.
+
+    각 축의 라벨은 등장 순서대로 한 번만 저장하고(사전 인코딩), 값은 라벨 위치로 찾습니다.
+    select/exclude는 배열의 일부를 가리키는 새 큐브를 반환하므로, 차트마다 DataFrame을 걸러내고
+    melt 하는 대신 필요한 부분만 바로 꺼내 쓸 수 있습니다.
+
+    예: cube.select(region='전국', sex='계').exclude('type', ['합계']).values  # (장애유형, 연도) 배열
+    """
+
+    def __init__(self, values, axes, labels):
+        self.values = values
+        self.axes = tuple(axes)
+        # 연도 축은 정수 배열, 나머지 축은 문자열(object) 배열
+        self.labels = {axis: np.asarray(labels[axis], dtype=np.int64 if axis == 'year' else object) for axis in self.axes}
+        self._positions = {axis: {label: i for i, label in enumerate(self.labels[axis])} for axis in self.axes}
+
+    @classmethod
+    def from_frame(cls, df):
+        """load_disabled_population_data()가 반환한 넓은 형태의 DataFrame으로 큐브를 만듭니다."""
+        label_columns = [AXIS_COLUMNS[axis] for axis in ['region', 'sex', 'type']]
+        year_columns = [col for col in df.columns if col not in label_columns]
+
+        codes, labels = [], {}
+        for axis, col in zip(['region', 'sex', 'type'], label_columns):
+            axis_codes, axis_labels = pd.factorize(df[col].astype(object), sort=False)
+            codes.append(axis_codes)
+            labels[axis] = list(axis_labels)
+        labels['year'] = [int(year) for year in year_columns]
+
+        shape = tuple(len(labels[axis]) for axis in ['region', 'sex', 'type', 'year'])
+        values = np.zeros(shape, dtype=np.int64)
+        # 없는 조합은 0명으로 둠
+        values[codes[0], codes[1], codes[2], :] = df[year_columns].to_numpy(dtype=np.int64)
+        return cls(values, ['region', 'sex', 'type', 'year'], labels)
+
+    def _axis_index(self, axis):
+        if axis not in self.axes:
+            raise KeyError(f"큐브에 '{axis}' 축이 없습니다. (축: {self.axes})")
+        return self.axes.index(axis)
+
+    def _positions_of(self, axis, labels):
+        try:
+            return [self._positions[axis][label] for label in labels]
+        except KeyError as e:
+            raise KeyError(f"'{axis}' 축에 {e} 라벨이 없습니다.") from None
+
+    def select(self, **selection):
+        """
+        축별로 라벨을 골라 새 큐브를 반환합니다.
+        라벨 하나를 주면 그 축이 없어지고(배열 뷰), 라벨 목록을 주면 축이 그 순서대로 남습니다.
+
+        예: cube.select(region='전국', type='합계')  # (성별, 연도) 큐브
+        """
+        for axis in selection:
+            self._axis_index(axis)
+
+        index = [slice(None)] * len(self.axes)
+        axes, labels = [], {}
+        for i, axis in enumerate(self.axes):
+            if axis not in selection:
+                axes.append(axis)
+                labels[axis] = self.labels[axis]
+                continue
+            chosen = selection[axis]
+            if isinstance(chosen, (list, tuple, np.ndarray)):
+                index[i] = self._positions_of(axis, chosen)
+                axes.append(axis)
+                labels[axis] = list(chosen)
+            else:
+                index[i] = self._positions_of(axis, [chosen])[0]
+
+        values = self.values
+        # 목록 선택은 축마다 따로 적용해야 여러 축을 함께 골라도 모양이 유지됨
+        for i in range(len(index) - 1, -1, -1):
+            values = values[(slice(None),) * i + (index[i],)]
+        return PopulationCube(values, axes, labels)
+
+    def exclude(self, axis, labels):
+        """주어진 라벨을 뺀 나머지를 원래 순서대로 남긴 새 큐브를 반환합니다. (예: '합계', '전국' 제외)"""
+        excluded = set(labels)
+        return self.select(**{axis: [label for label in self.labels[axis] if label not in excluded]})
+
+    def sum(self, axis):
+        """주어진 축을 따라 합계를 낸 새 큐브를 반환합니다."""
+        i = self._axis_index(axis)
+        axes = [a for a in self.axes if a != axis]
+        return PopulationCube(self.values.sum(axis=i), axes, self.labels)
+
+    def share(self, axis):
+        """주어진 축의 합계에 대한 비율(0~1) 배열을 반환합니다. 합계가 0이면 NaN이 됩니다."""
+        i = self._axis_index(axis)
+        totals = self.values.sum(axis=i, keepdims=True)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.values / totals
+
+    def to_frame(self, value_name='인구수'):
+        """남은 축을 원본 컬럼명(시도별, 성별, 장애유형별, 연도)으로 가진 긴 형태의 DataFrame을 반환합니다."""
+        index = pd.MultiIndex.from_product([self.labels[axis] for axis in self.axes],
+                                           names=[AXIS_COLUMNS[axis] for axis in self.axes])
+        return pd.DataFrame({value_name: self.values.ravel()}, index=index).reset_index()
+
+def _load_population_cube():
+    df = get_dataset('population')
+    return None if df is None else PopulationCube.from_frame(df)
+
+# 원본 CSV가 바뀌면 데이터 레지스트리가 큐브도 다시 만듦
+register_dataset('population_cube', dataset_path('population'), _load_population_cube, shareable=False)
+
+def load_population_cube():
+    """프로세스 전체에서 공유하는 장애인구 큐브를 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    return get_dataset('population_cube')
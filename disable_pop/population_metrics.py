@@ -0,0 +1,167 @@
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+from employ_analysis.load_data import results_dir
+from employ_analysis.data_registry import register_dataset, get_dataset, get_derived
+from .constants import province_coords, area_data
+from .population_cube import load_population_cube
+
+# 시도별 장애인구 파생 지표 표 (results/population_metrics.parquet)
+# 지도 등 차트가 그릴 때마다 밀도, 좌표 등을 다시 계산하지 않도록 (시도, 연도)마다 아래 지표를 미리 계산해 둡니다.
+# 원본 CSV(korean_disabled_population_statistics.csv)에 새 연도 컬럼만 추가되었으면 그 연도의 행만 계산하여 덧붙이고,
+# 기존 연도의 값이나 시도/장애유형이 바뀌었으면 전체를 다시 계산합니다. (연도별 해시를 population_metrics.json에 기록)
+#
+# 컬럼: 시도별, 연도, 인구수, 면적, 인구밀도, 전국비율, 전년대비증감, 전년대비증감률, 연평균증가율, 위도, 경도, '<장애유형> 비율'...
+# - 인구수는 성별 계, 장애유형 합계이며, 면적(km²)이나 좌표가 없는 시도(예: 전국)는 해당 값이 NaN입니다.
+# - 연평균증가율(CAGR)은 첫 연도부터 그 연도까지이며, 첫 연도의 전년 대비 값과 연평균증가율은 NaN입니다.
+
+metrics_path = os.path.join(results_dir, 'population_metrics.parquet')
+metrics_manifest_path = os.path.join(results_dir, 'population_metrics.json')
+
+# 지표 계산 방식이나 컬럼이 바뀌면 올립니다. (전체를 다시 계산함)
+METRICS_SCHEMA_VERSION = 1
+
+# 원본의 새 시도 이름 -> 면적/좌표/경계 데이터의 이름
+region_aliases = {
+    '강원특별자치도': '강원도',
+    '전북특별자치도': '전라북도'
+}
+
+def _region_arrays(cube):
+    """성별 계의 (시도, 장애유형, 연도) 인구수 배열과 시도별 면적, 위도, 경도 배열을 반환합니다."""
+    counts = cube.select(sex='계')
+    names = pd.Series(counts.labels['region']).replace(region_aliases)
+    area = names.map(area_data).to_numpy(dtype=float)
+    coords = names.map(province_coords)
+    lat = coords.map(lambda coord: coord['lat'] if isinstance(coord, dict) else np.nan).to_numpy(dtype=float)
+    lon = coords.map(lambda coord: coord['lon'] if isinstance(coord, dict) else np.nan).to_numpy(dtype=float)
+    return counts, area, lat, lon
+
+def compute_region_metrics(cube, years=None):
+    """
+    큐브로 (시도, 연도)별 파생 지표 DataFrame을 만듭니다. years를 주면 그 연도의 행만 만듭니다.
+    (전년 대비, 연평균증가율은 큐브의 전체 연도로 계산하므로 새 연도만 계산해도 전체를 계산한 결과와 같음)
+    """
+    counts, area, lat, lon = _region_arrays(cube)
+    regions = counts.labels['region']
+    all_years = counts.labels['year']
+    types = [label for label in counts.labels['type'] if label != '합계']
+
+    population = counts.select(type='합계').values.astype(float)  # (시도, 연도)
+    by_type = counts.select(type=types).values  # (시도, 장애유형, 연도)
+    national = population[list(regions).index('전국')] if '전국' in regions else population.sum(axis=0)
+
+    year_index = np.arange(len(all_years)) if years is None else np.searchsorted(all_years, years)
+    previous = np.full(population.shape, np.nan)
+    previous[:, 1:] = population[:, :-1]
+    elapsed = (all_years - all_years[0]).astype(float)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        density = population / area[:, None]
+        share = population / national
+        change = population - previous
+        change_rate = change / previous
+        cagr = np.where(elapsed > 0, (population / population[:, :1]) ** (1 / np.where(elapsed > 0, elapsed, 1)) - 1, np.nan)
+        type_shares = by_type / population[:, None, :]
+
+    # (시도, 연도) 순서로 펼침
+    pick = (slice(None), year_index)
+    n_regions, n_years = len(regions), len(year_index)
+    table = pd.DataFrame({
+        '시도별': np.repeat(np.asarray(regions, dtype=object), n_years),
+        '연도': np.tile(all_years[year_index], n_regions),
+        '인구수': population[pick].astype(np.int64).ravel(),
+        '면적': np.repeat(area, n_years),
+        '인구밀도': density[pick].ravel(),
+        '전국비율': share[pick].ravel(),
+        '전년대비증감': change[pick].ravel(),
+        '전년대비증감률': change_rate[pick].ravel(),
+        '연평균증가율': cagr[pick].ravel(),
+        '위도': np.repeat(lat, n_years),
+        '경도': np.repeat(lon, n_years),
+    })
+    for i, disability_type in enumerate(types):
+        table[f'{disability_type} 비율'] = type_shares[:, i, year_index].ravel()
+    return table
+
+def _fingerprint(cube):
+    """시도/장애유형 라벨의 해시와 연도별 값의 해시를 반환합니다."""
+    counts = cube.select(sex='계')
+    labels = json.dumps([list(counts.labels['region']), list(counts.labels['type'])], ensure_ascii=False)
+    year_hashes = {str(year): hashlib.sha256(np.ascontiguousarray(counts.values[..., i]).tobytes()).hexdigest()
+                   for i, year in enumerate(counts.labels['year'])}
+    return hashlib.sha256(labels.encode('utf-8')).hexdigest(), year_hashes
+
+def _load_metrics_manifest():
+    try:
+        with open(metrics_manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def refresh_population_metrics(force=False):
+    """
+    results/population_metrics.parquet를 원본 장애인구 데이터에 맞게 갱신합니다.
+    새 연도만 추가되었으면 그 연도의 행만 계산하여 덧붙이고, 기존 연도나 라벨이 바뀌었으면(또는 force=True) 전체를 다시 계산합니다.
+
+    Returns:
+        list | None: 새로 계산한 연도 목록. 이미 최신이면 빈 리스트, 장애인구 데이터가 없으면 None.
+    """
+    cube = load_population_cube()
+    if cube is None:
+        return None
+    labels_hash, year_hashes = _fingerprint(cube)
+    all_years = [int(year) for year in year_hashes]
+
+    manifest = _load_metrics_manifest()
+    recorded = {} if manifest is None else manifest.get('years', {})
+    reusable = (not force and manifest is not None and os.path.exists(metrics_path)
+                and manifest.get('schema_version') == METRICS_SCHEMA_VERSION
+                and manifest.get('labels') == labels_hash
+                and all(year_hashes.get(year) == digest for year, digest in recorded.items()))
+    new_years = [year for year in all_years if str(year) not in recorded]
+    # 기존 연도보다 앞선 연도가 추가되면 연평균증가율의 기준 연도가 바뀌므로 전체를 다시 계산
+    if reusable and recorded and new_years and min(new_years) < max(int(year) for year in recorded):
+        reusable = False
+
+    if reusable:
+        if not new_years:
+            return []
+        table = pd.concat([pd.read_parquet(metrics_path), compute_region_metrics(cube, new_years)], ignore_index=True)
+        # 시도는 원본 순서, 연도는 오름차순으로 정렬
+        region_order = {region: i for i, region in enumerate(cube.labels['region'])}
+        table = table.sort_values(['시도별', '연도'], key=lambda col: col.map(region_order) if col.name == '시도별' else col,
+                                  kind='stable', ignore_index=True)
+    else:
+        new_years = all_years
+        table = compute_region_metrics(cube)
+
+    tmp_path = metrics_path + '.tmp'
+    table.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, metrics_path)
+    with open(metrics_manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({'schema_version': METRICS_SCHEMA_VERSION, 'labels': labels_hash, 'years': year_hashes}, f, indent=1)
+    return new_years
+
+def _read_metrics():
+    return pd.read_parquet(metrics_path) if os.path.exists(metrics_path) else None
+
+register_dataset('population_metrics', metrics_path, _read_metrics, shareable=False)
+
+def load_population_metrics():
+    """
+    (시도, 연도)별 파생 지표 표를 반환합니다. 데이터가 없으면 None을 반환합니다.
+    저장된 표가 없거나 원본보다 오래되었으면(run_analysis.py를 실행하기 전) 원본 큐브로 계산한 표를 함께 씁니다.
+    반환되는 DataFrame은 여러 세션이 함께 쓰므로 직접 수정하지 말아야 합니다.
+    """
+    cube = load_population_cube()
+    if cube is None:
+        return None
+    table = get_dataset('population_metrics')
+    manifest = _load_metrics_manifest()
+    if (table is not None and manifest is not None and manifest.get('schema_version') == METRICS_SCHEMA_VERSION
+            and (manifest.get('labels'), manifest.get('years')) == get_derived('population_cube', 'metrics_fingerprint', _fingerprint)):
+        return table
+    return get_derived('population_cube', 'region_metrics', compute_region_metrics)
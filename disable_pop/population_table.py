@@ -0,0 +1,40 @@
+from employ_analysis.analytics_db import is_database_stale, query
+from employ_analysis.data_registry import get_derived
+
+# 장애인구 원본 데이터 표 (pages/disabled_population_statistics.py의 '원본 데이터' 탭)
+# 분석 DB가 CSV보다 최신이면 고른 시도와 연도의 행만 조회하고, 없거나 오래되었으면 공유 데이터 레지스트리의 CSV 데이터를 (시도, 성별, 장애유형, 연도) 행으로 펼쳐 사용
+
+label_columns = ['시도별', '성별', '장애유형별']
+
+def _long_rows(df):
+    rows = df.melt(id_vars=label_columns, var_name='연도', value_name='인구수')
+    rows['연도'] = rows['연도'].astype(int)
+    return rows
+
+def _population_rows():
+    """CSV 데이터를 긴 형태로 펼친 표 (데이터가 바뀌기 전까지 한 번만 만듦)"""
+    return get_derived('population', 'long_rows', _long_rows)
+
+def population_regions():
+    """데이터에 있는 시도 목록을 원본 순서대로 반환합니다. 데이터가 없으면 빈 리스트를 반환합니다."""
+    if not is_database_stale(['population']):
+        return list(query('SELECT "시도별" FROM population GROUP BY "시도별" ORDER BY MIN(rowid)')['시도별'])
+    rows = _population_rows()
+    return [] if rows is None else list(rows['시도별'].astype(object).unique())
+
+def population_years():
+    """데이터에 있는 연도 목록을 오름차순으로 반환합니다. 데이터가 없으면 빈 리스트를 반환합니다."""
+    if not is_database_stale(['population']):
+        return [int(year) for year in query('SELECT DISTINCT "연도" FROM population ORDER BY "연도"')['연도']]
+    rows = _population_rows()
+    return [] if rows is None else sorted(int(year) for year in rows['연도'].unique())
+
+def population_table(region, year):
+    """선택한 시도와 연도의 (시도별, 성별, 장애유형별, 연도, 인구수) 행을 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    if not is_database_stale(['population']):
+        return query('SELECT "시도별", "성별", "장애유형별", "연도", "인구수" FROM population '
+                     'WHERE "시도별" = ? AND "연도" = ? ORDER BY rowid', [region, int(year)])
+    rows = _population_rows()
+    if rows is None:
+        return None
+    return rows[(rows['시도별'] == region) & (rows['연도'] == int(year))].reset_index(drop=True)
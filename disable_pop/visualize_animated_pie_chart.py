@@ -1,110 +1,116 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from .constants import province_geojson_name_map, reverse_province_geojson_name_map, province_coords, area_data
-
-def plot_animated_pie_chart(df_national_total):
-
-    # Initialize session state for options
-    if 'pie_chart_options' not in st.session_state:
-        st.session_state.pie_chart_options = {
-            'threshold_percentage': 4.0,
-            'animation_duration': 400,
-            'selected_palette': 'Alphabet'
-        }
-
-    df_national_total_filtered_all_years = df_national_total[df_national_total['장애유형별'] != '합계'].copy()
-    df_national_total_melted = df_national_total_filtered_all_years.melt(id_vars=['시도별', '성별', '장애유형별'],
-                                                                          var_name='연도', value_name='인구수')
-    df_national_total_melted['연도'] = df_national_total_melted['연도'].astype(int)
-
-    years = sorted(df_national_total_melted['연도'].unique())
-
-    # Use options from session state
-    options = st.session_state.pie_chart_options
-    threshold_percentage = options['threshold_percentage'] / 100
-    animation_duration = options['animation_duration']
-    selected_palette = options['selected_palette']
-
-    color_palettes = [
-        "Plotly", "D3", "G10", "T10", "Alphabet", "Dark24", "Light24",
-        "Set1", "Set2", "Set3", "Pastel1", "Pastel2"
-    ]
-
-    all_disability_types = sorted(df_national_total_melted['장애유형별'].unique())
+from employ_analysis.data_registry import get_derived
+from employ_analysis.figure_cache import cached_figure
+from employ_analysis.hover_text import format_template
+
+def group_small_slices(cube, threshold_percentage):
+    """
+    전국, 성별 계의 장애유형별 인구수에서 연도마다 비율이 threshold_percentage(%)보다 작은 항목을 '기타'로 묶습니다.
+    모든 연도를 (장애유형, 연도) 배열 하나로 한 번에 계산하며, 색상이나 애니메이션 속도와는 관계가 없습니다.
+
+    Returns:
+        dict: {'disability_types': 묶기 전 장애유형 목록(정렬, 끝에 '기타'),
+               'slices': (연도, 장애유형별) 순으로 정렬한 긴 형태의 DataFrame(연도, 장애유형별, 인구수, hover_detail)}
+    """
+    # 전국, 성별 계에서 '합계'를 뺀 (장애유형, 연도) 인구수
+    national = cube.select(region='전국', sex='계').exclude('type', ['합계'])
+    counts = national.values
+    disability_types = np.asarray(national.labels['type'], dtype=object)
+    years = national.labels['year']
+
+    totals = counts.sum(axis=0)
+    shares = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+    # 인구가 없는 해는 묶지 않음
+    small = (shares < threshold_percentage / 100) & (totals > 0)
+
+    # '기타'의 인구수와 상세 호버 텍스트 (묶인 항목을 원래 순서대로 나열)
+    has_other = small.any(axis=0)
+    other_counts = np.where(small, counts, 0).sum(axis=0)
+    detail_lines = format_template("<br>- {type}: {count:,}명 ({share:.1%})",
+                                   type=disability_types[:, None], count=counts, share=shares)
+    other_details = "<br>--- 기타 상세 ---" + np.where(small, detail_lines, '').sum(axis=0)
+
+    type_index, year_index = np.nonzero(~small)
+    kept = pd.DataFrame({
+        '연도': years[year_index],
+        '장애유형별': disability_types[type_index],
+        '인구수': counts[type_index, year_index],
+        'hover_detail': '',
+    })
+    other = pd.DataFrame({
+        '연도': years[has_other],
+        '장애유형별': '기타',
+        '인구수': other_counts[has_other],
+        'hover_detail': other_details[has_other],
+    })
+    slices = pd.concat([kept, other], ignore_index=True).sort_values(['연도', '장애유형별'], kind='stable', ignore_index=True)
+
+    # 색상은 묶이기 전 장애유형 순서로 정함 (임계값이 바뀌어도 같은 장애유형은 같은 색)
+    all_disability_types = sorted(disability_types)
     if "기타" not in all_disability_types:
         all_disability_types.append("기타")
+    return {'disability_types': all_disability_types, 'slices': slices}
+
+def pie_slices(threshold_percentage):
+    """
+    등록된 장애인구 데이터의 group_small_slices() 결과를 임계값마다 한 번만 만들어 함께 씁니다.
+    (색상 팔레트나 애니메이션 속도만 바꾸면 다시 계산하지 않음) 데이터가 없으면 None을 반환합니다.
+    """
+    return get_derived('population_cube', ('pie_slices', threshold_percentage),
+                       lambda cube: group_small_slices(cube, threshold_percentage))
+
+color_palettes = [
+    "Plotly", "D3", "G10", "T10", "Alphabet", "Dark24", "Light24",
+    "Set1", "Set2", "Set3", "Pastel1", "Pastel2"
+]
+
+# "차트 옵션"의 기본값
+default_pie_chart_options = {
+    'threshold_percentage': 4.0,
+    'animation_duration': 400,
+    'selected_palette': 'Alphabet'
+}
+
+# 기본 임계값과 속도로 팔레트마다 미리 만들어 둠 (나머지 옵션 조합은 고를 때 직접 만듦)
+@cached_figure('population', params=lambda: [{'selected_palette': palette} for palette in color_palettes])
+def create_animated_pie_chart(threshold_percentage=4.0, animation_duration=400, selected_palette='Alphabet'):
+    """등록된 장애인구 데이터로 만든 장애유형별 비율 파이 차트 Figure를 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    grouped = pie_slices(threshold_percentage)
+    if grouped is None:
+        return None
+    return style_animated_pie_chart(grouped, animation_duration, selected_palette)
+
+def build_animated_pie_chart(cube, threshold_percentage, animation_duration, selected_palette):
+    """threshold_percentage는 '기타'로 묶는 비율(%)입니다."""
+    return style_animated_pie_chart(group_small_slices(cube, threshold_percentage), animation_duration, selected_palette)
+
+def _pie_trace(year_data, color_map):
+    return go.Pie(labels=year_data['장애유형별'],
+                  values=year_data['인구수'],
+                  hole=0.3,
+                  textposition='inside',
+                  textinfo='percent+label',
+                  marker=dict(colors=year_data['장애유형별'].map(color_map), line=dict(color='#000000', width=1)),
+                  customdata=year_data[['hover_detail']].values,
+                  hovertemplate="<b>%{label}</b><br>인구수: %{value:,}<br>비율: %{percent}%{customdata[0]}")
+
+def style_animated_pie_chart(grouped, animation_duration, selected_palette):
+    """group_small_slices()로 묶은 결과에 색상과 애니메이션 속도만 입혀 Figure를 만듭니다."""
+    slices = grouped['slices']
+    years = list(slices['연도'].unique())
 
     colors = getattr(px.colors.qualitative, selected_palette)
-    color_map = {disability_type: colors[i % len(colors)] for i, disability_type in enumerate(all_disability_types)}
-
-    frames = []
-    for year in years:
-        frame_data = df_national_total_melted[df_national_total_melted['연도'] == year].copy()
-        
-        total_population_year = frame_data['인구수'].sum()
-
-        if total_population_year > 0:
-            frame_data['percentage'] = frame_data['인구수'] / total_population_year
-            small_slices = frame_data[frame_data['percentage'] < threshold_percentage]
-            
-            if not small_slices.empty:
-                other_sum = small_slices['인구수'].sum()
-                detail_lines = [f"<br>- {row['장애유형별']}: {row['인구수']:,}명 ({row['percentage']:.1%})" for idx, row in small_slices.iterrows()]
-                other_detail_info = "<br>--- 기타 상세 ---" + "".join(detail_lines)
-
-                frame_data = frame_data[frame_data['percentage'] >= threshold_percentage]
-                frame_data = pd.concat([frame_data, pd.DataFrame([{'장애유형별': '기타', '인구수': other_sum, 'hover_detail': other_detail_info}])], ignore_index=True)
-            else:
-                frame_data['hover_detail'] = ""
-        else:
-            frame_data['hover_detail'] = ""
-        
-        frame_data = frame_data.sort_values(by='장애유형별')
-        pie_colors = [color_map[dt] for dt in frame_data['장애유형별']]
-
-        frames.append(go.Frame(data=[go.Pie(labels=frame_data['장애유형별'],
-                                            values=frame_data['인구수'],
-                                            hole=0.3,
-                                            textposition='inside',
-                                            textinfo='percent+label',
-                                            marker=dict(colors=pie_colors, line=dict(color='#000000', width=1)),
-                                            customdata=frame_data[['hover_detail']].values,
-                                            hovertemplate="<b>%{label}</b><br>인구수: %{value:,}<br>비율: %{percent}%{customdata[0]}")],
-                                name=str(year)))
-
-    initial_year_data = df_national_total_melted[df_national_total_melted['연도'] == years[0]].copy()
-    
-    total_population_initial = initial_year_data['인구수'].sum()
-    if total_population_initial > 0:
-        initial_year_data['percentage'] = initial_year_data['인구수'] / total_population_initial
-        small_slices_initial = initial_year_data[initial_year_data['percentage'] < threshold_percentage]
-        
-        if not small_slices_initial.empty:
-            other_sum_initial = small_slices_initial['인구수'].sum()
-            detail_lines_initial = [f"<br>- {row['장애유형별']}: {row['인구수']:,}명 ({row['percentage']:.1%})" for idx, row in small_slices_initial.iterrows()]
-            other_detail_info_initial = "<br>--- 기타 상세 ---" + "".join(detail_lines_initial)
-
-            initial_year_data = initial_year_data[initial_year_data['percentage'] >= threshold_percentage]
-            initial_year_data = pd.concat([initial_year_data, pd.DataFrame([{'장애유형별': '기타', '인구수': other_sum_initial, 'hover_detail': other_detail_info_initial}])], ignore_index=True)
-        else:
-            initial_year_data['hover_detail'] = ""
-    else:
-        initial_year_data['hover_detail'] = ""
+    color_map = {disability_type: colors[i % len(colors)] for i, disability_type in enumerate(grouped['disability_types'])}
 
-    initial_year_data = initial_year_data.sort_values(by='장애유형별')
-    initial_pie_colors = [color_map[dt] for dt in initial_year_data['장애유형별']]
+    frames = [go.Frame(data=[_pie_trace(year_data, color_map)], name=str(year))
+              for year, year_data in slices.groupby('연도', sort=False)]
 
     fig_pie_animated = go.Figure(
-        data=[go.Pie(labels=initial_year_data['장애유형별'],
-                     values=initial_year_data['인구수'],
-                     hole=0.3,
-                     textposition='inside',
-                     textinfo='percent+label',
-                     marker=dict(colors=initial_pie_colors, line=dict(color='#000000', width=1)),
-                     customdata=initial_year_data[['hover_detail']].values,
-                     hovertemplate="<b>%{label}</b><br>인구수: %{value:,}<br>비율: %{percent}%{customdata[0]}")],
+        data=[_pie_trace(slices[slices['연도'] == years[0]], color_map)],
         layout=go.Layout(
             title_text='전국 장애유형별 인구 비율',
             legend=dict(x=1.02, y=1, xanchor='left', yanchor='top'),
@@ -135,6 +141,23 @@ def plot_animated_pie_chart(df_national_total):
     )]
 
     fig_pie_animated.update_layout(sliders=sliders)
+    return fig_pie_animated
+
+def plot_animated_pie_chart(cube=None):
+
+    # Initialize session state for options
+    if 'pie_chart_options' not in st.session_state:
+        st.session_state.pie_chart_options = dict(default_pie_chart_options)
+
+    # Use options from session state
+    options = st.session_state.pie_chart_options
+    chart_options = (options['threshold_percentage'], options['animation_duration'], options['selected_palette'])
+
+    # cube를 주지 않으면 등록된 데이터의 Figure(미리 만들어 둔 것이 있으면 그것)를 사용
+    if cube is None:
+        fig_pie_animated = create_animated_pie_chart(*chart_options)
+    else:
+        fig_pie_animated = build_animated_pie_chart(cube, *chart_options)
     st.plotly_chart(fig_pie_animated, use_container_width=True)
 
     with st.expander("차트 옵션"):
@@ -1,22 +1,19 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from employ_analysis.figure_cache import cached_figure
+from .population_cube import load_population_cube
 
-def plot_gender_trend_line_chart(df):
+@cached_figure('population', params=lambda: [{}])
+def create_gender_trend_line_chart():
+    """등록된 장애인구 데이터로 만든 성별 장애인구 추이 Figure를 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    cube = load_population_cube()
+    return None if cube is None else build_gender_trend_line_chart(cube)
 
-    df_gender = df[
-        (df['시도별'] == '전국') &
-        (df['장애유형별'] == '합계') &
-        (df['성별'] != '계')
-    ].copy()
+def build_gender_trend_line_chart(cube):
 
-    df_gender_melted = df_gender.melt(
-        id_vars=['시도별', '성별', '장애유형별'],
-        var_name='연도',
-        value_name='인구수'
-    )
-    df_gender_melted['연도'] = df_gender_melted['연도'].astype(int)
-    df_gender_melted['성별'] = df_gender_melted['성별'].str.strip()
+    # 전국, 장애유형 합계에서 남자/여자의 연도별 인구수
+    df_gender_melted = cube.select(region='전국', type='합계').exclude('sex', ['계']).to_frame()
 
     fig_line_gender = px.line(
         df_gender_melted,
@@ -29,4 +26,9 @@ def plot_gender_trend_line_chart(df):
     )
     fig_line_gender.update_layout(hovermode="x unified")
     fig_line_gender.update_traces(hovertemplate='%{y:,}명')
+    return fig_line_gender
+
+def plot_gender_trend_line_chart(cube=None):
+    # cube를 주지 않으면 등록된 데이터의 Figure(미리 만들어 둔 것이 있으면 그것)를 사용
+    fig_line_gender = create_gender_trend_line_chart() if cube is None else build_gender_trend_line_chart(cube)
     st.plotly_chart(fig_line_gender, use_container_width=True)
@@ -1,17 +1,24 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+from employ_analysis.figure_cache import cached_figure
+from .population_cube import load_population_cube
 
-def plot_national_trend_line_chart(df_national_total):
+@cached_figure('population', params=lambda: [{}])
+def create_national_trend_line_chart():
+    """등록된 장애인구 데이터로 만든 전국 장애인구 추이 Figure를 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    cube = load_population_cube()
+    return None if cube is None else build_national_trend_line_chart(cube)
 
-    df_trend = df_national_total[df_national_total['장애유형별'] == '합계'].melt(id_vars=['시도별', '성별', '장애유형별'],
-                                                                  var_name='연도', value_name='인구수')
-    df_trend['연도'] = df_trend['연도'].astype(int)
+def build_national_trend_line_chart(cube):
+
+    # 전국, 성별 계, 장애유형 합계의 연도별 인구수 (1차원 배열 뷰)
+    trend = cube.select(region='전국', sex='계', type='합계')
 
     fig_line = go.Figure()
 
-    fig_line.add_trace(go.Scatter(x=df_trend['연도'], 
-                                  y=df_trend['인구수'], 
+    fig_line.add_trace(go.Scatter(x=trend.labels['year'], 
+                                  y=trend.values, 
                                   mode='lines', 
                                   name='총계 추이',
                                   line=dict(color='blue')))
@@ -22,4 +29,9 @@ def plot_national_trend_line_chart(df_national_total):
                            hovermode="x unified")
     fig_line.update_layout(hovermode="x unified")
     fig_line.update_traces(hovertemplate='%{y:,}명')
+    return fig_line
+
+def plot_national_trend_line_chart(cube=None):
+    # cube를 주지 않으면 등록된 데이터의 Figure(미리 만들어 둔 것이 있으면 그것)를 사용
+    fig_line = create_national_trend_line_chart() if cube is None else build_national_trend_line_chart(cube)
     st.plotly_chart(fig_line, use_container_width=True)
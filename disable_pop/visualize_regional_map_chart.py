@@ -1,49 +1,62 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
-from .constants import province_geojson_name_map, reverse_province_geojson_name_map, province_coords, area_data
+from employ_analysis.data_registry import get_geometry_store
+from employ_analysis.geometry_topology import mapbox_degrees_per_pixel, simplification_levels
+from employ_analysis.figure_cache import cached_figure
+from .population_metrics import region_aliases, compute_region_metrics, load_population_metrics
 
-def plot_regional_map_chart(df, geojson_data):
+# 지도 확대 수준 (경계 단순화 단계를 고르는 데도 사용)
+MAP_ZOOM = 5
 
-    df_region_all_years = df[
-        (df['시도별'] != '전국') &
-        (df['성별'] == '계') &
-        (df['장애유형별'] == '합계')
-    ].copy()
+def load_regional_map_geometry():
+    """지도 확대 수준에서 1픽셀보다 작은 차이만 없앤 단순화 시도 경계(GeometryStore)를 반환합니다. (없으면 원본)"""
+    return get_geometry_store('provinces', mapbox_degrees_per_pixel(MAP_ZOOM))
 
-    df_region_melted_all_years = df_region_all_years.melt(
-        id_vars=['시도별', '성별', '장애유형별'],
-        var_name='연도',
-        value_name='인구수'
-    )
-    df_region_melted_all_years['연도'] = df_region_melted_all_years['연도'].astype(int)
-
-    df_region_melted_all_years['시도별'] = df_region_melted_all_years['시도별'].replace({
-        '강원특별자치도': '강원도',
-        '전북특별자치도': '전라북도'
-    })
+@cached_figure('population', 'population_metrics', 'provinces_geojson',
+               *[f'provinces_geojson_{level}' for level in simplification_levels], params=lambda: [{}])
+def create_regional_map_chart():
+    """등록된 장애인구 파생 지표와 시도 경계로 만든 시도별 장애인구 지도 Figure를 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    metrics = load_population_metrics()
+    geometry_store = load_regional_map_geometry()
+    if metrics is None or geometry_store is None:
+        return None
+    return build_regional_map_chart(metrics, geometry_store)
 
-    df_region_melted_all_years['면적'] = df_region_melted_all_years['시도별'].map(area_data)
-    df_region_melted_all_years['인구밀도'] = df_region_melted_all_years['인구수'] / df_region_melted_all_years['면적']
+def build_regional_map_chart(metrics, geometry_store):
+    """metrics는 population_metrics의 (시도, 연도)별 파생 지표 표입니다."""
 
-    df_region_melted_all_years['lat'] = df_region_melted_all_years['시도별'].map(lambda x: province_coords.get(x, {}).get('lat'))
-    df_region_melted_all_years['lon'] = df_region_melted_all_years['시도별'].map(lambda x: province_coords.get(x, {}).get('lon'))
+    # '전국'과 면적, 좌표, 경계 정보가 없는 시도는 제외 (표는 시도 원본 순서, 연도 오름차순으로 정렬되어 있음)
+    regional = metrics[(metrics['시도별'] != '전국') & metrics[['면적', '위도', '경도']].notna().all(axis=1)]
+    sido_names = pd.unique(regional['시도별'].replace(region_aliases))
+    has_boundary = np.array([sido in geometry_store for sido in sido_names], dtype=bool)
+    years = list(pd.unique(regional['연도']))
 
-    df_region_melted_all_years.dropna(subset=['lat', 'lon', '면적', '인구밀도'], inplace=True)
+    # (시도, 연도) 배열로 바꿈
+    def region_year_array(column):
+        return regional[column].to_numpy().reshape(len(sido_names), len(years))[has_boundary]
 
-    for feature in geojson_data['features']:
-        feature['id'] = feature['properties']['name']
+    sido_names = sido_names[has_boundary].tolist()
+    population = region_year_array('인구수')
+    # 지도와 호버에 보이는 정밀도(소수 둘째 자리)로 반올림하여 frame마다 보내는 숫자 크기를 줄임
+    density = np.round(region_year_array('인구밀도'), 2)
+    lat, lon = region_year_array('위도')[:, 0], region_year_array('경도')[:, 0]
 
-    initial_year = sorted(df_region_melted_all_years['연도'].unique())[0]
-    initial_df = df_region_melted_all_years[df_region_melted_all_years['연도'] == initial_year]
+    # 지도에 그릴 시도의 경계만 담은 읽기 전용 GeoJSON (지역 id는 저장소가 한 번만 붙여 둠)
+    geojson_data = geometry_store.feature_collection(sido_names)
+    locations = [geometry_store.id_of(sido) for sido in sido_names]
 
+    # 경계, 지역 id, 좌표, 시도 이름은 첫 trace에만 한 번 담고, 연도별 frame에는 바뀌는 숫자 배열만 담음
+    # (frame의 trace는 같은 순서의 trace에 합쳐지므로 빠진 속성은 그대로 유지됨)
+    # 호버 문자열도 연도마다 보내지 않고, 브라우저가 hovertemplate으로 그 연도의 숫자를 채워 만듦
     choropleth_trace = go.Choroplethmapbox(
         geojson=geojson_data,
-        locations=[reverse_province_geojson_name_map[sido] for sido in initial_df['시도별']],
-        z=initial_df['인구밀도'],
+        locations=locations,
+        z=density[:, 0],
         colorscale="Viridis",
-        zmin=df_region_melted_all_years['인구밀도'].min(),
-        zmax=df_region_melted_all_years['인구밀도'].max(),
+        zmin=density.min(),
+        zmax=density.max(),
         marker_opacity=0.7,
         marker_line_width=0,
         name='인구 밀도',
@@ -62,55 +75,44 @@ def plot_regional_map_chart(df, geojson_data):
     )
 
     scatter_trace = go.Scattermapbox(
-        lat=initial_df['lat'],
-        lon=initial_df['lon'],
+        lat=lat,
+        lon=lon,
         mode='markers',
         marker=go.scattermapbox.Marker(
-            size=initial_df['인구수'],
+            size=population[:, 0],
             sizemode='area',
-            sizeref=2.*max(df_region_melted_all_years['인구수'])/(60.**2),
+            sizeref=2.*population.max()/(60.**2),
             sizemin=4,
-            color=initial_df['인구밀도'],
+            color=density[:, 0],
             colorscale="Viridis",
             showscale=False,
-            cmin=df_region_melted_all_years['인구밀도'].min(),
-            cmax=df_region_melted_all_years['인구밀도'].max(),
+            cmin=density.min(),
+            cmax=density.max(),
             opacity=0.8
         ),
-        hoverinfo='text',
-        text=initial_df.apply(lambda row: f"<b>{row['시도별']}</b><br>인구수: {row['인구수']:,}<br>인구 밀도: {row['인구밀도']:.2f}", axis=1),
+        text=sido_names,
+        hovertemplate="<b>%{text}</b><br>인구수: %{marker.size:,}<br>인구 밀도: %{marker.color:.2f}<extra></extra>",
         name='장애인구수',
         showlegend=True
     )
 
     fig_map = go.Figure(data=[choropleth_trace, scatter_trace])
 
-    frames = []
-    for year in sorted(df_region_melted_all_years['연도'].unique()):
-        df_year = df_region_melted_all_years[df_region_melted_all_years['연도'] == year]
-        frames.append(go.Frame(
+    fig_map.frames = [
+        go.Frame(
             data=[
-                go.Choroplethmapbox(
-                    locations=[reverse_province_geojson_name_map[sido] for sido in df_year['시도별']],
-                    z=df_year['인구밀도']
-                ),
-                go.Scattermapbox(
-                    lat=df_year['lat'],
-                    lon=df_year['lon'],
-                    marker=go.scattermapbox.Marker(
-                        size=df_year['인구수'],
-                        color=df_year['인구밀도']
-                    ),
-                    text=df_year.apply(lambda row: f"<b>{row['시도별']}</b><br>인구수: {row['인구수']:,}<br>인구 밀도: {row['인구밀도']:.2f}", axis=1)
-                )
+                go.Choroplethmapbox(z=density[:, year_index]),
+                go.Scattermapbox(marker=go.scattermapbox.Marker(size=population[:, year_index],
+                                                                color=density[:, year_index]))
             ],
             name=str(year)
-        ))
-    fig_map.frames = frames
+        )
+        for year_index, year in enumerate(years)
+    ]
 
     fig_map.update_layout(
         mapbox_style="carto-positron",
-        mapbox_zoom=5,
+        mapbox_zoom=MAP_ZOOM,
         mapbox_center={"lat": 36.4, "lon": 127.8},
         title_text='연도별 시도별 장애인구 총계 및 밀도',
         legend=dict(
@@ -137,7 +139,7 @@ def plot_regional_map_chart(df, geojson_data):
                                    frame=dict(duration=500, redraw=True),
                                    transition=dict(duration=300),
                                    layout=dict(title_text=f'{year}년 시도별 장애인구 총계 및 밀도 (성별: 계)'))],
-                        label=str(year)) for year in sorted(df_region_melted_all_years['연도'].unique())],
+                        label=str(year)) for year in years],
             transition=dict(duration=300),
             x=0.08,
             len=0.88,
@@ -146,4 +148,12 @@ def plot_regional_map_chart(df, geojson_data):
         )]
     )
 
-    st.plotly_chart(fig_map, use_container_width=True)
\ No newline at end of file
+    return fig_map
+
+def plot_regional_map_chart(cube=None, geometry_store=None):
+    # cube와 경계를 주지 않으면 등록된 데이터의 Figure(미리 만들어 둔 것이 있으면 그것)를 사용
+    if cube is None and geometry_store is None:
+        fig_map = create_regional_map_chart()
+    else:
+        fig_map = build_regional_map_chart(compute_region_metrics(cube), geometry_store)
+    st.plotly_chart(fig_map, use_container_width=True)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import os
+import sqlite3
+from urllib.parse import quote
+import pandas as pd
+from employ_analysis.load_data import data_dir, results_dir, load_fact_table, load_disabled_population_data
+
+# 모든 페이지가 함께 쓰는 파일 기반 분석 DB
+# 페이지는 파일 전체를 읽지 않고 지역, 연도 인덱스로 필요한 행만 조회합니다.
+# (고용, 장애인구 차트는 미리 만든 Figure를 쓰므로, 원본 데이터 표와 복지, 시설 차트가 DB를 조회함)
+db_path = os.path.join(results_dir, 'analytics.sqlite')
+
+# 테이블이나 인덱스 구성이 바뀌면 올려서 기존 DB를 다시 만들도록 합니다. (DB의 user_version에 기록)
+DB_VERSION = 2
+
+# 테이블 이름 -> 원본 파일 (DB가 이 파일들보다 오래되었으면 다시 만듦)
+source_files = {
+    'employ_facts': os.path.join(results_dir, 'employ_facts.parquet'),
+    'population': os.path.join(data_dir, 'korean_disabled_population_statistics.csv'),
+    'assistance': os.path.join(data_dir, 'Disability_Assistance.csv'),
+    'weekly_facilities': os.path.join(data_dir, 'disability_facilities.csv'),
+    'welfare_facilities': os.path.join(data_dir, '보건복지부_장애인복지관 현황_20240425_utf8.csv'),
+    'sigungu_population': os.path.join(data_dir, '시군구별_장애정도별_성별_등록장애인수_20250717111030.csv'),
+}
+
+# 테이블별 인덱스 (지역, 연도 기준 조회용)
+table_indexes = {
+    'employ_facts': [['dimension', 'year'], ['year']],
+    'population': [['시도별', '연도'], ['연도']],
+    'assistance': [['시도', '년도'], ['년도']],
+    'weekly_facilities': [['시도', '시군구']],
+    'welfare_facilities': [['시도', '시군구']],
+    'sigungu_population': [['시도_대분류', '시군구']],
+}
+
+# facility.py에서 사용하는 시군구별 장애인구 컬럼명
+sigungu_population_columns = [
+    '시도_대분류','시군구','총인구_소계','총인구_남자','총인구_여자',
+    '심한장애_소계','심한장애_남자','심한장애_여자',
+    '심하지않은장애_소계','심하지않은장애_남자','심하지않은장애_여자'
+]
+
+def _load_tables():
+    """원본 파일들을 읽어 {테이블 이름: DataFrame} 딕셔너리로 반환합니다."""
+    tables = {}
+
+    facts = load_fact_table()
+    if facts is not None:
+        facts = facts.reset_index()
+        for col in ['dimension', 'category', 'subcategory', 'metric']:
+            facts[col] = facts[col].astype(str)
+        tables['employ_facts'] = facts
+
+    population = load_disabled_population_data()
+    if population is not None:
+        # 연도 컬럼을 (연도, 인구수) 행으로 펼쳐서 저장
+        label_columns = ['시도별', '성별', '장애유형별']
+        population = population.astype({col: str for col in label_columns})
+        population = population.melt(id_vars=label_columns, var_name='연도', value_name='인구수')
+        population['연도'] = population['연도'].astype(int)
+        tables['population'] = population
+
+    tables['assistance'] = pd.read_csv(source_files['assistance'])
+    tables['weekly_facilities'] = pd.read_csv(source_files['weekly_facilities'], encoding='utf-8-sig')
+    tables['welfare_facilities'] = pd.read_csv(source_files['welfare_facilities'], encoding='utf-8-sig')
+
+    sigungu_population = pd.read_csv(source_files['sigungu_population'], encoding='utf-8-sig', header=2)
+    sigungu_population.columns = sigungu_population_columns
+    tables['sigungu_population'] = sigungu_population
+    return tables
+
+def _database_version():
+    conn = sqlite3.connect(f"file:{quote(db_path)}?mode=ro", uri=True)
+    try:
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+
+def is_database_stale(tables=None):
+    """
+    DB가 없거나, 다른 DB_VERSION으로 만들어졌거나, 원본 파일 중 하나라도 DB보다 최근에 수정되었으면 True를 반환합니다.
+    tables(테이블 이름 목록)를 주면 그 테이블들의 원본만 확인합니다.
+    페이지는 읽을 테이블이 최신일 때만 DB를 조회하고, 아니면 원본 파일을 읽습니다.
+    (차트 캐시는 원본 파일 버전을 키로 쓰므로, 원본보다 오래된 DB를 읽으면 새 키에 예전 데이터가 담김)
+    """
+    if not os.path.exists(db_path):
+        return True
+    try:
+        if _database_version() != DB_VERSION:
+            return True
+    except sqlite3.Error:
+        return True
+    db_mtime = os.path.getmtime(db_path)
+    paths = source_files.values() if tables is None else [source_files[table] for table in tables]
+    return any(os.path.exists(path) and os.path.getmtime(path) > db_mtime for path in paths)
+
+def build_database():
+    """
+    고용, 장애인구, 복지, 시설 데이터를 하나의 SQLite 파일로 저장하고 지역/연도 인덱스를 만듭니다.
+    임시 파일에 먼저 만든 뒤 교체하므로, 만드는 동안에도 페이지는 기존 DB를 읽을 수 있습니다.
+
+    Returns:
+        str: 저장된 DB 파일 경로.
+    """
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    with sqlite3.connect(tmp_path) as conn:
+        for table_name, df in _load_tables().items():
+            df.to_sql(table_name, conn, index=False)
+            for columns in table_indexes[table_name]:
+                index_name = f"idx_{table_name}_{'_'.join(columns)}"
+                column_list = ', '.join(f'"{col}"' for col in columns)
+                conn.execute(f'CREATE INDEX "{index_name}" ON "{table_name}" ({column_list})')
+        conn.execute('ANALYZE')
+        conn.execute(f'PRAGMA user_version = {DB_VERSION}')
+    conn.close()
+
+    os.replace(tmp_path, db_path)
+    return db_path
+
+def query(sql, params=()):
+    """
+    분석 DB에 읽기 전용으로 접속하여 SQL 결과를 DataFrame으로 반환합니다.
+    DB 파일이 없으면 None을 반환합니다.
+
+    예: query('SELECT * FROM assistance WHERE "시도" = ?', ['서울특별시'])
+    """
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(f"file:{quote(db_path)}?mode=ro", uri=True)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import plotly.graph_objects as go
+from employ_analysis.analytics_db import is_database_stale, query
+from employ_analysis.data_registry import get_dataset
+from employ_analysis.figure_cache import cached_figure
+
+# 기초생활수급자 및 차상위계층 차트 (pages/disability_assistant.py)
+# 분석 DB가 CSV보다 최신이면 필요한 행만 조회하고, 없거나 오래되었으면 공유 데이터 레지스트리의 CSV 데이터를 사용
+
+value_columns = ['기초생활수급자 수급자-일반', '기초생활수급자 수급자-중증', '차상위계층 수급자-일반', ' 차상위초과']
+
+def assistance_cities():
+    """데이터에 있는 시도 목록을 원본 순서대로 반환합니다. 데이터가 없으면 빈 리스트를 반환합니다."""
+    # 시도마다 처음 나온 행의 순서로 정렬 (DISTINCT 결과에는 rowid가 없음)
+    if not is_database_stale(['assistance']):
+        return list(query('SELECT "시도" FROM assistance GROUP BY "시도" ORDER BY MIN(rowid)')['시도'])
+    df = get_dataset('assistance')
+    return [] if df is None else list(df['시도'].unique())
+
+def assistance_table(city):
+    """선택한 시도의 연도별 수급자 수를 반환합니다. ('전국'은 연도별 합계) 데이터가 없으면 None을 반환합니다."""
+    use_database = not is_database_stale(['assistance'])
+    df = None if use_database else get_dataset('assistance')
+    if not use_database and df is None:
+        return None
+
+    if city == '전국':
+        if df is not None:
+            df_selected = df.groupby('년도')[value_columns].sum().reset_index()
+        else:
+            sum_columns = ', '.join(f'SUM("{col}") AS "{col}"' for col in value_columns)
+            df_selected = query(f'SELECT "년도", {sum_columns} FROM assistance GROUP BY "년도" ORDER BY "년도"')
+        df_selected['시도'] = '전국'
+        return df_selected
+    if df is not None:
+        return df[df['시도'] == city]
+    return query('SELECT * FROM assistance WHERE "시도" = ? ORDER BY "년도"', [city])
+
+# 시도(전국 포함) x 지표마다 미리 만들어 둠
+@cached_figure('assistance',
+               params=lambda: [{'city': city, 'column': column}
+                               for city in ['전국'] + assistance_cities() for column in value_columns])
+def create_assistance_line_chart(city, column):
+    """선택한 시도의 지표(column) 변화 추이 라인 차트 Figure를 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    df = assistance_table(city)
+    if df is None or df.empty:
+        return None
+    return build_line_chart(df, column, f'{city} {column.strip()} 변화 추이', '수급자 수')
+
+# y축 범위 조정 함수
+def build_line_chart(df, y_column, title, y_label):
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=df['년도'], y=df[y_column], mode='lines', name=y_column))
+
+    # y축 범위 자동 조정
+    min_val = df[y_column].min()
+    max_val = df[y_column].max()
+    range_extension = (max_val - min_val) * 0.1  # 10% 여유
+
+    # X축 범위 설정
+    x_min = df['년도'].min()
+    x_max = 2022  # 2022년도 추가
+    x_range = [x_min, x_max]
+
+    # x축 눈금 값 명시적으로 설정
+    tickvals = sorted(list(df['년도'].unique()) + [x_max])
+    ticktext = [str(year) for year in tickvals]  # 연도를 문자열로 변환
+
+    fig.update_layout(
+        title=title,
+        xaxis_title='년도',
+        yaxis_title=y_label,
+        yaxis=dict(range=[min_val - range_extension, max_val + range_extension]),
+        xaxis = dict(
+            tickmode = 'array',  # tickmode를 'array'로 설정
+            tickvals = tickvals,   # 눈금 값을 명시적으로 설정
+            ticktext = ticktext,   # 눈금 텍스트를 눈금 값과 동일하게 설정
+            range=x_range,          # x축 범위 설정
+        ),
+        font=dict(size=12)  # 폰트 크기를 12pt로 설정 (기본 크기)
+    )
+    return fig
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+import threading
+import pandas as pd
+from employ_analysis.load_data import (data_dir, results_dir, processed_file_path, compact_dataframe, memory_usage,
+                                       load_disabled_population_data)
+from employ_analysis.geometry import geometry_sources, geometry_path, load_geometry
+from employ_analysis.geometry_store import GeometryStore
+from employ_analysis.geometry_topology import simplification_levels, simplified_path, load_simplified_geometry, pick_level
+from employ_analysis.shared_tables import shared_table_path, read_source_info, write_shared_table, read_shared_table
+
+# 프로세스 전체에서 함께 쓰는 데이터 레지스트리
+# Streamlit의 모든 세션이 같은 모듈을 공유하므로, 각 데이터셋은 처음 사용할 때 한 번만 읽고
+# 원본 파일의 수정 시각(또는 내용 해시)이 바뀐 경우에만 다시 읽습니다.
+#
+# 반환되는 DataFrame은 여러 세션이 함께 쓰는 객체이므로 직접 수정하지 말고,
+# 컬럼을 추가하거나 바꿀 때는 먼저 .copy()를 하거나 새 DataFrame을 만들어야 합니다.
+
+# 간단 로딩 모드: 차트에 쓰지 않는 컬럼은 읽지 않고, 라벨 컬럼은 범주형으로, 정수는 작은 자료형으로 저장합니다.
+# 세션이 많은 서버에서 메모리를 줄이기 위한 설정이며, COMPACT_DATA=0 환경 변수로 끌 수 있습니다.
+compact_mode = os.environ.get('COMPACT_DATA', '1') != '0'
+
+# 공유 Arrow 파일에 원본 파일 정보와 함께 기록하는 loader 버전
+# 레지스트리의 로딩 방식(간단 로딩 모드, 스키마 적용 등)이 바뀌어 같은 원본에서 다른 DataFrame이 만들어지면 올립니다.
+# 데이터셋 하나의 loader만 바뀌었으면 register_dataset의 version을 올립니다.
+LOADER_VERSION = 1
+
+def _read_parquet(file_path):
+    if not os.path.exists(file_path):
+        print(f"오류: '{file_path}' 파일을 찾을 수 없습니다.")
+        return None
+    return pd.read_parquet(file_path)
+
+def _read_csv(file_path, **kwargs):
+    if not os.path.exists(file_path):
+        print(f"오류: '{file_path}' 파일을 찾을 수 없습니다.")
+        return None
+    return pd.read_csv(file_path, **kwargs)
+
+def _read_csv_compact(file_path, category_columns=(), **kwargs):
+    df = _read_csv(file_path, **kwargs)
+    return None if df is None else compact_dataframe(df, category_columns)
+
+# 데이터셋 이름 -> {'file_path', 'loader', 'compact_loader', 'shareable', 'version'}
+_datasets = {}
+
+# 데이터셋 이름 -> {'mtime_ns', 'size', 'sha256', 'data'}
+_cache = {}
+# (데이터셋 이름, 파생 데이터 이름) -> (원본 데이터 객체, 파생 데이터)
+_derived = {}
+# (경계 이름, 단순화 단계) -> GeometryStore
+_geometry_stores = {}
+# 위 딕셔너리들을 보호하는 잠금 (파일 읽기, 해시 계산 등 오래 걸리는 작업은 이 잠금 밖에서 함)
+_lock = threading.RLock()
+# 데이터셋 이름(또는 (데이터셋 이름, 파생 데이터 이름)) -> 그 데이터를 읽는 동안 잡는 잠금
+# 같은 데이터를 여러 세션이 동시에 요청하면 한 번만 읽고, 다른 데이터셋을 읽는 세션은 기다리지 않음
+# 파생 데이터셋의 loader가 다른 데이터셋을 가져올 수 있도록 재진입 가능한 잠금 사용
+_load_locks = {}
+# 파일 경로 -> (수정 시각, 크기, 내용 해시) (dataset_hash가 같은 파일을 다시 읽지 않도록 기록)
+_file_hashes = {}
+# 데이터셋 이름 -> 캐시를 비운 횟수 (전체를 비우면 None 키를 올림)
+# 캐시를 비우기 전에 읽기 시작한 데이터는 캐시에 넣지 않음
+_generations = {}
+
+def register_dataset(name, file_path, loader, shareable=True, compact_loader=None, version=1):
+    """
+    레지스트리에 데이터셋을 등록합니다.
+    file_path에 함수를 주면 데이터셋을 사용할 때마다 호출하여 경로를 정합니다. (배포 파일이 나중에 생기는 경계 데이터 등)
+    loader는 인자 없이 호출되며, 파일이 없거나 읽지 못하면 None을 반환해야 합니다.
+    shareable이 True이면 loader가 반환하는 DataFrame을 공유 Arrow 파일로 저장할 수 있습니다.
+    compact_loader가 있으면 간단 로딩 모드에서 loader 대신 사용합니다.
+    version은 공유 Arrow 파일에 기록되며, loader가 만드는 DataFrame의 형식이 바뀌면 올려서 기존 파일을 쓰지 않도록 합니다.
+    """
+    _datasets[name] = {
+        'file_path': file_path,
+        'loader': loader,
+        'compact_loader': compact_loader,
+        'shareable': shareable,
+        'version': version,
+    }
+    _cache.pop(name, None)
+
+def _register_defaults():
+    for dataset in ['disable_age', 'disable_edu', 'disable_power', 'disable_region', 'disable_sex', 'disable_type']:
+        file_path = processed_file_path(dataset)
+        register_dataset(dataset, file_path, lambda file_path=file_path: _read_parquet(file_path))
+
+    facts_path = os.path.join(results_dir, 'employ_facts.parquet')
+    register_dataset('employ_facts', facts_path, lambda: _read_parquet(facts_path))
+
+    register_dataset('population', os.path.join(data_dir, 'korean_disabled_population_statistics.csv'),
+                     load_disabled_population_data,
+                     compact_loader=lambda: load_disabled_population_data(compact=True))
+    # 경계는 PackedGeometry(읽기 전용 NumPy 배열)로 읽으며, 파싱 결과는 geometry 모듈이 파일 해시별 바이너리 캐시로 따로 저장함
+    # 로컬 파일이 없으면 load_geometry가 백그라운드 다운로드를 시작하고 None을 반환하므로 화면이 멈추지 않음
+    for name in ['provinces', 'municipalities']:
+        # 배포 파일이 나중에 생기면 그 파일을 보도록 경로는 사용할 때마다 정함
+        register_dataset(f'{name}_geojson', lambda name=name: geometry_path(name), lambda name=name: load_geometry(name),
+                         shareable=False)
+        # run_analysis.py가 만든 단계별 단순화 경계 (예: 'provinces_geojson_coarse')
+        for level in simplification_levels:
+            register_dataset(f'{name}_geojson_{level}', simplified_path(name, level),
+                             lambda name=name, level=level: load_simplified_geometry(name, level), shareable=False)
+
+    # 데이터셋 이름 -> (파일 이름, read_csv 인자, 간단 로딩 모드의 read_csv 인자와 범주형 컬럼)
+    csv_files = {
+        'assistance': ('Disability_Assistance.csv', {}, None),
+        # 시설 데이터는 시도/시군구별 개수만 사용하므로 주소, 전화번호 등은 읽지 않음
+        'weekly_facilities': ('disability_facilities.csv', {'encoding': 'utf-8-sig'},
+                              ({'usecols': ['시도', '시군구']}, ['시도'])),
+        'welfare_facilities': ('보건복지부_장애인복지관 현황_20240425_utf8.csv', {'encoding': 'utf-8-sig'},
+                               ({'usecols': ['시도', '시군구']}, ['시도'])),
+        # 시군구별 장애인구는 시도, 시군구, 총인구 소계(앞의 세 컬럼)만 사용
+        'sigungu_population': ('시군구별_장애정도별_성별_등록장애인수_20250717111030.csv',
+                               {'encoding': 'utf-8-sig', 'header': 2},
+                               ({'usecols': [0, 1, 2]}, [])),
+    }
+    for name, (file_name, kwargs, compact) in csv_files.items():
+        file_path = os.path.join(data_dir, file_name)
+        compact_loader = None
+        if compact is not None:
+            compact_kwargs, category_columns = {**kwargs, **compact[0]}, compact[1]
+            compact_loader = lambda file_path=file_path, compact_kwargs=compact_kwargs, category_columns=category_columns: \
+                _read_csv_compact(file_path, category_columns, **compact_kwargs)
+        register_dataset(name, file_path, lambda file_path=file_path, kwargs=kwargs: _read_csv(file_path, **kwargs),
+                         compact_loader=compact_loader)
+
+def set_compact_mode(enabled):
+    """간단 로딩 모드를 켜거나 끕니다. 이미 읽은 데이터셋은 다음에 사용할 때 새 모드로 다시 읽습니다."""
+    global compact_mode
+    with _lock:
+        compact_mode = bool(enabled)
+        _cache.clear()
+        _bump_generation(None)
+
+def _active_loader(entry):
+    """현재 모드에서 사용할 (loader, 간단 로딩 여부)를 반환합니다."""
+    if compact_mode and entry['compact_loader'] is not None:
+        return entry['compact_loader'], True
+    return entry['loader'], False
+
+def _bump_generation(name):
+    _generations[name] = _generations.get(name, 0) + 1
+
+def _generation(name):
+    """데이터셋의 캐시 세대를 반환합니다. (_lock을 잡은 상태에서 호출)"""
+    return _generations.get(None, 0), _generations.get(name, 0)
+
+def _load_lock(key):
+    with _lock:
+        lock = _load_locks.get(key)
+        if lock is None:
+            lock = _load_locks[key] = threading.RLock()
+        return lock
+
+def _file_sha256(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def dataset_path(name):
+    """데이터셋의 원본 파일 경로를 반환합니다."""
+    file_path = _datasets[name]['file_path']
+    return file_path() if callable(file_path) else file_path
+
+def dataset_version(name):
+    """
+    데이터셋 원본 파일의 버전((수정 시각, 크기))을 반환합니다. 파일이 없으면 None을 반환합니다.
+    파일을 다시 쓰면 값이 바뀌므로, 데이터셋으로 만든 결과를 캐시할 때 키로 사용합니다.
+    """
+    stat = _file_stat(dataset_path(name))
+    return None if stat is None else (stat.st_mtime_ns, stat.st_size)
+
+def dataset_hash(name):
+    """
+    데이터셋 원본 파일 내용의 SHA-256 해시를 반환합니다. 파일이 없으면 None을 반환합니다.
+    dataset_version과 달리 파일을 복사하거나 다시 체크아웃해도 내용이 같으면 값이 같으므로, 프로세스 밖에 저장하는 결과의 키로 사용합니다.
+    수정 시각과 크기가 그대로이면 전에 계산한 해시를 다시 사용합니다.
+    """
+    file_path = dataset_path(name)
+    stat = _file_stat(file_path)
+    if stat is None:
+        return None
+    with _lock:
+        recorded = _file_hashes.get(file_path)
+    if recorded is not None and recorded[:2] == (stat.st_mtime_ns, stat.st_size):
+        return recorded[2]
+    sha256 = _file_sha256(file_path)
+    with _lock:
+        _file_hashes[file_path] = (stat.st_mtime_ns, stat.st_size, sha256)
+    return sha256
+
+def _file_stat(file_path):
+    try:
+        return os.stat(file_path)
+    except OSError:
+        return None
+
+def _loader_version(entry):
+    """공유 Arrow 파일에 기록하는 [레지스트리 loader 버전, 데이터셋 버전]을 반환합니다."""
+    return [LOADER_VERSION, entry['version']]
+
+def _source_info(file_path, stat, compact, version):
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _file_sha256(file_path), 'compact': compact,
+            'version': version}
+
+def _shared_table_matches(info, file_path, stat, compact, version):
+    """공유 Arrow 파일이 현재 원본 파일, 로딩 모드, loader 버전으로 만들어진 것인지 확인합니다."""
+    if (info is None or info['size'] != stat.st_size or info.get('compact', False) != compact
+            or info.get('version') != version):
+        return False
+    return info['mtime_ns'] == stat.st_mtime_ns or info['sha256'] == _file_sha256(file_path)
+
+def _load(name, entry, file_path, stat):
+    """공유 Arrow 파일이 원본과 일치하면 메모리 매핑으로 읽고, 아니면 loader로 원본을 읽습니다."""
+    loader, compact = _active_loader(entry)
+    if entry['shareable'] and stat is not None:
+        shared_path = shared_table_path(name)
+        if _shared_table_matches(read_source_info(shared_path), file_path, stat, compact, _loader_version(entry)):
+            return read_shared_table(shared_path)
+    return loader()
+
+def get_dataset(name):
+    """
+    등록된 데이터셋을 반환합니다. 처음 호출할 때 파일을 읽고, 이후에는 캐시된 객체를 그대로 반환합니다.
+
+    파일의 수정 시각이나 크기가 바뀌면 내용 해시를 비교하여, 내용이 실제로 바뀐 경우에만 다시 읽습니다.
+    run_analysis.py --shared로 만든 공유 Arrow 파일이 있으면 원본을 파싱하지 않고 메모리 매핑으로 읽습니다.
+    파일이 없거나 읽기에 실패하면 None을 반환합니다.
+    """
+    if name not in _datasets:
+        raise KeyError(f"등록되지 않은 데이터셋입니다: '{name}'")
+    dataset = _datasets[name]
+    file_path = dataset_path(name)
+
+    # 캐시가 최신이면 데이터셋 잠금을 기다리지 않고 바로 반환
+    stat = _file_stat(file_path)
+    with _lock:
+        entry = _cache.get(name)
+    if entry is not None and stat is not None and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['data']
+
+    # 같은 데이터셋은 한 스레드만 읽음 (기다린 스레드는 먼저 읽은 결과를 다시 확인하여 사용)
+    with _load_lock(name):
+        with _lock:
+            entry = _cache.get(name)
+            generation = _generation(name)
+        stat = _file_stat(file_path)
+        if entry is not None and stat is not None:
+            if entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                return entry['data']
+            # 수정 시각만 바뀌고 내용이 같으면 다시 읽지 않음 (git checkout, 파일 복사 등)
+            if entry['sha256'] == _file_sha256(file_path):
+                with _lock:
+                    entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+                return entry['data']
+
+        # 파일이 없으면 loader가 오류를 출력하거나 직접 받아올 수 있도록 그대로 호출 (예: GeoJSON 다운로드)
+        data = _load(name, dataset, file_path, stat)
+        stat = _file_stat(file_path)
+        # 파일 없이 만들어진 데이터는 캐시하지 않음
+        new_entry = None
+        if data is not None and stat is not None:
+            new_entry = {
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha256': _file_sha256(file_path),
+                'data': data,
+            }
+        with _lock:
+            if generation == _generation(name):
+                if new_entry is None:
+                    _cache.pop(name, None)
+                else:
+                    _cache[name] = new_entry
+        return data
+
+def get_map_geometry(name, degrees_per_pixel):
+    """
+    지도 1픽셀이 나타내는 경위도 범위에 맞는 단순화 단계의 경계(PackedGeometry)를 반환합니다.
+    맞는 단계가 없거나 단순화 파일이 아직 없으면 원본 경계를 반환합니다.
+    """
+    return _map_geometry(name, degrees_per_pixel)[1]
+
+def _map_geometry(name, degrees_per_pixel):
+    """(실제로 사용한 단순화 단계, PackedGeometry)를 반환합니다. 원본 경계를 쓰면 단계는 None입니다."""
+    level = pick_level(degrees_per_pixel)
+    if level is not None:
+        geometry = get_dataset(f'{name}_geojson_{level}')
+        if geometry is not None:
+            return level, geometry
+    return None, get_dataset(f'{name}_geojson')
+
+def get_geometry_store(name, degrees_per_pixel):
+    """
+    get_map_geometry()와 같은 경계를 지역 id와 이름으로 색인한 GeometryStore로 반환합니다.
+    경계가 다시 읽히지 않는 한 같은 객체를 돌려주므로, 지역 id와 GeoJSON 보기는 프로세스에서 한 번만 만들어집니다.
+    경계를 불러오지 못하면 None을 반환합니다.
+    """
+    level, geometry = _map_geometry(name, degrees_per_pixel)
+    if geometry is None:
+        return None
+    with _lock:
+        store = _geometry_stores.get((name, level))
+        if store is None or store.geometry is not geometry:
+            store = GeometryStore(geometry, geometry_sources[name]['id_property'])
+            _geometry_stores[(name, level)] = store
+        return store
+
+def get_derived(name, key, build):
+    """
+    데이터셋으로 만든 파생 데이터(build(데이터))를 반환합니다.
+    데이터셋이 다시 읽히기 전까지는 처음 만든 결과를 그대로 돌려주므로, 여러 차트가 같은 파생 데이터를 써도
+    한 번만 만들어집니다. 데이터셋을 불러오지 못하면 None을 반환합니다.
+
+    반환되는 객체는 여러 세션이 함께 쓰므로 직접 수정하지 말아야 합니다.
+    """
+    data = get_dataset(name)
+    if data is None:
+        return None
+    with _lock:
+        cached = _derived.get((name, key))
+    if cached is not None and cached[0] is data:
+        return cached[1]
+    # 같은 파생 데이터는 한 스레드만 만듦
+    with _load_lock((name, key)):
+        with _lock:
+            cached = _derived.get((name, key))
+            generation = _generation(name)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        result = build(data)
+        with _lock:
+            if generation == _generation(name):
+                _derived[(name, key)] = (data, result)
+        return result
+
+def publish_shared_tables():
+    """
+    공유 가능한 데이터셋을 results/shared/ 아래 Arrow IPC 파일로 저장합니다.
+    원본 파일이 바뀌지 않은 데이터셋은 건너뜁니다.
+
+    Returns:
+        list: 새로 저장한 데이터셋 이름 목록.
+    """
+    published = []
+    for name, entry in _datasets.items():
+        file_path = dataset_path(name)
+        stat = _file_stat(file_path)
+        if not entry['shareable'] or stat is None:
+            continue
+        loader, compact = _active_loader(entry)
+        shared_path = shared_table_path(name)
+        version = _loader_version(entry)
+        if _shared_table_matches(read_source_info(shared_path), file_path, stat, compact, version):
+            continue
+        data = loader()
+        if data is None:
+            continue
+        write_shared_table(shared_path, data, _source_info(file_path, stat, compact, version))
+        published.append(name)
+    return published
+
+def memory_report():
+    """
+    간단 로딩 모드가 있는 데이터셋을 두 방식으로 모두 읽어 메모리 사용량을 비교합니다.
+
+    Returns:
+        list: (데이터셋 이름, 기본 모드 바이트, 간단 모드 바이트) 목록. 파일이 없는 데이터셋은 제외합니다.
+    """
+    report = []
+    for name, entry in _datasets.items():
+        if entry['compact_loader'] is None:
+            continue
+        before, after = entry['loader'](), entry['compact_loader']()
+        if before is None or after is None:
+            continue
+        report.append((name, memory_usage(before), memory_usage(after)))
+    return report
+
+def print_memory_report(report=None):
+    """memory_report() 결과를 표 형태로 출력합니다."""
+    report = memory_report() if report is None else report
+    print("데이터셋별 메모리 사용량 (기본 -> 간단 로딩 모드):")
+    total_before = total_after = 0
+    for name, before, after in report:
+        total_before += before
+        total_after += after
+        print(f"  - {name}: {before / 1024:,.1f} KB -> {after / 1024:,.1f} KB ({after / before:.0%})")
+    if total_before:
+        print(f"  합계: {total_before / 1024:,.1f} KB -> {total_after / 1024:,.1f} KB ({total_after / total_before:.0%})")
+
+def clear_cache(name=None):
+    """캐시된 데이터셋을 비웁니다. name이 없으면 모든 데이터셋을 비웁니다."""
+    with _lock:
+        _bump_generation(name)
+        if name is None:
+            _cache.clear()
+            _derived.clear()
+            _geometry_stores.clear()
+        else:
+            _cache.pop(name, None)
+            for key in [key for key in _derived if key[0] == name]:
+                del _derived[key]
+
+_register_defaults()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+from employ_analysis.analytics_db import is_database_stale, query
+from employ_analysis.data_registry import get_dataset, get_derived
+
+# 여러 고용 차트가 함께 쓰는 표
+# 처리된 결과 파일(disable_*)은 데이터 레지스트리가 데이터 버전마다 한 번만 읽고,
+# 아래의 '전체' 행과 구분별 행도 그 데이터로 한 번만 나누어 모든 차트가 함께 씁니다.
+# (예: 성별 막대 그래프와 파이 차트, 연령별 그래프와 경제활동인구 시계열)
+#
+# 반환되는 DataFrame은 공유 객체이므로 직접 수정하지 말고, 필요하면 새 DataFrame을 만들어 사용합니다.
+
+def _split_total(df):
+    category_col = df.columns[0]
+    categories = df[category_col]
+    valid = categories.notna()
+    return {
+        'category_col': category_col,
+        # 구분이 비어 있는 행(상위 구분의 소계 등)은 차트에 쓰지 않음
+        'categories': df[valid & (categories != '전체')],
+        'total': df[valid & (categories == '전체')],
+    }
+
+def _tables(dataset):
+    return get_derived(dataset, 'split_total', _split_total)
+
+def category_rows(dataset):
+    """
+    데이터셋의 (구분 컬럼명, '전체' 행과 빈 구분을 뺀 구분별 행)을 반환합니다.
+    데이터셋을 불러오지 못하면 (None, None)을 반환합니다.
+    """
+    tables = _tables(dataset)
+    if tables is None:
+        return None, None
+    return tables['category_col'], tables['categories']
+
+def total_row(dataset):
+    """데이터셋의 '전체' 행(DataFrame)을 반환합니다. 데이터셋을 불러오지 못하면 None을 반환합니다."""
+    tables = _tables(dataset)
+    return None if tables is None else tables['total']
+
+# 팩트 테이블 차원 -> 원본 표의 구분 이름 (pages/employ.py의 '원본 데이터' 탭)
+dimension_labels = {
+    'age': '연령별',
+    'edu': '교육정도별',
+    'power': '장애정도별',
+    'region': '지역별',
+    'sex': '성별',
+    'type': '장애유형별',
+}
+
+# 원본 데이터 탭에 보여 줄 팩트 테이블 컬럼
+fact_columns = ['category', 'subcategory', 'metric', 'year', 'half', 'value']
+
+def _fact_rows():
+    facts = get_dataset('employ_facts')
+    return None if facts is None else facts.reset_index()
+
+def fact_years(dimension):
+    """차원(예: 'age')의 연도 목록을 오름차순으로 반환합니다. 분석 DB가 없거나 오래되었으면 팩트 테이블을 사용합니다."""
+    if not is_database_stale(['employ_facts']):
+        df_years = query('SELECT DISTINCT "year" FROM employ_facts WHERE "dimension" = ? ORDER BY "year"', [dimension])
+        return [int(year) for year in df_years['year']]
+    rows = _fact_rows()
+    return [] if rows is None else sorted(int(year) for year in rows.loc[rows['dimension'] == dimension, 'year'].unique())
+
+def fact_table(dimension, year):
+    """
+    차원과 연도에 해당하는 팩트 테이블 행을 반환합니다. 분석 DB가 최신이면 그 행만 조회합니다.
+    데이터가 없으면 None을 반환합니다.
+    """
+    if not is_database_stale(['employ_facts']):
+        column_list = ', '.join(f'"{col}"' for col in fact_columns)
+        return query(f'SELECT {column_list} FROM employ_facts WHERE "dimension" = ? AND "year" = ? ORDER BY rowid',
+                     [dimension, int(year)])
+    rows = _fact_rows()
+    if rows is None:
+        return None
+    return rows.loc[(rows['dimension'] == dimension) & (rows['year'] == int(year)), fact_columns].reset_index(drop=True)
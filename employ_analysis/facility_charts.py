@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+import pandas as pd
+import plotly.express as px
+from employ_analysis.analytics_db import is_database_stale, query
+from employ_analysis.data_registry import get_dataset, get_derived, get_geometry_store
+from employ_analysis.figure_cache import cached_figure
+from employ_analysis.geometry import fetch_status
+from employ_analysis.geometry_topology import geo_degrees_per_pixel, simplification_levels
+
+# 시군구별 장애인 시설 필요도 지도 (pages/facility.py)
+# 분석 DB가 CSV보다 최신이면 필요한 컬럼만 조회하고, 없거나 오래되었으면 공유 데이터 레지스트리의 CSV 데이터를 사용
+# 프로세스 전체에서 공유하는 데이터이므로, 아래 함수들은 원본을 수정하지 않고 복사본을 사용
+
+# 지도에 보이는 경도 범위
+MAP_LON_RANGE = [124, 132]
+
+# 시설 종류 -> (시설 데이터셋, 시설 이름, 색상 스케일)
+facility_kinds = {
+    'weekly': ('weekly_facilities', '주간이용시설', 'Reds'),
+    'welfare': ('welfare_facilities', '복지관', 'Blues'),
+}
+
+def load_municipal_geojson():
+    """
+    지도 크기에서 1픽셀보다 작은 차이만 없앤 단순화 시군구 경계(단순화 파일이 없으면 원본)를
+    프로세스에서 한 번만 만들어 함께 쓰는 읽기 전용 GeoJSON으로 반환합니다.
+    로컬 파일(배포 파일 또는 검증된 캐시)에서만 읽고, 없으면 백그라운드 다운로드를 시작한 뒤 None을 반환합니다.
+    """
+    geometry_store = get_geometry_store('municipalities', geo_degrees_per_pixel(MAP_LON_RANGE))
+    return None if geometry_store is None else geometry_store.feature_collection()
+
+#--- Common Data Standardization Function ---
+def standardize_facilities_data(df_raw, facility_type, level='province'):
+    short_to_full = {
+        '서울':'서울특별시','부산':'부산광역시','대구':'대구광역시',
+        '인천':'인천광역시','광주':'광주광역시','대전':'대전광역시',
+        '울산':'울산광역시','세종':'세종시','경기':'경기도',
+        '강원':'강원도','충북':'충청북도','충남':'충청남도',
+        '전북':'전라북도','전남':'전라남도','경북':'경상북도',
+        '경남':'경상남도','제주':'제주특별자치도'
+    }
+    df_raw = df_raw.copy()
+    df_raw['시도_전체이름'] = df_raw['시도'].str.strip().map(short_to_full)
+    if level=='province':
+        df = (df_raw.groupby('시도_전체이름')
+                     .size()
+                     .reset_index(name=f'{facility_type}수')
+                     .rename(columns={'시도_전체이름':'시도'}))
+    else:
+        df_raw['시군구_전체이름'] = df_raw['시도_전체이름'] + ' ' + df_raw['시군구']
+        df = (df_raw.groupby('시군구_전체이름')
+                  .size()
+                  .reset_index(name=f'{facility_type}수'))
+    return df
+
+# --- Process Sigungu Population Data ---
+def process_sigungu_population_data(df_pop):
+    # 앞의 세 컬럼(시도, 시군구, 총인구 소계)만 사용 (간단 로딩 모드에서는 이 세 컬럼만 읽음)
+    df_pop = df_pop.iloc[:, :3].copy()
+    df_pop.columns = ['시도_대분류','시군구','총인구_소계']
+    df = df_pop[~df_pop['시도_대분류'].isin(['전국'])]
+    df = df[~df['시군구'].isin(['소계'])]
+    df = df[['시도_대분류','시군구','총인구_소계']].copy()
+    df['총인구_소계'] = pd.to_numeric(df['총인구_소계'], errors='coerce')
+    df.dropna(subset=['총인구_소계'], inplace=True)
+    df['시군구_전체이름'] = df['시도_대분류'] + ' ' + df['시군구']
+    return df
+
+def facility_need_table(kind):
+    """시군구별 (인구, 시설 수, 필요지수) 표를 반환합니다. 데이터가 없으면 None을 반환합니다."""
+    dataset, facility_type, _ = facility_kinds[kind]
+    if not is_database_stale(['sigungu_population', dataset]):
+        df_pop = query('SELECT "시도_대분류", "시군구", "총인구_소계" FROM sigungu_population')
+        df_pop = None if df_pop is None else process_sigungu_population_data(df_pop)
+        df_facilities = query(f'SELECT "시도", "시군구" FROM {dataset}')
+    else:
+        # 시군구 인구 전처리는 데이터 버전마다 한 번만 하고 두 지도가 함께 씀
+        df_pop = get_derived('sigungu_population', 'facility_population', process_sigungu_population_data)
+        df_facilities = get_dataset(dataset)
+    if df_pop is None or df_facilities is None:
+        return None
+
+    count_col = f'{facility_type}수'
+    df = standardize_facilities_data(df_facilities, facility_type, level='sigungu')
+    df = pd.merge(df_pop, df, on='시군구_전체이름', how='left')
+    df[count_col] = df[count_col].fillna(0).astype(int)
+    df[f'{facility_type}필요지수'] = df['총인구_소계'] / (df[count_col] + 1)
+    return df
+
+# 경계 파일이 없으면 미리 만들지 않음 (전처리 중에 경계 다운로드를 시작하지 않도록)
+@cached_figure('sigungu_population', 'weekly_facilities', 'welfare_facilities', 'municipalities_geojson',
+               *[f'municipalities_geojson_{level}' for level in simplification_levels],
+               params=lambda: [{'kind': kind} for kind in facility_kinds]
+                              if fetch_status('municipalities')[0] == 'ready' else [])
+def create_facility_need_map(kind):
+    """
+    시군구별 장애인구수 대비 시설(kind: 'weekly' 주간이용시설, 'welfare' 복지관) 필요도 지도 Figure를 반환합니다.
+    데이터나 경계를 불러오지 못하면 None을 반환합니다.
+    """
+    geojson = load_municipal_geojson()
+    df = facility_need_table(kind)
+    if geojson is None or df is None:
+        return None
+
+    _, facility_type, color_scale = facility_kinds[kind]
+    need_col = f'{facility_type}필요지수'
+    # 경계 파일의 시군구 이름에는 공백이 없음 (예: 통계의 '천안시 동남구' -> '천안시동남구')
+    df = df.assign(경계_시군구=df['시군구'].str.replace(' ', '', regex=False))
+    fig = px.choropleth(
+        df,
+        geojson=geojson,
+        locations='경계_시군구',
+        featureidkey="properties.name",
+        color=need_col,
+        hover_name='시군구',
+        hover_data={
+            '총인구_소계':':,',
+            f'{facility_type}수':':,',
+            need_col:':.2f'
+        },
+        color_continuous_scale=color_scale
+    )
+    fig.update_geos(visible=False,
+                    projection_type="mercator",
+                    center=dict(lat=36, lon=127.5),
+                    lonaxis_range=MAP_LON_RANGE,
+                    lataxis_range=[33,39])
+    fig.update_layout(
+        margin={"r":0,"t":0,"l":0,"b":0},
+        height=800,
+        coloraxis_colorbar=dict(len=0.7, y=0.6)
+    )
+    return fig
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import re
+import numpy as np
+import pandas as pd
+
+# '2013_고용률 (%)' -> (2013, 0, '고용률 (%)'), '2022.2/2_고용률 (%)' -> (2022, 2, '고용률 (%)')
+PERIOD_PARTS_PATTERN = re.compile(r'^(\d{4})(?:\.(\d)/2)?_(.+)$')
+
+# 팩트 테이블의 인덱스 순서 (정렬되어 있어 앞쪽 레벨부터 빠르게 잘라낼 수 있음)
+FACT_INDEX = ['dimension', 'metric', 'year', 'half', 'category', 'subcategory']
+
+def parse_period_column(col_name):
+    """
+    '{기간}_{지표}' 컬럼명을 (연도, 반기, 지표)로 나눕니다.
+    연간 자료는 반기를 0, 상반기(1/2)는 1, 하반기(2/2)는 2로 표시합니다.
+    기간 컬럼이 아니면 None을 반환합니다.
+    """
+    match = PERIOD_PARTS_PATTERN.match(col_name)
+    if match is None:
+        return None
+    year, half, metric = match.groups()
+    return int(year), int(half) if half else 0, metric
+
+def dimension_name(dataset_name):
+    """'disable_age' 같은 데이터셋 이름에서 차원 이름('age')을 만듭니다."""
+    return dataset_name[len('disable_'):] if dataset_name.startswith('disable_') else dataset_name
+
+def wide_to_facts(df, dimension):
+    """
+    run_analysis.py가 만든 넓은 형태의 DataFrame 하나를
+    (dimension, category, subcategory, year, half, metric, value) 긴 형태로 바꿉니다.
+
+    첫 번째 구분 컬럼은 category, 두 번째 구분 컬럼(장애유형별(2) 등)이 있으면 subcategory가 됩니다.
+    category가 비어 있는 하위 행은 위쪽 행의 category를 이어받습니다.
+    """
+    value_columns = [col for col in df.columns if parse_period_column(col) is not None]
+    label_columns = [col for col in df.columns if col not in value_columns]
+
+    category = df[label_columns[0]].ffill().astype(str).to_numpy()
+    if len(label_columns) > 1:
+        subcategory = df[label_columns[1]].astype(object).fillna('').astype(str).to_numpy()
+    else:
+        subcategory = np.full(len(df), '', dtype=object)
+
+    periods = [parse_period_column(col) for col in value_columns]
+    n_rows, n_cols = len(df), len(value_columns)
+
+    # 행 x 컬럼 값을 한 번에 펼침 (행 우선 순서)
+    values = df[value_columns].to_numpy(dtype=np.float64).ravel()
+    facts = pd.DataFrame({
+        'dimension': dimension,
+        'category': np.repeat(category, n_cols),
+        'subcategory': np.repeat(subcategory, n_cols),
+        'year': np.tile(np.array([p[0] for p in periods], dtype=np.int16), n_rows),
+        'half': np.tile(np.array([p[1] for p in periods], dtype=np.int8), n_rows),
+        'metric': np.tile(np.array([p[2] for p in periods], dtype=object), n_rows),
+        'value': values,
+    })
+    return facts[facts['value'].notna()]
+
+def build_fact_table(dataframes):
+    """
+    {데이터셋 이름: 넓은 DataFrame} 딕셔너리로 정렬된 MultiIndex를 가진 팩트 테이블을 만듭니다.
+    문자열 레벨은 범주형(category)으로 저장되어 메모리를 적게 쓰고 비교가 빠릅니다.
+    """
+    frames = [wide_to_facts(df, dimension_name(name)) for name, df in sorted(dataframes.items())]
+    facts = pd.concat(frames, ignore_index=True)
+    for col in ['dimension', 'category', 'subcategory', 'metric']:
+        # 등장 순서를 범주 순서로 유지 ('전체'가 먼저 오도록)
+        facts[col] = pd.Categorical(facts[col], categories=pd.unique(facts[col]))
+    return facts.set_index(FACT_INDEX).sort_index()
+
+def select_facts(facts, dimension=None, metric=None, year=None, half=None, category=None):
+    """
+    팩트 테이블에서 조건에 맞는 행을 정렬된 인덱스로 잘라냅니다.
+    각 인자는 하나의 값, 값 목록 또는 None(전체)을 받을 수 있습니다.
+
+    예: select_facts(facts, dimension='age', metric='고용률 (%)', year=2023)
+    """
+    key = tuple(slice(None) if value is None else value
+                for value in [dimension, metric, year, half, category])
+    return facts.loc[key, :]
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+import plotly
+import plotly.graph_objects as go
+import plotly.io as pio
+from employ_analysis.load_data import results_dir
+from employ_analysis.data_registry import dataset_hash
+from employ_analysis.period_index import available_years
+
+# 미리 만든 Figure (Plotly JSON) 저장소
+# run_analysis.py가 전처리를 마친 뒤, 등록된 차트마다 페이지에서 고를 수 있는 모든 인자 조합의 Figure를
+# results/figures/ 에 Plotly JSON으로 저장하고 manifest.json에 (차트, 인자, 원본 데이터 내용 해시, 차트 코드 해시)를 기록합니다.
+# 페이지는 figure_cache.cached_figure를 통해 저장된 JSON을 그대로 읽어 쓰므로 pandas로 데이터를 다시 가공하지 않으며,
+# 원본 데이터나 차트 코드가 기록과 다르거나 저장된 조합이 아니면 예전처럼 Figure를 직접 만듭니다.
+# 내용 해시로 비교하므로 새로 체크아웃하거나 파일을 복사해 수정 시각만 바뀐 경우에는 다시 만들지 않습니다.
+
+figures_dir = os.path.join(results_dir, 'figures')
+figure_manifest_path = os.path.join(figures_dir, 'manifest.json')
+
+# 매니페스트와 저장 형식이 바뀌어 기존 결과를 쓰면 안 될 때 올립니다. (차트 코드가 바뀐 것은 코드 해시로 알아냄)
+FIGURE_ARTIFACT_VERSION = 4
+
+# 프로젝트 루트 (차트 코드 해시에 넣을 모듈을 고를 때 사용)
+project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 미리 만들 차트를 정의한 모듈 (import 하면 cached_figure(params=...)가 차트를 등록함)
+chart_modules = [
+    'employ_analysis.visualize_total_eco_activity_time_series',
+    'employ_analysis.visualize_age_plotly',
+    'employ_analysis.visualize_edu_plotly',
+    'employ_analysis.visualize_sex_plotly',
+    'employ_analysis.visualize_sex_pie_plotly',
+    'employ_analysis.visualize_type_plotly',
+    'employ_analysis.visualize_region_plotly',
+    'disable_pop.visualize_animated_pie_chart',
+    'disable_pop.visualize_national_trend_line_chart',
+    'disable_pop.visualize_regional_map_chart',
+    'disable_pop.visualize_gender_trend_line_chart',
+    'employ_analysis.assistance_charts',
+    'employ_analysis.facility_charts',
+]
+
+# 차트 이름 -> {'builder', 'datasets', 'params'}
+_charts = {}
+# 읽어 둔 매니페스트 {'manifest': ((수정 시각, 크기), dict)}
+_manifest_cache = {}
+# 차트 함수 -> 차트 코드 해시
+_code_hashes = {}
+_lock = threading.Lock()
+# build_figure_artifacts()가 실행 중인 스레드 표시
+_building = threading.local()
+
+def register_chart(chart, builder, datasets, params):
+    """
+    미리 만들 차트를 등록합니다. params()는 미리 만들 인자 조합(dict) 목록을 반환하는 함수입니다.
+    보통은 직접 부르지 않고 cached_figure(..., params=...)로 등록합니다.
+    """
+    _charts[chart] = {'builder': builder, 'datasets': tuple(datasets), 'params': params}
+
+def year_params(dataset, metrics):
+    """연도 슬라이더가 있는 고용 차트의 인자 조합: 고를 수 있는 연도마다 한 개와 모든 연도를 담은 애니메이션 한 개"""
+    return ([{'year': year, 'animate': False} for year in available_years(dataset, metrics)]
+            + [{'year': None, 'animate': True}])
+
+def _json_value(value):
+    # NumPy 정수/실수는 파이썬 값으로 바꾸어 기록
+    return value.item() if hasattr(value, 'item') else str(value)
+
+def call_arguments(builder, args, kwargs):
+    """차트 함수 호출 인자를 기본값까지 채운 {인자 이름: 값} dict로 바꿉니다."""
+    bound = inspect.signature(builder).bind(*args, **kwargs)
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+def chart_params(chart):
+    """등록된 차트의 미리 만들 인자 조합 목록을 기본값까지 채운 dict 목록으로 반환합니다."""
+    registration = _charts[chart]
+    return [call_arguments(registration['builder'], (), params) for params in registration['params']()]
+
+def artifact_key(chart, arguments):
+    """매니페스트에서 (차트, 인자)를 찾는 키입니다. (예: 'employ_analysis.visualize_age_plotly.create_age_plotly_chart|{"animate": false, "year": 2020}')"""
+    return f"{chart}|{json.dumps(arguments, sort_keys=True, ensure_ascii=False, default=_json_value)}"
+
+def _artifact_file_name(chart, key):
+    return f"{chart.rsplit('.', 1)[-1]}-{hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]}.json"
+
+def _input_versions(datasets):
+    """데이터셋 이름 -> 원본 파일 내용 해시(파일이 없으면 None)"""
+    return {name: dataset_hash(name) for name in datasets}
+
+def _project_module(value):
+    """값이 프로젝트 안의 모듈이거나 프로젝트 모듈에 정의된 함수/클래스이면 그 모듈을 반환합니다."""
+    module = value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or '')
+    file_path = getattr(module, '__file__', None)
+    if file_path and os.path.abspath(file_path).startswith(project_dir + os.sep):
+        return module
+    return None
+
+def code_hash(builder):
+    """
+    차트 코드 해시를 반환합니다. 차트 함수가 정의된 모듈과, 그 모듈이 가져다 쓰는 프로젝트 모듈(hover_text, year_animation 등)의
+    소스를 합친 해시이므로, 차트를 그리는 코드가 바뀌면 미리 만든 Figure를 쓰지 않고 다시 만듭니다.
+    """
+    digest = _code_hashes.get(builder)
+    if digest is not None:
+        return digest
+    module = sys.modules[builder.__module__]
+    modules = {module.__name__: module}
+    for value in list(vars(module).values()):
+        dependency = _project_module(value)
+        if dependency is not None:
+            modules[dependency.__name__] = dependency
+    sha256 = hashlib.sha256()
+    for name in sorted(modules):
+        sha256.update(name.encode('utf-8'))
+        sha256.update(inspect.getsource(modules[name]).encode('utf-8'))
+    digest = _code_hashes[builder] = sha256.hexdigest()
+    return digest
+
+def _empty_manifest():
+    return {'version': FIGURE_ARTIFACT_VERSION, 'plotly_version': plotly.__version__, 'figures': {}}
+
+def load_figure_manifest():
+    """저장된 매니페스트를 반환합니다. 없거나 형식 버전이 다르면 빈 매니페스트를 반환합니다. (파일이 바뀌었을 때만 다시 읽음)"""
+    try:
+        stat = os.stat(figure_manifest_path)
+    except OSError:
+        return _empty_manifest()
+    with _lock:
+        cached = _manifest_cache.get('manifest')
+        if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+            return cached[1]
+    try:
+        with open(figure_manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"경고: 미리 만든 Figure 매니페스트('{figure_manifest_path}')를 읽지 못했습니다: {e}")
+        manifest = None
+    # 차트 코드나 Plotly 버전이 달라졌으면 저장된 Figure를 쓰지 않음
+    if (not isinstance(manifest, dict) or manifest.get('version') != FIGURE_ARTIFACT_VERSION
+            or manifest.get('plotly_version') != plotly.__version__):
+        manifest = _empty_manifest()
+    with _lock:
+        _manifest_cache['manifest'] = ((stat.st_mtime_ns, stat.st_size), manifest)
+    return manifest
+
+def load_figure_artifact(chart, arguments):
+    """
+    미리 만든 Figure를 읽어 반환합니다. arguments는 call_arguments()로 기본값까지 채운 인자입니다.
+    저장된 조합이 없거나, 만든 뒤에 원본 데이터나 차트 코드가 바뀌었거나, 파일을 읽지 못하면 None을 반환합니다.
+    """
+    # 미리 만드는 중에는 저장된 Figure를 읽지 않고 모두 직접 만듦
+    # (애니메이션 차트가 부르는 연도별 차트도 다시 만들어, 저장된 Figure가 직접 만든 Figure와 같도록 함)
+    if getattr(_building, 'active', False):
+        return None
+    entry = load_figure_manifest()['figures'].get(artifact_key(chart, arguments))
+    if entry is None:
+        return None
+    registration = _charts[chart]
+    if entry.get('code') != code_hash(registration['builder']) or entry['inputs'] != _input_versions(registration['datasets']):
+        return None
+    try:
+        with open(os.path.join(figures_dir, entry['file']), 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    # 저장된 JSON은 Plotly가 검증한 Figure를 쓴 것이므로 data와 layout은 다시 검증하지 않고 그대로 담음
+    # (검증하면 시간이 오래 걸리고, 숫자 text 배열이 문자열로 바뀌는 등 원래 Figure와 달라짐)
+    return go.Figure(spec, _validate=False)
+
+def _json_size(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+def payload_sizes(spec):
+    """
+    Plotly JSON(dict)의 부분별 크기(바이트, UTF-8 최소 JSON 기준)를 반환합니다.
+    {'data', 'layout', 'frames', 'geometry', 'total'} 중 geometry는 data와 frames에 들어 있는 지도 경계(geojson)의 크기입니다.
+    """
+    traces = list(spec.get('data', []))
+    for frame in spec.get('frames', []):
+        traces.extend(frame.get('data', []))
+    return {
+        'data': _json_size(spec.get('data', [])),
+        'layout': _json_size(spec.get('layout', {})),
+        'frames': _json_size(spec.get('frames', [])),
+        'geometry': sum(_json_size(trace['geojson']) for trace in traces if 'geojson' in trace),
+        'total': _json_size(spec),
+    }
+
+def payload_report():
+    """
+    미리 만든 Figure마다 (차트, 인자, 부분별 크기, 이전 크기)를 큰 순서로 반환합니다.
+    이전 크기는 같은 (차트, 인자)의 Figure를 마지막으로 다시 만들기 전에 저장되어 있던 파일 크기입니다. (처음 만들었으면 None)
+    """
+    rows = []
+    for entry in load_figure_manifest()['figures'].values():
+        if 'payload' in entry:
+            rows.append((entry['chart'], entry['params'], entry['payload'], entry.get('previous_total')))
+    return sorted(rows, key=lambda row: row[2]['total'], reverse=True)
+
+def print_payload_report(report=None):
+    """payload_report() 결과를 표 형태로 출력합니다."""
+    report = payload_report() if report is None else report
+    print("미리 만든 Figure별 크기 (전체 = data + layout + frames, 괄호는 지도 경계):")
+    total = 0
+    for chart, params, sizes, previous_total in report:
+        total += sizes['total']
+        args = ', '.join(f"{name}={value}" for name, value in params.items())
+        change = '' if previous_total is None else f" (이전 {previous_total / 1024:,.1f} KB, {sizes['total'] / previous_total:.0%})"
+        print(f"  - {chart.rsplit('.', 1)[-1]}({args}): {sizes['total'] / 1024:,.1f} KB{change}"
+              f" = data {sizes['data'] / 1024:,.1f} KB ({sizes['geometry'] / 1024:,.1f} KB)"
+              f" + layout {sizes['layout'] / 1024:,.1f} KB + frames {sizes['frames'] / 1024:,.1f} KB")
+    print(f"  합계: Figure {len(report)}개, {total / 1024:,.1f} KB")
+
+def _write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _recorded_sizes():
+    """형식 버전과 관계없이 저장된 매니페스트에 기록된 {키: 전체 크기}를 반환합니다. (없으면 빈 dict)"""
+    try:
+        with open(figure_manifest_path, 'r', encoding='utf-8') as f:
+            figures = json.load(f).get('figures', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return {key: entry.get('bytes') for key, entry in figures.items() if isinstance(entry, dict)}
+
+def build_figure_artifacts(force=False):
+    """
+    등록된 모든 차트의 모든 인자 조합을 results/figures/ 에 Plotly JSON으로 저장하고 매니페스트를 갱신합니다.
+    원본 데이터와 차트 코드가 바뀌지 않은 조합은 건너뛰며(force=True이면 모두 다시 만듦),
+    더 이상 고를 수 없는 조합(예: 사라진 연도)의 파일은 지웁니다. 차트를 만들 수 없는 조합은 저장하지 않습니다.
+
+    Returns:
+        list: 새로 만든 파일 경로 목록.
+    """
+    for module in chart_modules:
+        importlib.import_module(module)
+
+    os.makedirs(figures_dir, exist_ok=True)
+    previous = load_figure_manifest()['figures']
+    recorded = _recorded_sizes()
+    manifest = _empty_manifest()
+    entries = manifest['figures']
+    written = []
+
+    for chart, registration in _charts.items():
+        versions = _input_versions(registration['datasets'])
+        code = code_hash(registration['builder'])
+        for arguments in chart_params(chart):
+            key = artifact_key(chart, arguments)
+            entry = previous.get(key)
+            if (not force and entry is not None and entry['inputs'] == versions and entry.get('code') == code
+                    and os.path.exists(os.path.join(figures_dir, entry['file']))):
+                entries[key] = entry
+                continue
+
+            _building.active = True
+            try:
+                fig = registration['builder'](**arguments)
+            except Exception as e:
+                print(f"'{key}' Figure 생성 중 오류 발생: {e}")
+                continue
+            finally:
+                _building.active = False
+            if fig is None:
+                continue
+
+            data = pio.to_json(fig, validate=False)
+            spec = json.loads(data)
+            file_name = _artifact_file_name(chart, key)
+            path = os.path.join(figures_dir, file_name)
+            _write_json(path, data)
+            written.append(path)
+            entries[key] = {
+                'chart': chart,
+                'params': json.loads(json.dumps(arguments, default=_json_value)),
+                'file': file_name,
+                'inputs': versions,
+                'code': code,
+                'bytes': len(data.encode('utf-8')),
+                'sha256': hashlib.sha256(data.encode('utf-8')).hexdigest(),
+                'payload': payload_sizes(spec),
+                # 다시 만들기 전 크기 (크기 변화를 추적하기 위해 기록)
+                'previous_total': recorded.get(key),
+            }
+
+    # 매니페스트에 남지 않은 예전 파일 정리 (형식 버전이 바뀌어 읽지 않은 매니페스트의 파일 포함)
+    kept = {entry['file'] for entry in entries.values()}
+    for file_name in os.listdir(figures_dir):
+        if file_name.endswith('.json') and file_name not in kept and file_name != os.path.basename(figure_manifest_path):
+            try:
+                os.remove(os.path.join(figures_dir, file_name))
+            except OSError:
+                pass
+
+    _write_json(figure_manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1))
+    return written
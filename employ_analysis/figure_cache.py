@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import functools
+import threading
+from collections import OrderedDict
+from employ_analysis.data_registry import dataset_version
+from employ_analysis.figure_artifacts import register_chart, call_arguments, artifact_key, load_figure_artifact
+
+# 고용 차트 Figure 캐시
+# 슬라이더를 움직일 때마다 같은 연도의 차트를 다시 만들지 않도록, (차트, 인자, 원본 데이터 버전)별로
+# 만들어 둔 Figure를 프로세스 전체에서 함께 씁니다. 데이터 버전은 차트가 읽는 데이터셋 파일의
+# (수정 시각, 크기)이므로, run_analysis.py가 결과 파일을 다시 쓰면 자동으로 새 Figure를 만듭니다.
+# 캐시에 없는 Figure는 run_analysis.py가 미리 만들어 둔 Plotly JSON(figure_artifacts)이 있으면 그것을 읽고,
+# 없으면 차트 함수로 직접 만듭니다.
+#
+# 반환되는 Figure는 여러 세션이 함께 쓰는 객체이므로 직접 수정하지 말아야 합니다.
+
+# 캐시에 남겨 둘 Figure 수 (연도 약 12개 x 차트 7개보다 넉넉하게)
+FIGURE_CACHE_SIZE = 128
+
+# (차트 이름, 인자 키, 데이터 버전) -> Figure (가장 최근에 쓴 항목이 뒤쪽)
+# 인자 키는 미리 만든 Figure와 같은 artifact_key이므로, create_age_plotly_chart(2020)과 create_age_plotly_chart(year=2020)처럼
+# 인자를 다르게 넘겨도 같은 항목을 씁니다.
+_figures = OrderedDict()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+_lock = threading.Lock()
+
+def cached_figure(*datasets, params=None):
+    """
+    차트 함수의 결과를 (차트, 인자, 데이터셋 버전)별로 캐시하는 데코레이터입니다.
+    datasets에는 차트가 읽는 데이터셋 이름을 모두 적습니다.
+    params(인자 조합 dict 목록을 반환하는 함수)를 주면 run_analysis.py가 그 조합들의 Figure를 미리 만들어 둡니다.
+    (인자가 없는 차트는 params=lambda: [{}])
+
+    예:
+        @cached_figure('disable_age', params=lambda: year_params('disable_age', ['고용률 (%)']))
+        def create_age_plotly_chart(year=None, animate=False): ...
+    """
+    def decorator(builder):
+        chart = f"{builder.__module__}.{builder.__qualname__}"
+        if params is not None:
+            register_chart(chart, builder, datasets, params)
+
+        @functools.wraps(builder)
+        def wrapper(*args, **kwargs):
+            arguments = call_arguments(builder, args, kwargs)
+            versions = tuple(dataset_version(name) for name in datasets)
+            key = (chart, artifact_key(chart, arguments), versions)
+            with _lock:
+                if key in _figures:
+                    _figures.move_to_end(key)
+                    _stats['hits'] += 1
+                    return _figures[key]
+                _stats['misses'] += 1
+
+            # 차트를 만드는 동안에는 잠금을 풀어 다른 차트 요청을 막지 않음
+            fig = None
+            if params is not None:
+                fig = load_figure_artifact(chart, arguments)
+            if fig is None:
+                fig = builder(*args, **kwargs)
+
+            with _lock:
+                _figures[key] = fig
+                _figures.move_to_end(key)
+                while len(_figures) > FIGURE_CACHE_SIZE:
+                    _figures.popitem(last=False)
+                    _stats['evictions'] += 1
+            return fig
+
+        wrapper.chart_name = chart
+        return wrapper
+    return decorator
+
+def invalidate_figures(chart=None):
+    """
+    캐시된 Figure를 지웁니다. chart(예: 'create_age_plotly_chart')를 주면 그 차트만 지웁니다.
+    run_analysis.py처럼 같은 프로세스에서 데이터를 다시 만든 뒤 호출합니다.
+
+    Returns:
+        int: 지운 Figure 수.
+    """
+    with _lock:
+        if chart is None:
+            removed = len(_figures)
+            _figures.clear()
+            return removed
+        keys = [key for key in _figures if key[0] == chart or key[0].rsplit('.', 1)[-1] == chart]
+        for key in keys:
+            del _figures[key]
+        return len(keys)
+
+def figure_cache_info():
+    """캐시 적중/실패 횟수와 크기를 dict로 반환합니다. {'hits', 'misses', 'evictions', 'size', 'maxsize'}"""
+    with _lock:
+        return {**_stats, 'size': len(_figures), 'maxsize': FIGURE_CACHE_SIZE}
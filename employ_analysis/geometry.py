@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+# 스크립트로 실행할 때도 employ_analysis 패키지를 불러올 수 있도록 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from employ_analysis.packed_geometry import PackedGeometry, packed_cache_path, read_packed, write_packed
+
+# 지도 경계(GeoJSON) 파일 제공 모듈
+#
+# 1. data/ 에 함께 배포된 파일(vendored)을 사용합니다. 모든 경계 데이터는 저장소에 들어 있습니다.
+#    (시군구 경계는 municipal_geometry.py로 저장소 안의 시도 경계와 시군구 좌표에서 만든 파일)
+# 2. 배포 파일이 지워졌으면 data/geometry_cache/ 의 버전별 캐시 파일을 사용합니다.
+# 3. 둘 다 없고 원격 주소가 있는 경계는 원격 다운로드를 백그라운드 스레드로 시작하고 바로 None을 반환합니다. (화면 그리기를 막지 않음)
+#    GEOMETRY_REMOTE_FETCH=0 환경 변수로 원격 다운로드를 끌 수 있습니다. (외부 네트워크가 없는 서버)
+#
+# 모든 파일은 geometry_sources에 고정된 해시와 같아야 사용합니다.
+#
+# 읽은 경계는 PackedGeometry(NumPy 배열로 된 읽기 전용 객체)로 반환하며, 파싱 결과를
+# data/geometry_cache/parsed/<원본 해시>.pickle 에 저장해 두어 다음부터는 JSON을 다시 파싱하지 않습니다.
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_dir = os.path.join(base_dir, 'data')
+geometry_cache_dir = os.path.join(data_dir, 'geometry_cache')
+cache_manifest_path = os.path.join(geometry_cache_dir, 'manifest.json')
+parsed_cache_dir = os.path.join(geometry_cache_dir, 'parsed')
+
+remote_fetch_enabled = os.environ.get('GEOMETRY_REMOTE_FETCH', '1') != '0'
+
+# 경계 데이터 이름 -> 파일 정보
+#   file_name: data/ 에 배포되는 파일 이름
+#   version  : 캐시 파일 이름에 붙는 버전 (원본이 바뀌면 올림)
+#   url      : 배포 파일이 없을 때 내려받을 주소 (None이면 내려받지 않음)
+#   sha256   : 배포 파일의 해시 (배포 파일, 캐시, 내려받은 파일 모두 이 해시와 같아야 사용)
+#   id_property: 지역 id로 쓰는 속성 (시군구는 이름이 겹치므로 행정 코드 사용)
+geometry_sources = {
+    'provinces': {
+        'file_name': 'skorea_provinces_geo.json',
+        'version': '2013',
+        'url': "https://raw.githubusercontent.com/southkorea/southkorea-maps/master/korea_administrative_boundaries/2018/geojson/skorea_provinces_geo.json",
+        'sha256': 'a1801f1f1446b9e6ae26edf0009ce1feed666bef0a0586d548969f510e283dce',
+        'id_property': 'name',
+    },
+    # python employ_analysis/municipal_geometry.py로 만든 근사 경계 (원격 원본이 없으므로 내려받지 않음)
+    'municipalities': {
+        'file_name': 'skorea_municipalities_geo_simple.json',
+        'version': '2022',
+        'url': None,
+        'sha256': 'a10bb182b7d5a7c3d940e8c4a4d7715b500f8d0e163b98e1960deda0eee0fff0',
+        'id_property': 'code',
+    },
+}
+
+# 다운로드에 실패하면 이 시간(초)이 지난 뒤에 다시 시도
+FETCH_RETRY_SECONDS = 300
+
+# 경계 데이터 이름 -> 백그라운드 다운로드 상태 {'state': 'fetching' 또는 'failed', 'message', 'time'}
+_fetch_status = {}
+_fetch_lock = threading.Lock()
+_manifest_lock = threading.Lock()
+
+def vendored_path(name):
+    """data/ 에 함께 배포되는 경계 파일 경로를 반환합니다."""
+    return os.path.join(data_dir, geometry_sources[name]['file_name'])
+
+def cache_path(name):
+    """버전별 캐시 파일 경로를 반환합니다. 예: 'municipalities' -> 'data/geometry_cache/municipalities-2013.json'"""
+    return os.path.join(geometry_cache_dir, f"{name}-{geometry_sources[name]['version']}.json")
+
+def geometry_path(name):
+    """경계 데이터를 읽을 파일 경로를 반환합니다. 배포 파일이 있으면 그 경로, 없으면 캐시 파일 경로입니다."""
+    path = vendored_path(name)
+    return path if os.path.exists(path) else cache_path(name)
+
+def _sha256_bytes(content):
+    return hashlib.sha256(content).hexdigest()
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def _write_json(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def _load_cache_manifest():
+    return _load_json(cache_manifest_path)
+
+def _is_feature_collection(geojson):
+    return isinstance(geojson, dict) and geojson.get('type') == 'FeatureCollection' and bool(geojson.get('features'))
+
+def load_packed(content, decode):
+    """
+    파일 내용의 해시로 바이너리 캐시를 찾아 PackedGeometry를 반환합니다.
+    캐시가 없으면 decode(content)로 GeoJSON dict를 만들어 변환한 뒤 캐시에 저장합니다. decode가 None을 반환하면 None을 반환합니다.
+    """
+    path = packed_cache_path(parsed_cache_dir, _sha256_bytes(content))
+    packed = read_packed(path)
+    if packed is not None:
+        return packed
+    geojson = decode(content)
+    if geojson is None:
+        return None
+    packed = PackedGeometry.from_geojson(geojson)
+    try:
+        write_packed(path, packed)
+    except OSError as e:
+        print(f"경고: 경계 바이너리 캐시를 저장하지 못했습니다: {e}")
+    return packed
+
+def _read_verified(path, expected_sha256):
+    """파일을 읽어 해시와 GeoJSON 구조를 검사한 뒤 PackedGeometry로 반환합니다. 검사에 실패하면 None을 반환합니다."""
+    try:
+        with open(path, 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None
+    if _sha256_bytes(content) != expected_sha256:
+        print(f"경고: '{path}' 파일의 해시가 일치하지 않아 사용하지 않습니다.")
+        return None
+
+    def decode(content):
+        try:
+            geojson = json.loads(content.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            print(f"경고: '{path}' 파일이 올바른 JSON이 아니어서 사용하지 않습니다.")
+            return None
+        if not _is_feature_collection(geojson):
+            print(f"경고: '{path}' 파일이 GeoJSON FeatureCollection이 아니어서 사용하지 않습니다.")
+            return None
+        return geojson
+
+    try:
+        return load_packed(content, decode)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"경고: '{path}' 파일의 도형을 읽지 못해 사용하지 않습니다: {e}")
+        return None
+
+def fetch_geometry(name, timeout=30, vendor=False):
+    """
+    원격에서 경계 파일을 내려받아 고정된 해시로 검증한 뒤 버전별 캐시에 저장합니다. (호출한 스레드를 막는 동기 함수)
+    vendor가 True이면 캐시 대신 data/ 에 배포 파일로 저장합니다. 원격 주소가 없는 경계는 ValueError를 발생시킵니다.
+
+    Returns:
+        str: 저장된 파일 경로.
+    """
+    source = geometry_sources[name]
+    if source['url'] is None:
+        raise ValueError(f"'{name}' 경계 파일은 원격 주소가 없어 내려받을 수 없습니다.")
+    response = requests.get(source['url'], timeout=timeout)
+    response.raise_for_status()
+    content = response.content
+    sha256 = _sha256_bytes(content)
+    if sha256 != source['sha256']:
+        raise ValueError(f"'{name}' 경계 파일의 해시가 예상 값과 다릅니다.")
+    if not _is_feature_collection(json.loads(content.decode('utf-8'))):
+        raise ValueError(f"'{name}' 경계 파일이 GeoJSON FeatureCollection이 아닙니다.")
+
+    if vendor:
+        path = vendored_path(name)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+        return path
+
+    os.makedirs(geometry_cache_dir, exist_ok=True)
+    path = cache_path(name)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+    with _manifest_lock:
+        manifest = _load_cache_manifest()
+        manifest[name] = {
+            'version': source['version'],
+            'file': os.path.basename(path),
+            'sha256': sha256,
+            'url': source['url'],
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        _write_json(cache_manifest_path, manifest)
+    return path
+
+def _fetch_in_background(name):
+    try:
+        path = fetch_geometry(name)
+        print(f"'{name}' 경계 파일 다운로드 완료 -> '{path}'")
+        with _fetch_lock:
+            _fetch_status.pop(name, None)
+    except Exception as e:
+        print(f"'{name}' 경계 파일 다운로드 중 오류 발생: {e}")
+        with _fetch_lock:
+            _fetch_status[name] = {'state': 'failed', 'message': str(e), 'time': time.time()}
+
+def start_background_fetch(name):
+    """
+    원격 다운로드를 백그라운드 스레드로 시작합니다.
+    원격 다운로드가 꺼져 있거나, 원격 주소가 없거나, 이미 진행 중이거나, 최근에 실패했으면 시작하지 않고 False를 반환합니다.
+    """
+    if not remote_fetch_enabled or geometry_sources[name]['url'] is None:
+        return False
+    with _fetch_lock:
+        status = _fetch_status.get(name)
+        if status is not None and (status['state'] == 'fetching' or time.time() - status['time'] < FETCH_RETRY_SECONDS):
+            return False
+        _fetch_status[name] = {'state': 'fetching', 'message': '', 'time': time.time()}
+    threading.Thread(target=_fetch_in_background, args=(name,), daemon=True).start()
+    return True
+
+def fetch_status(name):
+    """
+    경계 데이터 상태를 (상태, 메시지)로 반환합니다.
+    상태는 'ready'(로컬 파일 있음), 'fetching'(다운로드 중), 'failed'(다운로드 실패), 'missing'(파일 없음) 중 하나입니다.
+    """
+    if os.path.exists(vendored_path(name)) or os.path.exists(cache_path(name)):
+        return 'ready', ''
+    with _fetch_lock:
+        status = _fetch_status.get(name)
+    if status is None:
+        return 'missing', ''
+    return status['state'], status['message']
+
+def load_geometry(name, fetch=True):
+    """
+    경계 데이터(PackedGeometry)를 로컬 파일에서 불러옵니다. GeoJSON dict가 필요하면 .to_geojson()을 사용합니다.
+    배포 파일 -> 검증된 캐시 순서로 찾고, 둘 다 없으면 백그라운드 다운로드를 시작한 뒤 바로 None을 반환합니다.
+    fetch가 False이면 다운로드를 시작하지 않습니다. (오프라인 전처리)
+    """
+    source = geometry_sources[name]
+
+    expected_sha256 = source['sha256']
+
+    path = vendored_path(name)
+    if os.path.exists(path):
+        geometry = _read_verified(path, expected_sha256)
+        if geometry is not None:
+            return geometry
+
+    path = cache_path(name)
+    if os.path.exists(path):
+        entry = _load_cache_manifest().get(name)
+        if entry is not None and entry.get('version') == source['version']:
+            geometry = _read_verified(path, expected_sha256)
+            if geometry is not None:
+                return geometry
+        else:
+            print(f"경고: '{path}' 캐시 파일의 기록이 없거나 버전이 달라 사용하지 않습니다.")
+
+    if fetch and start_background_fetch(name):
+        print(f"'{name}' 경계 파일이 없어 백그라운드에서 다운로드를 시작합니다.")
+    return None
+
+def vendor_geometry():
+    """
+    배포 파일이 없고 원격 주소가 있는 경계 데이터를 내려받아 data/ 에 배포 파일로 저장합니다. (명시적으로 요청할 때만 실행)
+
+    Returns:
+        list: 새로 받은 경계 데이터 이름 목록.
+    """
+    fetched = []
+    for name, source in geometry_sources.items():
+        if os.path.exists(vendored_path(name)) or source['url'] is None:
+            continue
+        try:
+            fetch_geometry(name, vendor=True)
+        except Exception as e:
+            print(f"'{name}' 경계 파일 다운로드 중 오류 발생: {e}")
+            continue
+        fetched.append(name)
+    return fetched
+
+if __name__ == '__main__':
+    # 네트워크가 되는 곳에서 배포 파일이 없는 경계 데이터를 data/ 에 받아 둠
+    fetched = vendor_geometry()
+    print(f"지도 경계 배포 파일 다운로드 완료: {', '.join(fetched) or '변경 없음'}")
+    for source_name in geometry_sources:
+        print(f"'{source_name}': {fetch_status(source_name)[0]} ('{geometry_path(source_name)}')")
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import threading
+
+# 지도 경계 저장소
+#
+# PackedGeometry를 감싸 지역 id를 한 번만 붙이고, 한글 이름과 영문 이름으로 지역을 찾을 수 있도록 색인합니다.
+# 차트에는 바꿀 수 없는 GeoJSON 보기(FrozenDict와 튜플)를 넘기므로, 여러 세션이 같은 객체를 함께 써도
+# 차트 코드가 공유 상태를 바꿀 수 없고, 렌더링마다 지역을 돌며 id를 붙이는 작업도 하지 않습니다.
+
+class FrozenDict(dict):
+    """값을 바꿀 수 없는 dict입니다. json과 Plotly에는 일반 dict처럼 보입니다."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("읽기 전용 GeoJSON 보기는 바꿀 수 없습니다. 바꿔야 하면 to_geojson()으로 새 dict를 만드세요.")
+
+    __setitem__ = __delitem__ = update = pop = popitem = clear = setdefault = __ior__ = _read_only
+
+    # 바꿀 수 없는 객체이므로 복사하지 않고 그대로 공유 (Plotly가 그림을 복사할 때도 좌표를 다시 복사하지 않음)
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def freeze(value):
+    """dict와 list를 재귀적으로 FrozenDict와 튜플로 바꿉니다."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+class GeometryStore:
+    """
+    지도 경계(PackedGeometry)를 지역 id와 이름으로 색인한 읽기 전용 저장소입니다.
+
+    - id_property: 지역 id로 쓰는 속성 (GeoJSON feature의 'id'로 붙음, 중복되면 안 됨)
+    - index_properties: 지역을 찾을 때 쓰는 속성들 (예: 한글 이름 'name', 영문 이름 'name_eng')
+
+    예: store.feature_collection(['서울특별시', 'Busan'])  # 두 지역만 담은 읽기 전용 FeatureCollection
+    """
+
+    __slots__ = ('geometry', 'ids', '_id_positions', '_index', '_views', '_views_lock')
+
+    def __init__(self, geometry, id_property='name', index_properties=('name', 'name_eng')):
+        ids = tuple(properties.get(id_property) for properties in geometry.properties)
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"'{id_property}' 속성이 지역마다 다르지 않아 id로 쓸 수 없습니다.")
+
+        # 이름 -> 지역 위치 튜플 (시군구 이름처럼 여러 지역이 같은 이름을 쓸 수 있음)
+        index = {}
+        for position, (feature_id, properties) in enumerate(zip(ids, geometry.properties)):
+            keys = [feature_id] + [properties.get(name) for name in index_properties]
+            for key in dict.fromkeys(key for key in keys if key is not None):
+                index[key] = index.get(key, ()) + (position,)
+
+        set_attr = object.__setattr__
+        set_attr(self, 'geometry', geometry)
+        set_attr(self, 'ids', ids)
+        set_attr(self, '_id_positions', {feature_id: position for position, feature_id in enumerate(ids)})
+        set_attr(self, '_index', index)
+        # 선택한 지역 id 튜플 -> 읽기 전용 FeatureCollection
+        set_attr(self, '_views', {})
+        set_attr(self, '_views_lock', threading.Lock())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("GeometryStore는 읽기 전용입니다.")
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def positions(self, key):
+        """이름이나 id에 해당하는 지역 위치 목록을 반환합니다. 없으면 KeyError를 발생시킵니다."""
+        try:
+            return self._index[key]
+        except KeyError:
+            raise KeyError(f"경계 데이터에 '{key}' 지역이 없습니다.") from None
+
+    def id_of(self, key):
+        """이름(한글 또는 영문)이나 id에 해당하는 지역 id를 반환합니다. 여러 지역이 같은 이름을 쓰면 ValueError를 발생시킵니다."""
+        positions = self.positions(key)
+        if len(positions) > 1:
+            raise ValueError(f"'{key}' 이름을 쓰는 지역이 {len(positions)}개여서 하나로 정할 수 없습니다.")
+        return self.ids[positions[0]]
+
+    def properties(self, key):
+        """지역의 속성(읽기 전용)을 반환합니다."""
+        return self.geometry.properties[self._id_positions[self.id_of(key)]]
+
+    def feature_collection(self, keys=None):
+        """
+        지역 id가 붙은 읽기 전용 GeoJSON FeatureCollection을 반환합니다.
+        keys(이름 또는 id 목록)를 주면 그 지역들만 주어진 순서로 담습니다. 같은 선택은 처음 한 번만 만들고 다시 사용합니다.
+        """
+        ids = self.ids if keys is None else tuple(self.id_of(key) for key in keys)
+        view = self._views.get(ids)
+        if view is not None:
+            return view
+        positions = [self._id_positions[feature_id] for feature_id in ids]
+        geojson = self.geometry.to_geojson(positions)
+        for feature_id, feature in zip(ids, geojson['features']):
+            feature['id'] = feature_id
+        view = freeze(geojson)
+        with self._views_lock:
+            return self._views.setdefault(ids, view)
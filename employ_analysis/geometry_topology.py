@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import math
+import os
+from employ_analysis.geometry import geometry_sources, geometry_path, load_geometry, load_packed
+
+# 지도 경계 단순화 (오프라인 전처리)
+#
+# 원본 GeoJSON의 경계선을 이웃한 지역이 함께 쓰는 선(arc) 단위로 나누어 한 번만 저장하고(TopoJSON 방식),
+# 각 선을 Douglas-Peucker 방식으로 단순화한 뒤 좌표를 정수 격자로 양자화하여 단계별 TopoJSON 파일로 저장합니다.
+# 이웃한 지역이 같은 선을 쓰므로 단순화해도 경계 사이에 틈이나 겹침이 생기지 않습니다.
+#
+# 지도를 그릴 때는 화면 1픽셀이 나타내는 거리보다 허용 오차가 작은 단계 중 가장 단순한 단계를 골라 사용합니다.
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+geometry_results_dir = os.path.join(base_dir, 'results', 'geometry')
+
+# 단순화 단계 -> 허용 오차 (경위도 단위, 0.001도 ≈ 100m)
+# 좌표는 허용 오차의 1/4 간격 격자로 양자화합니다.
+simplification_levels = {
+    'fine': 0.001,
+    'medium': 0.004,
+    'coarse': 0.015,
+}
+
+# 원본 좌표를 비교할 때 사용하는 격자 (같은 점을 정확히 같은 값으로 보기 위함)
+SOURCE_PRECISION = 1e7
+
+# 화면 너비를 알 수 없을 때 가정하는 지도 너비 (픽셀, use_container_width 레이아웃 기준)
+DEFAULT_VIEWPORT_WIDTH = 1200
+
+def simplified_path(name, level):
+    """단계별 단순화 파일 경로를 반환합니다. 예: ('provinces', 'coarse') -> 'results/geometry/provinces-coarse.topojson'"""
+    return os.path.join(geometry_results_dir, f"{name}-{level}.topojson")
+
+# --- 뷰포트에 맞는 단계 선택 ---
+
+def mapbox_degrees_per_pixel(zoom):
+    """Mapbox 지도의 확대 수준(zoom)에서 1픽셀이 나타내는 경도 범위를 반환합니다. (512px 타일 기준)"""
+    return 360.0 / (512 * 2 ** zoom)
+
+def geo_degrees_per_pixel(lon_range, width=DEFAULT_VIEWPORT_WIDTH):
+    """경도 범위 [최소, 최대]를 width 픽셀에 그리는 지도에서 1픽셀이 나타내는 경도 범위를 반환합니다."""
+    return (lon_range[1] - lon_range[0]) / width
+
+def pick_level(degrees_per_pixel):
+    """
+    허용 오차가 1픽셀보다 작은 단계 중 가장 단순한 단계를 반환합니다.
+    모든 단계가 1픽셀보다 크면 None을 반환합니다. (원본을 그대로 사용)
+    """
+    fitting = [(tolerance, level) for level, tolerance in simplification_levels.items() if tolerance <= degrees_per_pixel]
+    return max(fitting)[1] if fitting else None
+
+# --- 위상(topology) 구성 ---
+
+def _feature_polygons(geometry):
+    """Polygon/MultiPolygon 좌표를 [폴리곤[링[점]]] 목록으로 반환합니다. 링의 마지막(닫는) 점은 제외합니다."""
+    polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+    result = []
+    for polygon in polygons:
+        rings = []
+        for ring in polygon:
+            points = [(round(p[0] * SOURCE_PRECISION), round(p[1] * SOURCE_PRECISION)) for p in ring]
+            if len(points) > 1 and points[0] == points[-1]:
+                points = points[:-1]
+            rings.append(points)
+        result.append(rings)
+    return result
+
+def _find_junctions(rings):
+    """
+    여러 링에서 앞뒤 이웃 점이 서로 다르게 나타나는 점(경계가 갈라지는 점)을 찾습니다.
+    이웃한 두 지역이 함께 쓰는 경계는 이 점들 사이에서 같은 선이 됩니다.
+    """
+    neighbors = {}
+    for ring in rings:
+        n = len(ring)
+        for i, point in enumerate(ring):
+            pair = frozenset((ring[i - 1], ring[(i + 1) % n]))
+            neighbors.setdefault(point, set()).add(pair)
+    return {point for point, pairs in neighbors.items() if len(pairs) > 1}
+
+def _split_ring(ring, junctions):
+    """링을 분기점에서 잘라 선(점 목록) 목록으로 반환합니다. 분기점이 없으면 닫힌 선 하나를 반환합니다."""
+    cut_indices = [i for i, point in enumerate(ring) if point in junctions]
+    if not cut_indices:
+        # 같은 링이 다른 지역에도 있으면 같은 선이 되도록 가장 작은 점에서 시작
+        start = ring.index(min(ring))
+        rotated = ring[start:] + ring[:start]
+        return [rotated + [rotated[0]]]
+    start = cut_indices[0]
+    rotated = ring[start:] + ring[:start]
+    cut_indices = [i - start for i in cut_indices]
+    arcs = []
+    for j, begin in enumerate(cut_indices):
+        end = cut_indices[j + 1] if j + 1 < len(cut_indices) else len(rotated)
+        arcs.append(rotated[begin:end + 1] if end < len(rotated) else rotated[begin:] + [rotated[0]])
+    return arcs
+
+def _closed_arc_key(arc):
+    """닫힌 선을 가장 작은 점에서 시작하도록 돌린 키를 반환합니다. (시작점이 다른 같은 링을 찾기 위함)"""
+    ring = arc[:-1]
+    start = ring.index(min(ring))
+    return tuple(ring[start:] + ring[:start] + [ring[start]])
+
+def build_topology(geojson):
+    """
+    GeoJSON FeatureCollection을 (선 목록, 지역 목록)으로 나눕니다.
+    지역은 {'properties', 'id', 'polygons': [[링[선 번호]]]} 형태이며,
+    선 번호가 음수(~i)이면 i번 선을 거꾸로 사용한다는 뜻입니다.
+    """
+    features = [(feature, _feature_polygons(feature['geometry'])) for feature in geojson['features']]
+    junctions = _find_junctions([ring for _, polygons in features for polygon in polygons for ring in polygon])
+
+    arcs, arc_index = [], {}
+    def add_arc(arc):
+        key = _closed_arc_key(arc) if arc[0] == arc[-1] and len(arc) > 2 else tuple(arc)
+        if key in arc_index:
+            return arc_index[key]
+        reversed_key = _closed_arc_key(arc[::-1]) if arc[0] == arc[-1] and len(arc) > 2 else tuple(arc[::-1])
+        if reversed_key in arc_index:
+            return ~arc_index[reversed_key]
+        arc_index[key] = len(arcs)
+        arcs.append(list(key))
+        return arc_index[key]
+
+    regions = []
+    for feature, polygons in features:
+        regions.append({
+            'properties': feature.get('properties', {}),
+            'id': feature.get('id'),
+            'polygons': [[[add_arc(arc) for arc in _split_ring(ring, junctions)] for ring in polygon if len(ring) >= 3]
+                         for polygon in polygons],
+        })
+    return arcs, regions
+
+# --- 단순화 ---
+
+def _point_line_distance(point, start, end):
+    (px, py), (ax, ay), (bx, by) = point, start, end
+    dx, dy = bx - ax, by - ay
+    if dx == 0 and dy == 0:
+        return math.hypot(px - ax, py - ay)
+    return abs(dy * px - dx * py + bx * ay - by * ax) / math.hypot(dx, dy)
+
+def _douglas_peucker(points, tolerance):
+    """양 끝점을 고정하고 허용 오차보다 가까운 중간 점들을 제거합니다."""
+    if len(points) < 3:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _point_line_distance(points[i], points[first], points[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+def simplify_arc(arc, tolerance):
+    """선 하나를 단순화합니다. 닫힌 선은 시작점에서 가장 먼 점으로 나누어 두 부분을 각각 단순화합니다."""
+    if arc[0] == arc[-1] and len(arc) > 3:
+        far = max(range(len(arc)), key=lambda i: math.hypot(arc[i][0] - arc[0][0], arc[i][1] - arc[0][1]))
+        return _douglas_peucker(arc[:far + 1], tolerance)[:-1] + _douglas_peucker(arc[far:], tolerance)
+    return _douglas_peucker(arc, tolerance)
+
+# --- 양자화 및 TopoJSON 인코딩 ---
+
+def _ring_points(arc_ids, arcs):
+    """선 번호 목록을 이어 붙여 닫힌 링의 점 목록을 만듭니다."""
+    points = []
+    for arc_id in arc_ids:
+        arc = arcs[arc_id] if arc_id >= 0 else arcs[~arc_id][::-1]
+        for point in (arc if not points else arc[1:]):
+            if not points or point != points[-1]:
+                points.append(point)
+    return points
+
+def _ring_area(points):
+    return abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(points, points[1:]))) / 2
+
+def encode_topology(arcs, regions, tolerance, object_name):
+    """
+    선을 단순화하고 양자화하여 TopoJSON dict를 만듭니다.
+    단순화로 점이 너무 적어진 링(작은 섬, 구멍)은 버리되, 지역마다 가장 큰 폴리곤 하나는 원본 선으로 남깁니다.
+    """
+    step = tolerance / 4
+    xs = [x for arc in arcs for x, _ in arc]
+    ys = [y for arc in arcs for _, y in arc]
+    x0, y0 = min(xs) / SOURCE_PRECISION, min(ys) / SOURCE_PRECISION
+
+    def quantize(arc):
+        quantized = []
+        for x, y in arc:
+            point = (round((x / SOURCE_PRECISION - x0) / step), round((y / SOURCE_PRECISION - y0) / step))
+            if not quantized or point != quantized[-1]:
+                quantized.append(point)
+        return quantized if len(quantized) > 1 else quantized * 2
+
+    tolerance_source = tolerance * SOURCE_PRECISION
+    out_arcs = [quantize(simplify_arc(arc, tolerance_source)) for arc in arcs]
+
+    def add_original_arc(arc_id):
+        arc = arcs[arc_id] if arc_id >= 0 else arcs[~arc_id][::-1]
+        out_arcs.append(quantize(arc))
+        return len(out_arcs) - 1
+
+    geometries = []
+    for region in regions:
+        polygons = []
+        for polygon in region['polygons']:
+            rings = [ring for ring in polygon if len(_ring_points(ring, out_arcs)) >= 4]
+            # 바깥 링이 없어지면 구멍도 의미가 없으므로 폴리곤 전체를 버림
+            if rings and rings[0] is polygon[0]:
+                polygons.append(rings)
+        if not polygons and region['polygons']:
+            # 모든 폴리곤이 없어진 작은 지역은 가장 큰 바깥 링을 원본 선으로 남김
+            largest = max(region['polygons'], key=lambda p: _ring_area(_ring_points(p[0], arcs)))
+            polygons = [[[add_original_arc(arc_id) for arc_id in largest[0]]]]
+        geometry = {
+            'type': 'MultiPolygon' if len(polygons) > 1 else 'Polygon',
+            'arcs': polygons if len(polygons) > 1 else polygons[0],
+            'properties': region['properties'],
+        }
+        if region['id'] is not None:
+            geometry['id'] = region['id']
+        geometries.append(geometry)
+
+    # 첫 점은 절대 좌표, 나머지는 앞 점과의 차이로 저장 (TopoJSON delta 인코딩)
+    delta_arcs = [[list(arc[0])] + [[x1 - x0_, y1 - y0_] for (x0_, y0_), (x1, y1) in zip(arc, arc[1:])]
+                  for arc in out_arcs]
+    return {
+        'type': 'Topology',
+        'transform': {'scale': [step, step], 'translate': [x0, y0]},
+        'objects': {object_name: {'type': 'GeometryCollection', 'geometries': geometries}},
+        'arcs': delta_arcs,
+    }
+
+def topology_to_geojson(topology, object_name=None):
+    """TopoJSON dict를 Plotly에 넘길 수 있는 GeoJSON FeatureCollection으로 바꿉니다."""
+    (sx, sy), (tx, ty) = topology['transform']['scale'], topology['transform']['translate']
+    # 양자화 간격보다 세밀한 자릿수는 의미가 없으므로 반올림하여 JSON 크기를 줄임
+    digits = max(0, -math.floor(math.log10(min(sx, sy)))) + 1
+
+    arcs = []
+    for delta_arc in topology['arcs']:
+        x = y = 0
+        arc = []
+        for dx, dy in delta_arc:
+            x, y = x + dx, y + dy
+            arc.append([round(x * sx + tx, digits), round(y * sy + ty, digits)])
+        arcs.append(arc)
+
+    def ring_coordinates(arc_ids):
+        points = []
+        for arc_id in arc_ids:
+            arc = arcs[arc_id] if arc_id >= 0 else arcs[~arc_id][::-1]
+            points.extend(arc if not points else arc[1:])
+        return points
+
+    object_name = object_name or next(iter(topology['objects']))
+    features = []
+    for geometry in topology['objects'][object_name]['geometries']:
+        if geometry['type'] == 'Polygon':
+            coordinates = [ring_coordinates(ring) for ring in geometry['arcs']]
+        else:
+            coordinates = [[ring_coordinates(ring) for ring in polygon] for polygon in geometry['arcs']]
+        feature = {
+            'type': 'Feature',
+            'properties': geometry.get('properties', {}),
+            'geometry': {'type': geometry['type'], 'coordinates': coordinates},
+        }
+        if 'id' in geometry:
+            feature['id'] = geometry['id']
+        features.append(feature)
+    return {'type': 'FeatureCollection', 'features': features}
+
+# --- 파일 저장 및 불러오기 ---
+
+def _source_sha256(name):
+    with open(geometry_path(name), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _read_topology(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def is_simplified_up_to_date(name):
+    """모든 단계의 단순화 파일이 현재 원본 경계 파일로 만들어졌는지 확인합니다."""
+    if not os.path.exists(geometry_path(name)):
+        return True
+    sha256 = _source_sha256(name)
+    for level in simplification_levels:
+        topology = _read_topology(simplified_path(name, level))
+        if topology is None or topology.get('source_sha256') != sha256:
+            return False
+    return True
+
+def build_simplified_geometry(force=False):
+    """
+    로컬에 있는 원본 경계 파일마다 단계별 단순화 TopoJSON을 results/geometry/ 에 저장합니다.
+    원본이 바뀌지 않았으면 건너뛰고, 원본 파일이 없는 경계(다운로드 전)는 원격 다운로드 없이 건너뜁니다.
+
+    Returns:
+        list: 새로 만든 파일 경로 목록.
+    """
+    written = []
+    for name in geometry_sources:
+        if not force and is_simplified_up_to_date(name):
+            continue
+        geometry = load_geometry(name, fetch=False)
+        if geometry is None:
+            continue
+        sha256 = _source_sha256(name)
+        arcs, regions = build_topology(geometry.to_geojson())
+        os.makedirs(geometry_results_dir, exist_ok=True)
+        for level, tolerance in simplification_levels.items():
+            topology = encode_topology(arcs, regions, tolerance, name)
+            topology['source_sha256'] = sha256
+            path = simplified_path(name, level)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(topology, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+            written.append(path)
+    return written
+
+def load_simplified_geometry(name, level):
+    """
+    단계별 단순화 파일을 PackedGeometry로 불러옵니다. 파일이 없거나 읽지 못하면 None을 반환합니다.
+    원본 경계와 마찬가지로 변환 결과를 파일 해시별 바이너리 캐시에 저장해 두고 다시 사용합니다.
+    """
+    try:
+        with open(simplified_path(name, level), 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    def decode(content):
+        try:
+            return topology_to_geojson(json.loads(content.decode('utf-8')), name)
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError):
+            return None
+
+    return load_packed(content, decode)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+import string
+import numpy as np
+import pandas as pd
+
+# 호버 텍스트 / customdata 문자열 만들기
+# 행마다 f-string을 만드는 대신(df.apply(lambda row: ...), iterrows) 템플릿의 자리표시자마다 열 전체를 한 번에 형식화하여
+# 이어 붙입니다. 같은 값은 한 번만 형식화하고, 열들은 NumPy 브로드캐스팅으로 맞추므로
+# 시군구처럼 지역이 많은 지도나 연도 frame이 많은 애니메이션도 (지역 x 연도) 문자열을 한 번에 만들 수 있습니다.
+#
+# 형식(spec)은 f-string과 같으므로(',' '.2f' '.1%' 등) 기존 f-string을 그대로 템플릿으로 옮길 수 있습니다.
+# 예: format_template("<b>{sido}</b><br>인구수: {count:,}", sido=names[:, None], count=population)  # (지역, 연도)
+
+def format_column(values, spec=''):
+    """배열(또는 Series)의 모든 값을 같은 형식 spec으로 바꾼 문자열 배열(object)을 반환합니다."""
+    values = np.asarray(values)
+    flat = values.ravel()
+    if flat.size == 0:
+        return np.empty(values.shape, dtype=object)
+    # 서로 다른 값마다 한 번만 형식화 (NaN도 하나의 값으로 취급)
+    codes, uniques = pd.factorize(flat, use_na_sentinel=False)
+    uniques = uniques.tolist() if isinstance(uniques, np.ndarray) else list(uniques)
+    formatted = np.array([format(value, spec) for value in uniques], dtype=object)
+    return formatted[codes].reshape(values.shape)
+
+def format_template(template, **columns):
+    """
+    template의 '{열 이름:형식}' 자리에 열을 통째로 넣어 만든 문자열 배열(object)을 반환합니다.
+    열의 모양이 다르면 NumPy 브로드캐스팅 규칙으로 맞춥니다. (예: (지역, 1) 이름과 (지역, 연도) 값)
+    """
+    parts = list(string.Formatter().parse(template))
+    names = {name for _, name, _, _ in parts if name is not None}
+    missing = names - set(columns)
+    if missing:
+        raise KeyError(f"템플릿의 {sorted(missing)} 자리에 넣을 열이 없습니다.")
+    shape = np.broadcast_shapes(*(np.shape(columns[name]) for name in names))
+
+    result = np.full(shape, '', dtype=object)
+    for literal, name, spec, conversion in parts:
+        if literal:
+            result = result + literal
+        if name is None:
+            continue
+        if conversion is not None or not name.isidentifier():
+            raise ValueError(f"'{{{name}}}': 템플릿에는 열 이름과 형식만 쓸 수 있습니다.")
+        result = result + np.broadcast_to(format_column(columns[name], spec), shape)
+    return result
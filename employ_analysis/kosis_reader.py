@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+import re
+from array import array
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+# '2013_고용률 (%)', '2022.1/2_고용률 (%)' 처럼 기간으로 시작하는 값 컬럼
+PERIOD_COLUMN_PATTERN = re.compile(r'^\d{4}(\.\d/2)?_')
+
+def _is_missing(value):
+    """pandas.read_excel이 결측값으로 읽는 빈 셀인지 확인합니다."""
+    return value is None or (isinstance(value, str) and value == '')
+
+def _header_value(value):
+    """헤더 셀 값을 pandas.read_excel과 같은 방식으로 정리합니다. (2013.0 -> 2013)"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def build_column_names(header_row1, header_row2):
+    """
+    KOSIS 두 줄 헤더에서 '{기간}_{지표}' 형태의 컬럼명 목록을 만듭니다.
+    첫 번째 행의 기간은 다음 기간이 나올 때까지 오른쪽 컬럼들에 이어서 적용됩니다.
+    """
+    new_columns = []
+    current_year_period = ""
+    for i, col_name_row2 in enumerate(header_row2):
+        col_name_row1 = header_row1[i] if i < len(header_row1) else None
+
+        # 첫 번째 컬럼 (구분별) 처리
+        if i == 0:
+            new_columns.append(str(_header_value(col_name_row2)).strip())
+            continue
+
+        # 첫 번째 행에 값이 있으면 새로운 연도/기간 시작
+        if not _is_missing(col_name_row1):
+            current_year_period = str(_header_value(col_name_row1)).strip()
+
+        # 컬럼 이름 조합
+        if not _is_missing(col_name_row2):
+            combined_name = f"{current_year_period}_{str(_header_value(col_name_row2)).strip()}"
+        else:
+            combined_name = f"{current_year_period}_Unknown"
+
+        new_columns.append(combined_name.strip())
+    return new_columns
+
+def _to_number(value):
+    """셀 값을 숫자로 바꿉니다. '-' 처럼 숫자가 아닌 값은 None을 반환합니다."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        # pandas.read_excel처럼 정수 값인 float(2583530.0)는 정수로 취급
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        text = value.strip()
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            return float(text)
+        except ValueError:
+            return None
+    return None
+
+class _NumericColumn:
+    """데이터 행을 읽으면서 값을 바로 float 배열에 쌓고, 모두 정수이면 int64로 변환합니다."""
+
+    def __init__(self):
+        self.values = array('d')
+        self.all_int = True
+
+    def append(self, value):
+        number = _to_number(value)
+        if number is None:
+            self.values.append(np.nan)
+            self.all_int = False
+            return
+        if not isinstance(number, int):
+            self.all_int = False
+        self.values.append(number)
+
+    def to_series(self):
+        data = np.frombuffer(self.values, dtype=np.float64).copy() if self.values else np.array([], dtype=np.float64)
+        if self.all_int and len(data):
+            data = data.astype(np.int64)
+        return pd.Series(data)
+
+class _LabelColumn:
+    """구분 컬럼(연령별, 성별 등) 값을 문자열로 모읍니다."""
+
+    def __init__(self):
+        self.values = []
+
+    def append(self, value):
+        self.values.append(None if _is_missing(value) else str(_header_value(value)))
+
+    def to_series(self):
+        return pd.Series(self.values, dtype='string')
+
+def read_kosis_workbook(file_path):
+    """
+    KOSIS 엑셀 파일(두 줄 헤더)을 openpyxl 읽기 전용 모드로 한 행씩 읽어
+    '{기간}_{지표}' 형태의 컬럼명을 가진 DataFrame으로 반환합니다.
+
+    헤더 두 행만 먼저 읽어 컬럼 구조를 정한 뒤, 데이터 행은 전체 시트를 메모리에 올리지 않고
+    기간별 값 컬럼은 숫자형(int64/float64), 구분 컬럼은 문자열로 바로 쌓습니다.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook.worksheets[0]
+        # KOSIS 파일은 시트 크기 정보(A1)가 잘못 기록되어 있어, 실제 셀을 끝까지 읽도록 초기화
+        worksheet.reset_dimensions()
+        rows = worksheet.iter_rows(values_only=True)
+        header_row1 = list(next(rows, ()))
+        header_row2 = list(next(rows, ()))
+        columns = build_column_names(header_row1, header_row2)
+        builders = [_NumericColumn() if PERIOD_COLUMN_PATTERN.match(col) else _LabelColumn() for col in columns]
+
+        empty_rows = 0
+        for row in rows:
+            # 시트 끝의 빈 행은 버리고, 중간의 빈 행은 결측 행으로 남김 (pandas.read_excel과 동일)
+            if all(_is_missing(value) for value in row):
+                empty_rows += 1
+                continue
+            for _ in range(empty_rows):
+                for builder in builders:
+                    builder.append(None)
+            empty_rows = 0
+
+            for i, builder in enumerate(builders):
+                builder.append(row[i] if i < len(row) else None)
+    finally:
+        workbook.close()
+
+    df = pd.concat([builder.to_series() for builder in builders], axis=1)
+    df.columns = columns
+    return df
@@ -1,18 +1,30 @@
 import pandas as pd
 import os
-import requests
-import json
+from employ_analysis.fact_table import select_facts
+from employ_analysis.geometry import load_geometry
+from employ_analysis.schema import apply_schema, print_report
+
+# 프로젝트 루트 기준 데이터/결과 디렉토리 경로
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_dir = os.path.join(base_dir, 'data')
+results_dir = os.path.join(base_dir, 'results')
+
+def processed_file_path(name):
+    """
+    run_analysis.py가 저장한 처리 결과(Parquet) 파일 경로를 반환합니다.
+    예: 'disable_age' -> 'results/processed_disable_age.parquet'
+    """
+    return os.path.join(results_dir, f"processed_{name}.parquet")
 
 def load_processed_data():
     """
-    'results' 디렉토리에서 처리된 엑셀 파일들을 읽어
+    'results' 디렉토리에서 처리된 Parquet 파일들을 읽어
     pandas DataFrame 딕셔너리로 반환합니다.
     
     Returns:
         dict: 파일 이름을 키로, DataFrame을 값으로 하는 딕셔너리.
               오류 발생 시 None을 반환합니다.
     """
-    results_dir = 'results'
     dataframes = {}
 
     # results 디렉토리 존재 여부 확인
@@ -20,23 +32,23 @@ def load_processed_data():
         print(f"오류: '{results_dir}' 디렉토리를 찾을 수 없습니다.")
         return None
 
-    # 처리된 엑셀 파일 목록 가져오기
-    files_to_load = [f for f in os.listdir(results_dir) if f.startswith('processed_') and f.endswith('.xlsx')]
+    # 처리된 Parquet 파일 목록 가져오기
+    files_to_load = [f for f in os.listdir(results_dir) if f.startswith('processed_') and f.endswith('.parquet')]
 
     if not files_to_load:
         print(f"'{results_dir}' 디렉토리에서 처리된 파일을 찾을 수 없습니다.")
         return None
 
-    print("처리된 엑셀 파일들을 DataFrame으로 불러옵니다...")
+    print("처리된 Parquet 파일들을 DataFrame으로 불러옵니다...")
     
     # 각 파일을 DataFrame으로 읽어 딕셔너리에 저장
     for file_name in files_to_load:
         try:
             file_path = os.path.join(results_dir, file_name)
-            # 'processed_' 접두사와 '.xlsx' 확장자를 제거하여 딕셔너리 키 생성
-            df_key = file_name.replace('processed_', '').replace('.xlsx', '')
+            # 'processed_' 접두사와 '.parquet' 확장자를 제거하여 딕셔너리 키 생성
+            df_key = file_name.replace('processed_', '').replace('.parquet', '')
             
-            dataframes[df_key] = pd.read_excel(file_path)
+            dataframes[df_key] = pd.read_parquet(file_path)
             print(f"- '{file_name}' 로드 완료 -> key: '{df_key}'")
 
         except Exception as e:
@@ -45,15 +57,55 @@ def load_processed_data():
     print("\n모든 데이터를 성공적으로 불러왔습니다.")
     return dataframes
 
-def load_disabled_population_data():
+def compact_dataframe(df, category_columns=()):
+    """
+    메모리를 적게 쓰도록 자료형을 바꾼 DataFrame을 반환합니다.
+    category_columns는 범주형(category)으로, 정수 컬럼은 값 범위에 맞는 가장 작은 정수형(int32 등)으로 바꿉니다.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in category_columns:
+            series = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series):
+            series = pd.to_numeric(series, downcast='integer')
+        columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+def memory_usage(df):
+    """DataFrame이 차지하는 메모리(바이트)를 문자열 내용까지 포함하여 반환합니다."""
+    return int(df.memory_usage(deep=True).sum())
+
+def load_fact_table():
+    """
+    run_analysis.py가 만든 고용 데이터 팩트 테이블('results/employ_facts.parquet')을 반환합니다.
+    (dimension, metric, year, half, category, subcategory) 순서로 정렬된 MultiIndex와
+    'value' 컬럼을 가지며, select_facts로 연도·지표·구분별 행을 잘라낼 수 있습니다.
+    데이터 레지스트리의 'employ_facts' 데이터셋이므로 파일이 바뀌기 전까지는 한 번만 읽고 모든 세션이 같은 객체를 씁니다.
+    (공유 객체이므로 직접 수정하지 말아야 합니다)
+
+    Returns:
+        pd.DataFrame: 팩트 테이블. 파일이 없으면 None을 반환합니다.
+    """
+    # data_registry가 이 모듈을 불러오므로 순환 import를 피하려고 함수 안에서 불러옴
+    from employ_analysis.data_registry import dataset_path, get_dataset
+
+    file_path = dataset_path('employ_facts')
+    if not os.path.exists(file_path):
+        print(f"오류: '{file_path}' 파일을 찾을 수 없습니다. run_analysis.py를 먼저 실행하세요.")
+        return None
+    return get_dataset('employ_facts')
+
+def load_disabled_population_data(compact=False):
     """
     'korean_disabled_population_statistics.csv' 파일을 읽어 전처리 후 DataFrame으로 반환합니다.
+    compact가 True이면 시도별/성별/장애유형별 컬럼은 범주형으로, 연도 컬럼은 작은 정수형으로 저장합니다.
     
     Returns:
         pd.DataFrame: 전처리된 장애인구 통계 데이터.
                       오류 발생 시 None을 반환합니다.
     """
-    file_path = os.path.join('data', 'korean_disabled_population_statistics.csv')
+    file_path = os.path.join(data_dir, 'korean_disabled_population_statistics.csv')
     
     if not os.path.exists(file_path):
         print(f"오류: '{file_path}' 파일을 찾을 수 없습니다.")
@@ -62,10 +114,12 @@ def load_disabled_population_data():
     try:
         df = pd.read_csv(file_path)
         
-        # 전처리: '-' 값을 0으로 채우고, 연도 컬럼을 정수형으로 변환
-        df.replace('-', 0, inplace=True)
-        for col in df.columns[3:]:
-            df[col] = df[col].astype(int)
+        # 전처리: 스키마에 따라 '-' 값을 0으로 채우고, 연도 컬럼을 정수형으로 변환
+        df, report = apply_schema(df, 'population')
+        if report['issues']:
+            print_report(report)
+        if compact:
+            df = compact_dataframe(df, category_columns=['시도별', '성별', '장애유형별'])
             
         print(f"'{file_path}' 로드 및 전처리 완료.")
         return df
@@ -74,31 +128,14 @@ def load_disabled_population_data():
         print(f"'{file_path}' 파일을 불러오거나 전처리하는 중 오류 발생: {e}")
         return None
 
-def load_korea_geojson(file_name="skorea_provinces_geo.json"):
+def load_korea_geojson():
     """
-    한국 시도별 GeoJSON 파일을 로드합니다. 파일이 없으면 다운로드합니다.
+    한국 시도별 GeoJSON을 불러옵니다.
+    data/ 에 배포된 파일이나 검증된 캐시를 사용하며, 없으면 백그라운드 다운로드를 시작하고 None을 반환합니다.
+    반환된 dict는 호출할 때마다 새로 만들어지므로 바꿔도 다른 곳에 영향을 주지 않습니다.
     """
-    geojson_path = os.path.join('data', file_name)
-    
-    if not os.path.exists(geojson_path):
-        # st.info(f"{file_name} 파일을 다운로드합니다...") # Removed streamlit dependency
-        print(f"Downloading {file_name}...")
-        url = "https://raw.githubusercontent.com/southkorea/southkorea-maps/master/korea_administrative_boundaries/2018/geojson/skorea_provinces_geo.json"
-        try:
-            response = requests.get(url)
-            response.raise_for_status() # Raise an HTTPError for bad responses (4xx or 5xx)
-            with open(geojson_path, 'w', encoding='utf-8') as f:
-                json.dump(response.json(), f, ensure_ascii=False, indent=4)
-            # st.success(f"{file_name} 다운로드 완료.") # Removed streamlit dependency
-            print(f"Successfully downloaded {file_name}.")
-        except requests.exceptions.RequestException as e:
-            # st.error(f"GeoJSON 파일 다운로드 중 오류 발생: {e}") # Removed streamlit dependency
-            print(f"Error downloading GeoJSON file: {e}")
-            return None
-
-    with open(geojson_path, 'r', encoding='utf-8') as f:
-        geojson_data = json.load(f)
-    return geojson_data
+    geometry = load_geometry('provinces')
+    return None if geometry is None else geometry.to_geojson()
 
 if __name__ == '__main__':
     # 함수를 실행하여 데이터프레임들을 불러옵니다.
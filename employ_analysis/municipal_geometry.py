@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import math
+import os
+import sys
+
+# 스크립트로 실행할 때도 employ_analysis 패키지를 불러올 수 있도록 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+from employ_analysis.geometry import data_dir, vendored_path
+from employ_analysis.geometry_topology import build_topology, encode_topology, topology_to_geojson
+
+# 시군구 경계 생성 (오프라인, 결과 파일을 data/ 에 함께 커밋)
+#
+# 외부 네트워크 없이도 시설 지도를 그릴 수 있도록, 저장소에 들어 있는 두 파일로 시군구 경계를 만듭니다.
+#   - data/skorea_provinces_geo.json : 시도 경계
+#   - data/sigungu_points.csv        : 시군구 아래 읍면동/리의 대표 좌표 (korean-geocoding 0.4.1, MIT License, Copyright (c) 2022 RE-A)
+#
+# 1. 시도 경계를 GRID_DEGREES 간격의 격자로 나누고, 각 칸을 같은 시도 안에서 가장 가까운 좌표의 시군구로 정합니다.
+# 2. 같은 시군구 칸들의 바깥선을 이어 폴리곤을 만들고, 이웃한 시군구가 함께 쓰는 선 단위로 단순화하여 계단 모양을 없앱니다.
+#    (geometry_topology와 같은 방식이므로 시군구 사이에 틈이나 겹침이 생기지 않음)
+#
+# 실제 행정 경계가 아니라 대표 좌표로 나눈 근사 경계이므로 시군구 경계선은 수백 m 정도 어긋날 수 있습니다.
+# 결과 파일을 다시 만들었으면 출력된 해시를 geometry.py의 geometry_sources['municipalities']['sha256']에 반영합니다.
+
+points_path = os.path.join(data_dir, 'sigungu_points.csv')
+provinces_path = vendored_path('provinces')
+output_path = vendored_path('municipalities')
+
+# 격자 간격 (경위도 단위, 0.005도 ≈ 500m)
+GRID_DEGREES = 0.005
+# 계단 모양 경계를 펴는 단순화 허용 오차 (격자 간격 정도)
+SMOOTHING_DEGREES = 0.005
+# 거리 계산에서 경도 1도의 길이를 위도 1도에 맞추는 비율 (한반도 중앙 위도 36도 기준)
+LON_SCALE = math.cos(math.radians(36))
+
+def _polygon_rings(geometry):
+    polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+    return [np.asarray(ring, dtype=float) for polygon in polygons for ring in polygon]
+
+def _rasterize(rings, x0, y0, nx, ny):
+    """링들의 안쪽(짝홀 규칙)에 중심이 있는 격자 칸을 True로 표시한 (ny, nx) 배열을 반환합니다."""
+    toggles = np.zeros((ny, nx + 1), dtype=np.int32)
+    for ring in rings:
+        (xa, ya), (xb, yb) = ring[:-1].T, ring[1:].T
+        crossing = ya != yb
+        xa, ya, xb, yb = xa[crossing], ya[crossing], xb[crossing], yb[crossing]
+        # 각 변이 지나는 칸 중심 행 범위 [first, last)
+        first = np.ceil((np.minimum(ya, yb) - y0) / GRID_DEGREES - 0.5).astype(int)
+        last = np.ceil((np.maximum(ya, yb) - y0) / GRID_DEGREES - 0.5).astype(int)
+        counts = np.clip(last - first, 0, None)
+        edge = np.repeat(np.arange(len(first)), counts)
+        rows = np.repeat(first, counts) + (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))
+        y = y0 + (rows + 0.5) * GRID_DEGREES
+        x = xa[edge] + (y - ya[edge]) * (xb[edge] - xa[edge]) / (yb[edge] - ya[edge])
+        # 교차점보다 오른쪽에 중심이 있는 칸부터 안팎이 바뀜
+        columns = np.clip(np.ceil((x - x0) / GRID_DEGREES - 0.5).astype(int), 0, nx)
+        valid = (rows >= 0) & (rows < ny)
+        np.add.at(toggles, (rows[valid], columns[valid]), 1)
+    return (np.cumsum(toggles, axis=1)[:, :nx] % 2).astype(bool)
+
+def _assign_cells(labels, inside, points, point_labels, x0, y0):
+    """inside 칸마다 가장 가까운 좌표의 라벨을 labels에 기록합니다."""
+    rows, columns = np.nonzero(inside)
+    cell_x = (x0 + (columns + 0.5) * GRID_DEGREES) * LON_SCALE
+    cell_y = y0 + (rows + 0.5) * GRID_DEGREES
+    point_x, point_y = points[:, 0] * LON_SCALE, points[:, 1]
+    nearest = np.empty(len(rows), dtype=int)
+    for start in range(0, len(rows), 4096):
+        stop = start + 4096
+        distance = (cell_x[start:stop, None] - point_x) ** 2 + (cell_y[start:stop, None] - point_y) ** 2
+        nearest[start:stop] = distance.argmin(axis=1)
+    labels[rows, columns] = point_labels[nearest]
+
+# 진행 방향 -> 왼쪽 방향 (안쪽이 왼쪽에 오도록 따라가므로 갈림길에서는 왼쪽, 직진, 오른쪽 순으로 고름)
+def _turn_order(direction):
+    dx, dy = direction
+    return [(-dy, dx), (dx, dy), (dy, -dx)]
+
+def _trace_rings(labels, label):
+    """라벨 칸들의 경계를 안쪽이 왼쪽에 오도록 따라가 격자 꼭짓점 (열, 행) 링 목록으로 반환합니다."""
+    mask = np.pad(labels == label, 1)
+    core = mask[1:-1, 1:-1]
+    rows, columns = np.nonzero(core & ~mask[:-2, 1:-1])   # 아래
+    edges = [((c, r), (1, 0)) for r, c in zip(rows, columns)]
+    rows, columns = np.nonzero(core & ~mask[1:-1, 2:])    # 오른쪽
+    edges += [((c + 1, r), (0, 1)) for r, c in zip(rows, columns)]
+    rows, columns = np.nonzero(core & ~mask[2:, 1:-1])    # 위
+    edges += [((c + 1, r + 1), (-1, 0)) for r, c in zip(rows, columns)]
+    rows, columns = np.nonzero(core & ~mask[1:-1, :-2])   # 왼쪽
+    edges += [((c, r + 1), (0, -1)) for r, c in zip(rows, columns)]
+
+    outgoing = {}
+    for start, direction in edges:
+        outgoing.setdefault((int(start[0]), int(start[1])), []).append(direction)
+
+    rings = []
+    for start in sorted(outgoing):
+        while outgoing.get(start):
+            ring = [start]
+            point, direction = start, outgoing[start].pop()
+            while True:
+                point = (point[0] + direction[0], point[1] + direction[1])
+                if point == start:
+                    break
+                ring.append(point)
+                choices = outgoing[point]
+                direction = next(turn for turn in _turn_order(direction) if turn in choices)
+                choices.remove(direction)
+            rings.append(ring)
+    return rings
+
+def _signed_area(ring):
+    x, y = np.asarray(ring, dtype=float).T
+    return 0.5 * float(np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y))
+
+def _contains(ring, point):
+    x, y = np.asarray(ring, dtype=float).T
+    px, py = point
+    x2, y2 = np.roll(x, -1), np.roll(y, -1)
+    crossing = (y > py) != (y2 > py)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        at = x + (py - y) * (x2 - x) / (y2 - y)
+    return bool(np.count_nonzero(crossing & (px < at)) % 2)
+
+def _rings_to_polygons(rings):
+    """바깥 링(반시계 방향)마다 그 안에 있는 구멍(시계 방향)을 묶어 [바깥 링, 구멍...] 목록으로 반환합니다."""
+    outers = [ring for ring in rings if _signed_area(ring) > 0]
+    polygons = [[ring] for ring in outers]
+    for hole in (ring for ring in rings if _signed_area(ring) < 0):
+        # 구멍의 첫 변 왼쪽 칸의 중심은 이 라벨의 칸이므로 그 칸을 품은 바깥 링을 찾음
+        (x0, y0), (x1, y1) = hole[0], hole[1]
+        dx, dy = x1 - x0, y1 - y0
+        center = (x0 + (dx - dy) * 0.5, y0 + (dy + dx) * 0.5)
+        # 섬 안의 호수처럼 바깥 링이 겹쳐 있으면 가장 작은 링에 넣음
+        containing = [polygon for polygon in polygons if _contains(polygon[0], center)]
+        if containing:
+            min(containing, key=lambda polygon: _signed_area(polygon[0])).append(hole)
+    return polygons
+
+def build_municipal_geojson():
+    """
+    시도 경계와 시군구 대표 좌표로 시군구 경계 GeoJSON FeatureCollection을 만듭니다.
+    각 feature의 속성은 {'code', 'name', 'sido', 'base_year'}이며, name은 장애인구 통계와 같은 형식의 시군구 이름입니다.
+    (예: '종로구', '수원시장안구') code는 시도 코드 뒤에 시군구 순번을 붙인 값으로, 행정 코드가 아닙니다.
+    """
+    with open(provinces_path, 'r', encoding='utf-8') as f:
+        provinces = json.load(f)['features']
+    points = pd.read_csv(points_path, encoding='utf-8').dropna(subset=['위도', '경도'])
+
+    province_rings = {feature['properties']['name']: _polygon_rings(feature['geometry']) for feature in provinces}
+    all_points = np.concatenate([ring for rings in province_rings.values() for ring in rings])
+    x0, y0 = all_points.min(axis=0) - GRID_DEGREES
+    nx, ny = (np.ceil((all_points.max(axis=0) + GRID_DEGREES - (x0, y0)) / GRID_DEGREES)).astype(int)
+
+    # 시군구 라벨 (시도 안에서 원본 순서)
+    regions = points[['시도', '시군구']].drop_duplicates().reset_index(drop=True)
+    region_label = {(sido, name): i for i, (sido, name) in enumerate(zip(regions['시도'], regions['시군구']))}
+    labels = np.full((ny, nx), -1, dtype=np.int32)
+    for feature in provinces:
+        sido = feature['properties']['name']
+        province_points = points[points['시도'] == sido]
+        if province_points.empty:
+            print(f"경고: '{sido}'의 시군구 좌표가 없어 경계를 만들지 않습니다.")
+            continue
+        inside = _rasterize(province_rings[sido], x0, y0, nx, ny) & (labels < 0)
+        point_labels = np.array([region_label[(sido, name)] for name in province_points['시군구']])
+        _assign_cells(labels, inside, province_points[['경도', '위도']].to_numpy(), point_labels, x0, y0)
+
+    province_codes = {feature['properties']['name']: feature['properties']['code'] for feature in provinces}
+    features = []
+    for (sido, name), label in region_label.items():
+        polygons = _rings_to_polygons(_trace_rings(labels, label))
+        if not polygons:
+            print(f"경고: '{sido} {name}'에 해당하는 격자 칸이 없어 경계에서 빠졌습니다.")
+            continue
+        # 격자 꼭짓점 -> 경위도 (링을 닫아 GeoJSON 형식으로)
+        coordinates = [[[[round(x0 + c * GRID_DEGREES, 6), round(y0 + r * GRID_DEGREES, 6)] for c, r in ring + ring[:1]]
+                        for ring in polygon] for polygon in polygons]
+        sequence = sum(1 for feature in features if feature['properties']['sido'] == sido) + 1
+        features.append({
+            'type': 'Feature',
+            'properties': {'code': f"{province_codes[sido]}{sequence:03d}", 'name': name, 'sido': sido, 'base_year': '2022'},
+            'geometry': {'type': 'MultiPolygon', 'coordinates': coordinates},
+        })
+
+    # 이웃한 시군구가 함께 쓰는 선 단위로 계단 모양을 펴고, 시도 경계 파일처럼 바깥 링을 시계 방향으로 맞춤
+    arcs, topology_regions = build_topology({'type': 'FeatureCollection', 'features': features})
+    geojson = topology_to_geojson(encode_topology(arcs, topology_regions, SMOOTHING_DEGREES, 'municipalities'))
+    for feature in geojson['features']:
+        geometry = feature['geometry']
+        polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+        for polygon in polygons:
+            for ring in polygon:
+                ring.reverse()
+    return geojson
+
+def write_municipal_geojson():
+    """시군구 경계를 data/ 에 저장하고 (파일 경로, 해시)를 반환합니다."""
+    content = json.dumps(build_municipal_geojson(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, output_path)
+    return output_path, hashlib.sha256(content).hexdigest()
+
+if __name__ == '__main__':
+    path, sha256 = write_municipal_geojson()
+    print(f"시군구 경계 생성 완료 -> '{path}' 저장 ({os.path.getsize(path) / 1024:,.0f} KB)")
+    print(f"geometry.py의 geometry_sources['municipalities']['sha256']: '{sha256}'")
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+from types import MappingProxyType
+import numpy as np
+
+# 파싱한 지도 경계를 NumPy 배열로 담는 읽기 전용 구조와 바이너리 캐시
+#
+# GeoJSON 텍스트를 json으로 파싱하는 대신, 모든 좌표를 하나의 (점 개수, 2) 배열에 모으고
+# 링/폴리곤/지역의 경계 위치(offset)만 따로 저장합니다. 이 구조를 pickle 파일로 저장해 두면
+# 다음부터는 파싱 없이 배열을 그대로 읽을 수 있습니다. (캐시 파일 이름은 원본 파일의 해시)
+
+# 캐시 파일 형식이 바뀌면 올려서 기존 캐시를 쓰지 않도록 합니다.
+PACKED_FORMAT_VERSION = 1
+
+def _read_only(array, dtype):
+    array = np.ascontiguousarray(array, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+class PackedGeometry:
+    """
+    Polygon/MultiPolygon 지역들로 이루어진 지도 경계를 담는 읽기 전용 객체입니다.
+
+    - coordinates: 모든 링의 점을 이어 붙인 (점 개수, 2) 배열 [경도, 위도]
+    - ring_offsets: i번 링의 점은 coordinates[ring_offsets[i]:ring_offsets[i + 1]]
+    - polygon_offsets: i번 폴리곤의 링은 ring_offsets[polygon_offsets[i]:polygon_offsets[i + 1]] (첫 링이 바깥 경계)
+    - feature_offsets: i번 지역의 폴리곤은 polygon_offsets[feature_offsets[i]:feature_offsets[i + 1]]
+
+    배열은 쓰기 금지되어 있고 속성도 바꿀 수 없으므로 여러 세션이 같은 객체를 함께 써도 안전합니다.
+    Plotly에 넘길 때는 to_geojson()으로 매번 새 dict를 만들어 사용합니다.
+    """
+
+    __slots__ = ('coordinates', 'ring_offsets', 'polygon_offsets', 'feature_offsets',
+                 'geometry_types', 'properties', 'feature_ids')
+
+    def __init__(self, coordinates, ring_offsets, polygon_offsets, feature_offsets,
+                 geometry_types, properties, feature_ids):
+        set_attr = object.__setattr__
+        set_attr(self, 'coordinates', _read_only(coordinates, np.float64).reshape(-1, 2))
+        set_attr(self, 'ring_offsets', _read_only(ring_offsets, np.int64))
+        set_attr(self, 'polygon_offsets', _read_only(polygon_offsets, np.int64))
+        set_attr(self, 'feature_offsets', _read_only(feature_offsets, np.int64))
+        set_attr(self, 'geometry_types', tuple(geometry_types))
+        set_attr(self, 'properties', tuple(MappingProxyType(dict(p)) for p in properties))
+        set_attr(self, 'feature_ids', tuple(feature_ids))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("PackedGeometry는 읽기 전용입니다.")
+
+    def __len__(self):
+        return len(self.geometry_types)
+
+    @classmethod
+    def from_geojson(cls, geojson):
+        """Polygon/MultiPolygon 지역으로 이루어진 GeoJSON FeatureCollection dict로 객체를 만듭니다."""
+        coordinates, ring_offsets, polygon_offsets, feature_offsets = [], [0], [0], [0]
+        geometry_types, properties, feature_ids = [], [], []
+        for feature in geojson['features']:
+            geometry = feature['geometry']
+            if geometry['type'] not in ('Polygon', 'MultiPolygon'):
+                raise ValueError(f"지원하지 않는 도형 형식입니다: '{geometry['type']}'")
+            polygons = geometry['coordinates'] if geometry['type'] == 'MultiPolygon' else [geometry['coordinates']]
+            for polygon in polygons:
+                for ring in polygon:
+                    coordinates.extend(point[:2] for point in ring)
+                    ring_offsets.append(len(coordinates))
+                polygon_offsets.append(len(ring_offsets) - 1)
+            feature_offsets.append(len(polygon_offsets) - 1)
+            geometry_types.append(geometry['type'])
+            properties.append(feature.get('properties') or {})
+            feature_ids.append(feature.get('id'))
+        return cls(np.array(coordinates, dtype=np.float64).reshape(-1, 2), ring_offsets, polygon_offsets,
+                   feature_offsets, geometry_types, properties, feature_ids)
+
+    def feature_geometry(self, index, points=None, rings=None):
+        """index번 지역의 GeoJSON geometry dict를 새로 만들어 반환합니다."""
+        points = self.coordinates.tolist() if points is None else points
+        rings = self.ring_offsets.tolist() if rings is None else rings
+        polygon_offsets = self.polygon_offsets
+        polygons = []
+        for p in range(self.feature_offsets[index], self.feature_offsets[index + 1]):
+            polygons.append([points[rings[r]:rings[r + 1]] for r in range(polygon_offsets[p], polygon_offsets[p + 1])])
+        if self.geometry_types[index] == 'Polygon':
+            return {'type': 'Polygon', 'coordinates': polygons[0]}
+        return {'type': 'MultiPolygon', 'coordinates': polygons}
+
+    def to_geojson(self, indices=None):
+        """
+        GeoJSON FeatureCollection dict를 새로 만들어 반환합니다. indices를 주면 그 지역들만 담습니다.
+        반환된 dict는 호출한 쪽 소유이므로 자유롭게 바꿔도 됩니다.
+        """
+        # 좌표를 파이썬 리스트로 한 번에 바꾼 뒤 잘라 쓰는 것이 점마다 변환하는 것보다 훨씬 빠름
+        points, rings = self.coordinates.tolist(), self.ring_offsets.tolist()
+        features = []
+        for i in (range(len(self)) if indices is None else indices):
+            feature = {'type': 'Feature', 'properties': dict(self.properties[i]),
+                       'geometry': self.feature_geometry(i, points, rings)}
+            if self.feature_ids[i] is not None:
+                feature['id'] = self.feature_ids[i]
+            features.append(feature)
+        return {'type': 'FeatureCollection', 'features': features}
+
+    def to_state(self):
+        """pickle로 저장할 수 있는 기본 자료형 dict를 반환합니다. (클래스 정의가 바뀌어도 캐시를 읽을 수 있도록)"""
+        return {
+            'format_version': PACKED_FORMAT_VERSION,
+            'coordinates': self.coordinates,
+            'ring_offsets': self.ring_offsets,
+            'polygon_offsets': self.polygon_offsets,
+            'feature_offsets': self.feature_offsets,
+            'geometry_types': list(self.geometry_types),
+            'properties': [dict(p) for p in self.properties],
+            'feature_ids': list(self.feature_ids),
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(state['coordinates'], state['ring_offsets'], state['polygon_offsets'], state['feature_offsets'],
+                   state['geometry_types'], state['properties'], state['feature_ids'])
+
+def packed_cache_path(cache_dir, sha256):
+    """원본 파일 해시에 해당하는 바이너리 캐시 경로를 반환합니다. 예: 'data/geometry_cache/parsed/<해시>.pickle'"""
+    return os.path.join(cache_dir, f"{sha256}.pickle")
+
+def read_packed(path):
+    """바이너리 캐시를 읽어 PackedGeometry를 반환합니다. 파일이 없거나 형식이 다르면 None을 반환합니다."""
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('format_version') != PACKED_FORMAT_VERSION:
+        return None
+    return PackedGeometry.from_state(state)
+
+def write_packed(path, packed):
+    """PackedGeometry를 바이너리 캐시로 저장합니다. 임시 파일에 쓴 뒤 교체하므로 읽는 쪽이 반쯤 쓴 파일을 보지 않습니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(packed.to_state(), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import pyarrow.parquet as pq
+from employ_analysis.fact_table import parse_period_column
+from employ_analysis.load_data import processed_file_path
+from employ_analysis.data_registry import dataset_version
+
+# 같은 연도에 여러 기간 자료가 있으면 하반기(2/2) -> 상반기(1/2) -> 연간 순으로 사용합니다.
+HALF_PRIORITY = {2: 0, 1: 1, 0: 2}
+
+# 데이터셋별 (데이터 버전, 인덱스) 캐시 (데이터 버전은 data_registry.dataset_version()과 같음)
+_index_cache = {}
+
+def build_period_index(columns, empty_columns=()):
+    """
+    '{기간}_{지표}' 컬럼명 목록으로 {(지표, 연도): (컬럼명, 반기)} 조회 테이블을 만듭니다.
+    값이 하나도 없는 컬럼(empty_columns)은 제외하여 빈 차트가 그려지지 않도록 합니다.
+    """
+    index = {}
+    for col in columns:
+        parts = parse_period_column(col)
+        if parts is None or col in empty_columns:
+            continue
+        year, half, metric = parts
+        current = index.get((metric, year))
+        if current is None or HALF_PRIORITY[half] < HALF_PRIORITY[current[1]]:
+            index[(metric, year)] = (col, half)
+    return index
+
+def _read_parquet_columns(file_path):
+    """Parquet 메타데이터만 읽어 (컬럼명 목록, 값이 모두 비어 있는 컬럼 집합)을 반환합니다."""
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    null_counts = {}
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(metadata.num_columns):
+            column = row_group.column(j)
+            stats = column.statistics
+            # 통계가 없으면 값이 있다고 가정
+            null_count = stats.null_count if stats is not None and stats.has_null_count else 0
+            null_counts[column.path_in_schema] = null_counts.get(column.path_in_schema, 0) + null_count
+    empty_columns = {col for col, count in null_counts.items() if metadata.num_rows and count >= metadata.num_rows}
+    return parquet_file.schema_arrow.names, empty_columns
+
+def get_period_index(dataset):
+    """
+    데이터셋('disable_age' 등)의 기간 조회 테이블을 반환합니다.
+    처리 결과 파일(데이터 버전)이 바뀌지 않았으면 한 번 만든 테이블을 그대로 사용합니다.
+    파일이 없으면 빈 딕셔너리를 반환합니다.
+    """
+    version = dataset_version(dataset)
+    if version is None:
+        return {}
+
+    cached = _index_cache.get(dataset)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    columns, empty_columns = _read_parquet_columns(processed_file_path(dataset))
+    index = build_period_index(columns, empty_columns)
+    _index_cache[dataset] = (version, index)
+    return index
+
+def resolve_period(dataset, metric, year):
+    """(데이터셋, 지표, 연도)에 해당하는 (컬럼명, 반기)를 반환합니다. 없으면 (None, None)을 반환합니다."""
+    if year is None:
+        return None, None
+    return get_period_index(dataset).get((metric, int(year)), (None, None))
+
+def resolve_column(dataset, metric, year):
+    """(데이터셋, 지표, 연도)에 해당하는 컬럼명을 반환합니다. 없으면 None을 반환합니다."""
+    return resolve_period(dataset, metric, year)[0]
+
+def available_years(dataset, metrics):
+    """주어진 지표들이 모두 있는 연도 목록을 오름차순으로 반환합니다."""
+    if isinstance(metrics, str):
+        metrics = [metrics]
+    index = get_period_index(dataset)
+    years = None
+    for metric in metrics:
+        metric_years = {year for (m, year) in index if m == metric}
+        years = metric_years if years is None else years & metric_years
+    return sorted(years or [])
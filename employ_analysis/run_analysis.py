@@ -1,67 +1,382 @@
-import pandas as pd
 import os
+import sys
+import json
+import hashlib
+import argparse
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor
 
-# 데이터 디렉토리와 결과 디렉토리 경로 설정
-data_dir = 'data'
-results_dir = 'results'
+# 스크립트로 실행할 때도 employ_analysis 패키지를 불러올 수 있도록 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# 결과 디렉토리가 없으면 생성
-if not os.path.exists(results_dir):
-    os.makedirs(results_dir)
+# 전처리와 이후 단계 모듈(pandas, pyarrow, plotly, 차트 모듈)은 불러오는 데 시간이 오래 걸리므로,
+# 바뀐 것이 없는 실행은 이들을 불러오지 않고 끝낼 수 있도록 각 단계를 실행할 때 불러옵니다.
 
-# 데이터 디렉토리 내의 disable*.xlsx 파일 목록 가져오기
-files_to_process = [f for f in os.listdir(data_dir) if f.startswith('disable') and f.endswith('.xlsx')]
+# 데이터 디렉토리와 결과 디렉토리 경로 설정 (프로젝트 루트 기준)
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+data_dir = os.path.join(base_dir, 'data')
+results_dir = os.path.join(base_dir, 'results')
 
-# 각 파일 처리
-for file_name in files_to_process:
+# 전처리 결과의 형식이 바뀌면 올려서 기존 결과를 모두 다시 만들도록 합니다.
+SCHEMA_VERSION = 3
+
+# 입력 파일별 해시와 스키마 버전을 기록하는 매니페스트
+manifest_path = os.path.join(results_dir, 'manifest.json')
+
+# 모든 고용 데이터셋을 긴 형태로 합친 팩트 테이블
+fact_table_path = os.path.join(results_dir, 'employ_facts.parquet')
+
+# 전처리 이후 단계(분석 DB, 장애인구 파생 지표, 단순화 지도 경계, 미리 만든 Figure)가 읽는 원본과 코드가 있는 디렉토리
+# (data/ 는 모든 파일, 코드 디렉토리는 .py 파일만 봄)
+stage_code_dirs = [os.path.join(base_dir, 'employ_analysis'), os.path.join(base_dir, 'disable_pop')]
+
+# 이후 단계의 결과 (하나라도 없으면 바뀐 입력이 없어도 모든 단계를 실행)
+stage_outputs = [
+    fact_table_path,
+    os.path.join(results_dir, 'analytics.sqlite'),
+    os.path.join(results_dir, 'population_metrics.parquet'),
+    os.path.join(results_dir, 'geometry'),
+    os.path.join(results_dir, 'figures', 'manifest.json'),
+]
+
+# 버전이 바뀌면 결과(Parquet, Plotly JSON)가 달라질 수 있는 패키지
+stage_packages = ['pandas', 'pyarrow', 'plotly']
+
+def file_sha256(file_path):
+    """파일 내용의 SHA-256 해시를 반환합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_manifest():
+    """매니페스트를 읽어 반환합니다. 없거나 읽을 수 없으면 빈 매니페스트를 반환합니다."""
+    if not os.path.exists(manifest_path):
+        return {'files': {}}
     try:
-        file_path = os.path.join(data_dir, file_name)
-        
-        # 엑셀 파일을 헤더 없이 읽기
-        df = pd.read_excel(file_path, header=None)
-        
-        # 첫 두 행을 헤더로 사용
-        header_row1 = df.iloc[0]
-        header_row2 = df.iloc[1]
-        
-        new_columns = []
-        current_year_period = ""
-        for i, col_name_row2 in enumerate(header_row2):
-            col_name_row1 = header_row1.iloc[i]
-            
-            # 첫 번째 컬럼 (구분별) 처리
-            if i == 0:
-                new_columns.append(str(col_name_row2).strip())
-                continue
-
-            # 첫 번째 행에 값이 있으면 새로운 연도/기간 시작
-            if pd.notna(col_name_row1):
-                current_year_period = str(col_name_row1).strip()
-
-            # 컬럼 이름 조합
-            if pd.notna(col_name_row2):
-                combined_name = f"{current_year_period}_{str(col_name_row2).strip()}"
-            else:
-                combined_name = f"{current_year_period}_Unknown"
-            
-            new_columns.append(combined_name)
-
-        # 새로운 컬럼 이름 설정 및 실제 데이터만 남기기
-        df.columns = new_columns
-        df = df.iloc[2:].copy() # 실제 데이터는 3번째 행부터 시작
-        
-        # 컬럼 이름에서 불필요한 공백이나 줄바꿈 문자 제거 (이미 strip 했지만 혹시 모를 경우)
-        df.columns = df.columns.str.strip()
-        
-        # 결과 파일 경로 설정
-        result_file_path = os.path.join(results_dir, f"processed_{file_name}")
-        
-        # 처리된 데이터프레임을 새로운 엑셀 파일로 저장 (인덱스 제외)
-        df.to_excel(result_file_path, index=False)
-        
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"매니페스트를 읽는 중 오류 발생, 전체를 다시 처리합니다: {e}")
+        return {'files': {}}
+
+def save_manifest(manifest):
+    """매니페스트를 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+def output_paths(file_name, export_xlsx=False):
+    """입력 파일 하나에 대해 만들어져야 하는 결과 파일 경로 목록을 반환합니다."""
+    stem = os.path.splitext(file_name)[0]
+    paths = [os.path.join(results_dir, f"processed_{stem}.parquet")]
+    if export_xlsx:
+        paths.append(os.path.join(results_dir, f"processed_{file_name}"))
+    return paths
+
+def path_fingerprint(file_path, entry):
+    """
+    파일의 (크기, 수정 시각, 해시)를 반환합니다.
+    크기와 수정 시각이 매니페스트와 같으면 기록된 해시를 그대로 사용하여 파일을 다시 읽지 않습니다.
+    """
+    stat = os.stat(file_path)
+    if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        return stat.st_size, stat.st_mtime_ns, entry['sha256']
+    return stat.st_size, stat.st_mtime_ns, file_sha256(file_path)
+
+def file_fingerprint(file_name, entry):
+    """data 디렉토리의 입력 파일 하나의 (크기, 수정 시각, 해시)를 반환합니다."""
+    return path_fingerprint(os.path.join(data_dir, file_name), entry)
+
+def stage_input_paths():
+    """전처리 이후 단계가 읽는 파일 경로 목록: data/ 의 모든 원본 파일(내려받은 경계 캐시 제외)과 분석, 차트 코드"""
+    paths = []
+    for directory, code_only in [(data_dir, False)] + [(path, True) for path in stage_code_dirs]:
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if d not in ('__pycache__', 'geometry_cache'))
+            paths.extend(os.path.join(root, name) for name in sorted(files) if not code_only or name.endswith('.py'))
+    return paths
+
+def stage_fingerprints(recorded):
+    """
+    이후 단계 입력 파일별 {'size', 'mtime_ns', 'sha256'}와 패키지 버전을 반환합니다.
+    recorded는 매니페스트에 기록된 이전 값이며, 크기와 수정 시각이 같은 파일은 다시 읽지 않습니다.
+    """
+    inputs = {}
+    for path in stage_input_paths():
+        key = os.path.relpath(path, base_dir)
+        try:
+            size, mtime_ns, sha256 = path_fingerprint(path, recorded.get('inputs', {}).get(key))
+        except OSError:
+            continue
+        inputs[key] = {'size': size, 'mtime_ns': mtime_ns, 'sha256': sha256}
+    packages = {}
+    for name in stage_packages:
+        try:
+            packages[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            packages[name] = None
+    return {'schema_version': SCHEMA_VERSION, 'inputs': inputs, 'packages': packages}
+
+def stages_up_to_date(recorded, fingerprints):
+    """이후 단계의 입력 내용, 스키마 버전, 패키지 버전이 마지막으로 모든 단계를 마쳤을 때와 같고 결과가 모두 있는지 확인합니다."""
+    if not recorded or recorded.get('schema_version') != fingerprints['schema_version']:
+        return False
+    if recorded.get('packages') != fingerprints['packages']:
+        return False
+    hashes = {key: entry['sha256'] for key, entry in fingerprints['inputs'].items()}
+    if {key: entry.get('sha256') for key, entry in recorded.get('inputs', {}).items()} != hashes:
+        return False
+    return all(os.path.exists(path) for path in stage_outputs)
+
+def is_up_to_date(file_name, entry, sha256, export_xlsx=False):
+    """매니페스트 항목이 현재 입력 파일과 스키마 버전에 맞고 결과 파일이 모두 있는지 확인합니다."""
+    if not entry:
+        return False
+    if entry.get('sha256') != sha256 or entry.get('schema_version') != SCHEMA_VERSION:
+        return False
+    return all(os.path.exists(path) for path in output_paths(file_name, export_xlsx))
+
+def process_file(file_name, export_xlsx=False):
+    """
+    data 디렉토리의 엑셀 파일 하나를 처리하여 results 디렉토리에 Parquet 파일로 저장합니다.
+    스키마가 정의된 데이터셋은 저장 전에 자료형을 맞추고 검증합니다.
+
+    Returns:
+        tuple: (저장된 Parquet 파일 경로, 스키마 검증 보고서 또는 None)
+    """
+    from employ_analysis.kosis_reader import read_kosis_workbook
+    from employ_analysis.schema import schemas, apply_schema
+
+    file_path = os.path.join(data_dir, file_name)
+    df = read_kosis_workbook(file_path)
+
+    dataset = os.path.splitext(file_name)[0]
+    report = None
+    if dataset in schemas:
+        df, report = apply_schema(df, dataset)
+
+    # 결과 파일 경로 설정 ('disable_age.xlsx' -> 'processed_disable_age.parquet')
+    result_file_path = output_paths(file_name)[0]
+
+    # 처리된 데이터프레임을 컬럼 기반 Parquet 파일로 저장 (인덱스 제외)
+    df.to_parquet(result_file_path, index=False)
+
+    # 필요한 경우에만 엑셀 파일도 함께 저장
+    if export_xlsx:
+        df.to_excel(os.path.join(results_dir, f"processed_{file_name}"), index=False)
+
+    return result_file_path, report
+
+def process_file_safe(file_name, export_xlsx=False):
+    """
+    process_file을 실행하고 (파일 이름, 결과 경로, 검증 보고서, 오류 메시지)를 반환합니다.
+    프로세스 풀에서도 파일별 오류를 모을 수 있도록 예외를 문자열로 바꿔 돌려줍니다.
+    """
+    try:
+        result_file_path, report = process_file(file_name, export_xlsx=export_xlsx)
+        return file_name, result_file_path, report, None
+    except Exception as e:
+        return file_name, None, None, str(e)
+
+def process_files(file_names, export_xlsx=False, workers=1):
+    """
+    여러 파일을 처리하고 입력 순서대로 (파일 이름, 결과 경로, 검증 보고서, 오류 메시지) 목록을 반환합니다.
+    workers가 2 이상이면 프로세스 풀에서 병렬로 처리합니다.
+    """
+    if workers <= 1 or len(file_names) <= 1:
+        return [process_file_safe(file_name, export_xlsx) for file_name in file_names]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(file_names))) as executor:
+        return list(executor.map(process_file_safe, file_names, [export_xlsx] * len(file_names)))
+
+def write_fact_table(file_names):
+    """처리된 Parquet 파일들로 팩트 테이블을 만들어 저장합니다."""
+    import pandas as pd
+    from employ_analysis.fact_table import build_fact_table
+
+    dataframes = {}
+    for file_name in file_names:
+        result_file_path = output_paths(file_name)[0]
+        if os.path.exists(result_file_path):
+            dataframes[os.path.splitext(file_name)[0]] = pd.read_parquet(result_file_path)
+    build_fact_table(dataframes).to_parquet(fact_table_path)
+    return fact_table_path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="data/disable*.xlsx 파일을 전처리하여 results 디렉토리에 저장합니다.")
+    parser.add_argument('--xlsx', action='store_true', help="Parquet 파일과 함께 processed_*.xlsx 파일도 저장합니다.")
+    parser.add_argument('--force', action='store_true', help="매니페스트와 관계없이 모든 파일을 다시 처리합니다.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="병렬로 처리할 프로세스 수입니다. 0이면 CPU 코어 수만큼 사용합니다. (기본값: 1, 순차 처리)")
+    parser.add_argument('--shared', action='store_true',
+                        help="여러 Streamlit 프로세스가 메모리 매핑으로 함께 읽을 Arrow 파일(results/shared/*.arrow)도 저장합니다.")
+    parser.add_argument('--memory-report', action='store_true',
+                        help="장애인구/시설 데이터의 기본 모드와 간단 로딩 모드 메모리 사용량을 비교하여 출력합니다.")
+    parser.add_argument('--figure-report', action='store_true',
+                        help="미리 만든 Figure별 크기(data, layout, frames, 지도 경계)와 이전 크기를 출력합니다.")
+    parser.add_argument('--fetch-geometry', action='store_true',
+                        help="data/ 에 없는 지도 경계 파일을 원격에서 내려받습니다. (네트워크가 필요하며 기본값은 내려받지 않음)")
+    args = parser.parse_args(argv)
+
+    # 결과 디렉토리가 없으면 생성
+    if not os.path.exists(results_dir):
+        os.makedirs(results_dir)
+
+    # 데이터 디렉토리 내의 disable*.xlsx 파일 목록 가져오기
+    files_to_process = sorted(f for f in os.listdir(data_dir) if f.startswith('disable') and f.endswith('.xlsx'))
+
+    manifest = load_manifest()
+    entries = manifest.setdefault('files', {})
+    skipped = []
+    pending = {}
+
+    # 입력 해시와 스키마 버전이 같고 결과가 남아 있는 파일은 건너뜀
+    for file_name in files_to_process:
+        try:
+            entry = entries.get(file_name)
+            size, mtime_ns, sha256 = file_fingerprint(file_name, entry)
+        except OSError as e:
+            print(f"'{file_name}' 처리 중 오류 발생: {e}")
+            continue
+        if not args.force and is_up_to_date(file_name, entry, sha256, args.xlsx):
+            # 내용은 같지만 수정 시각만 바뀐 경우 다음 실행을 위해 기록만 갱신
+            entry.update(size=size, mtime_ns=mtime_ns)
+            skipped.append(file_name)
+        else:
+            pending[file_name] = (size, mtime_ns, sha256)
+
+    # 남은 파일 처리 (결과는 입력 순서대로 매니페스트에 반영)
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+    processed = []
+    # 실패한 단계가 있으면 다음 실행에서도 모든 단계를 다시 실행하도록 이후 단계 기록을 남기지 않음
+    failed = False
+    for file_name, result_file_path, report, error in process_files(list(pending), args.xlsx, workers):
+        if error is not None:
+            print(f"'{file_name}' 처리 중 오류 발생: {error}")
+            failed = True
+            continue
+        processed.append(file_name)
+        size, mtime_ns, sha256 = pending[file_name]
+        entries[file_name] = {
+            'sha256': sha256,
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'schema_version': SCHEMA_VERSION,
+            'outputs': [os.path.basename(path) for path in output_paths(file_name, args.xlsx)],
+            'validation': report,
+        }
         print(f"'{file_name}' 처리 완료 -> '{result_file_path}' 저장")
+        if report is not None:
+            from employ_analysis.schema import print_report
+            print_report(report)
+
+    # 더 이상 존재하지 않는 입력 파일은 매니페스트에서 제거
+    removed = set(entries) - set(files_to_process)
+    for file_name in removed:
+        del entries[file_name]
+
+    # 처리한 파일이 없고 이후 단계의 입력(원본, 코드, 패키지 버전)도 그대로이면 무거운 단계를 불러오지 않고 끝냄
+    fingerprints = stage_fingerprints(manifest.get('stages', {}))
+    requested = args.force or args.shared or args.memory_report or args.figure_report or args.fetch_geometry
+    if not (processed or removed or failed or requested) and stages_up_to_date(manifest.get('stages'), fingerprints):
+        # 내용은 같지만 수정 시각만 바뀐 파일이 있으면 다음 실행을 위해 기록만 갱신
+        manifest['stages'] = fingerprints
+        save_manifest(manifest)
+        if skipped:
+            print(f"\n변경되지 않아 건너뛴 파일 ({len(skipped)}개): {', '.join(sorted(skipped))}")
+        print("\n바뀐 입력이 없어 이후 단계(분석 DB, 파생 지표, 지도 경계, Figure)를 건너뛰었습니다.")
+        return
+    manifest.pop('stages', None)
+    save_manifest(manifest)
 
+    # 결과가 하나라도 바뀌었거나 팩트 테이블이 없으면 다시 생성
+    if processed or removed or not os.path.exists(fact_table_path):
+        try:
+            print(f"팩트 테이블 생성 완료 -> '{write_fact_table(files_to_process)}' 저장")
+        except Exception as e:
+            print(f"팩트 테이블 생성 중 오류 발생: {e}")
+            failed = True
+
+    # 팩트 테이블이나 CSV 원본이 바뀌었으면 분석 DB도 다시 생성
+    from employ_analysis.analytics_db import build_database, is_database_stale
+    if is_database_stale():
+        try:
+            print(f"분석 DB 생성 완료 -> '{build_database()}' 저장")
+        except Exception as e:
+            print(f"분석 DB 생성 중 오류 발생: {e}")
+            failed = True
+
+    # 장애인구 원본에 새 연도 컬럼만 추가되었으면 그 연도의 파생 지표만 계산하여 덧붙임
+    try:
+        from disable_pop.population_metrics import refresh_population_metrics, metrics_path
+        years = refresh_population_metrics(args.force)
+        if years:
+            print(f"장애인구 파생 지표 갱신 완료 ({', '.join(map(str, years))}년) -> '{metrics_path}' 저장")
     except Exception as e:
-        print(f"'{file_name}' 처리 중 오류 발생: {e}")
+        print(f"장애인구 파생 지표 생성 중 오류 발생: {e}")
+        failed = True
+
+    # 요청한 경우에만 data/ 에 없는 지도 경계 파일을 원격에서 내려받음
+    if args.fetch_geometry:
+        from employ_analysis.geometry import vendor_geometry
+        fetched = vendor_geometry()
+        if fetched:
+            print(f"지도 경계 파일 다운로드 완료 ({', '.join(fetched)}) -> '{data_dir}' 저장")
+
+    # 지도 경계 원본이 바뀌었으면 단계별 단순화 경계도 다시 생성
+    try:
+        from employ_analysis.geometry_topology import build_simplified_geometry
+        written = build_simplified_geometry(args.force)
+        if written:
+            print(f"단순화 지도 경계 생성 완료 ({len(written)}개) -> '{os.path.dirname(written[0])}' 저장")
+    except Exception as e:
+        print(f"단순화 지도 경계 생성 중 오류 발생: {e}")
+        failed = True
+
+    # 원본이 바뀐 데이터셋만 공유 Arrow 파일로 다시 저장
+    if args.shared:
+        from employ_analysis.data_registry import publish_shared_tables
+        try:
+            published = publish_shared_tables()
+            print(f"공유 Arrow 파일 저장 완료 ({len(published)}개): {', '.join(published) or '변경 없음'}")
+        except Exception as e:
+            print(f"공유 Arrow 파일 저장 중 오류 발생: {e}")
+            failed = True
+
+    if args.memory_report:
+        from employ_analysis.data_registry import print_memory_report
+        print_memory_report()
+
+    # 같은 프로세스에서 만들어 둔 차트가 있으면 새 결과로 다시 그리도록 비움
+    # (다른 프로세스의 캐시는 결과 파일의 수정 시각이 바뀌므로 자동으로 새로 만들어짐)
+    if processed or removed:
+        from employ_analysis.figure_cache import invalidate_figures
+        invalidate_figures()
+
+    # 페이지에서 고를 수 있는 모든 차트와 인자 조합의 Figure를 Plotly JSON으로 미리 저장 (원본이 바뀐 것만 다시 만듦)
+    from employ_analysis.figure_artifacts import build_figure_artifacts, print_payload_report
+    try:
+        written = build_figure_artifacts(args.force)
+        if written:
+            print(f"미리 만든 Figure 저장 완료 ({len(written)}개) -> '{os.path.dirname(written[0])}'")
+    except Exception as e:
+        print(f"미리 만든 Figure 생성 중 오류 발생: {e}")
+        failed = True
+
+    if args.figure_report:
+        print_payload_report()
+
+    # 모든 단계를 마쳤으면 이번 입력을 기록하여 다음 실행에서 바뀐 것이 없으면 이후 단계를 건너뛰도록 함
+    if not failed:
+        manifest['stages'] = fingerprints
+        save_manifest(manifest)
+
+    if skipped:
+        print(f"\n변경되지 않아 건너뛴 파일 ({len(skipped)}개): {', '.join(sorted(skipped))}")
+    print("\n모든 파일 처리가 완료되었습니다.")
 
-print("\n모든 파일 처리가 완료되었습니다.")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
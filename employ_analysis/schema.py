@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+import re
+import pandas as pd
+
+# 컬럼 정의 항목
+#   dtype      : 변환할 자료형 ('category', 'string', 'int64', 'float64')
+#                값 목록(categories)이 정해진 구분 컬럼은 'category'로 두어 목록 순서의 범주형으로 저장합니다.
+#   nullable   : 결측값 허용 여부
+#   categories : 허용되는 값 목록 (구분 컬럼)
+#   unit       : 단위 ('명', '%')
+#   min / max  : 허용 범위 (숫자 컬럼)
+#   fill_values: 지정한 값으로 바꿀 값 {원래 값: 바꿀 값}
+
+# 고용 데이터의 지표별 정의 ('{기간}_{지표}' 컬럼에 적용)
+employ_metrics = {
+    '15세 이상 인구 (명)': {'dtype': 'int64', 'nullable': True, 'unit': '명', 'min': 0},
+    '경제활동인구 (명)': {'dtype': 'int64', 'nullable': True, 'unit': '명', 'min': 0},
+    '취업자 (명)': {'dtype': 'int64', 'nullable': True, 'unit': '명', 'min': 0},
+    '실업자 (명)': {'dtype': 'int64', 'nullable': True, 'unit': '명', 'min': 0},
+    '비경제활동인구 (명)': {'dtype': 'int64', 'nullable': True, 'unit': '명', 'min': 0},
+    '경활률 (%)': {'dtype': 'float64', 'nullable': True, 'unit': '%', 'min': 0, 'max': 100},
+    '실업률 (%)': {'dtype': 'float64', 'nullable': True, 'unit': '%', 'min': 0, 'max': 100},
+    '고용률 (%)': {'dtype': 'float64', 'nullable': True, 'unit': '%', 'min': 0, 'max': 100},
+}
+
+def _employ_schema(label_columns):
+    return {
+        'columns': label_columns,
+        'patterns': [(re.compile(rf'^\d{{4}}(\.\d/2)?_{re.escape(metric)}$'), spec)
+                     for metric, spec in employ_metrics.items()],
+    }
+
+schemas = {
+    'disable_age': _employ_schema({
+        '연령별(1)': {'dtype': 'category', 'nullable': False,
+                   'categories': ['전체', '15~29세', '30~39세', '40~49세', '50~59세', '60세 이상', '15~64세', '20~64세']},
+    }),
+    'disable_edu': _employ_schema({
+        '교육정도별(1)': {'dtype': 'category', 'nullable': False, 'categories': ['전체', '중졸 이하', '고졸', '대졸 이상']},
+    }),
+    'disable_power': _employ_schema({
+        '장애정도별(1)': {'dtype': 'category', 'nullable': False, 'categories': ['전체', '중증', '경증']},
+    }),
+    'disable_region': _employ_schema({
+        '지역별(1)': {'dtype': 'category', 'nullable': False, 'categories': ['전체', '서울', '경기도', '광역시도', '기타 시도']},
+    }),
+    'disable_sex': _employ_schema({
+        '성별(1)': {'dtype': 'category', 'nullable': False, 'categories': ['전체', '남자', '여자']},
+    }),
+    'disable_type': _employ_schema({
+        # 하위 유형 행은 상위 유형 칸이 비어 있음
+        '장애유형별(1)': {'dtype': 'category', 'nullable': True,
+                     'categories': ['전체', '신체외부 장애', '감각 장애', '정신적 장애', '신체내부 장애']},
+        '장애유형별(2)_장애유형별(2)': {'dtype': 'category', 'nullable': False,
+                                'categories': ['소계', '지체', '지체 외', '시각', '시각 외', '발달 장애']},
+    }),
+    'population': {
+        'columns': {
+            '시도별': {'dtype': 'category', 'nullable': False,
+                    'categories': ['전국', '서울특별시', '부산광역시', '대구광역시', '인천광역시', '광주광역시', '대전광역시',
+                                   '울산광역시', '세종특별자치시', '경기도', '강원특별자치도', '충청북도', '충청남도',
+                                   '전북특별자치도', '전라남도', '경상북도', '경상남도', '제주특별자치도']},
+            '성별': {'dtype': 'category', 'nullable': False, 'categories': ['계', '남자', '여자']},
+            '장애유형별': {'dtype': 'category', 'nullable': False,
+                      'categories': ['합계', '지체', '시각', '청각', '언어', '지적', '뇌병변', '자폐성', '정신',
+                                     '신장', '심장', '호흡기', '간', '안면', '장루ㆍ요루', '뇌전증']},
+        },
+        # 연도 컬럼: '-'(해당 없음)는 0명으로 처리
+        'patterns': [(re.compile(r'^\d{4}$'),
+                      {'dtype': 'int64', 'nullable': False, 'unit': '명', 'min': 0, 'fill_values': {'-': 0}})],
+    },
+}
+
+def column_spec(schema, col_name):
+    """스키마에서 컬럼 정의를 찾습니다. 정의되지 않은 컬럼이면 None을 반환합니다."""
+    if col_name in schema['columns']:
+        return schema['columns'][col_name]
+    for pattern, spec in schema.get('patterns', []):
+        if pattern.match(str(col_name)):
+            return spec
+    return None
+
+def _apply_numeric(series, spec, col_name, issues):
+    if spec.get('fill_values'):
+        series = series.replace(spec['fill_values'])
+    converted = pd.to_numeric(series, errors='coerce')
+
+    coerced = int((converted.isna() & series.notna()).sum())
+    if coerced:
+        issues.append(f"'{col_name}': 숫자가 아닌 값 {coerced}개를 결측값으로 변환했습니다.")
+
+    missing = converted.isna()
+    if missing.any() and not spec.get('nullable', True):
+        issues.append(f"'{col_name}': 결측값이 허용되지 않지만 {int(missing.sum())}개가 있습니다.")
+
+    if 'min' in spec and (converted < spec['min']).any():
+        issues.append(f"'{col_name}': {spec['min']}보다 작은 값이 있습니다.")
+    if 'max' in spec and (converted > spec['max']).any():
+        issues.append(f"'{col_name}': {spec['max']}보다 큰 값이 있습니다.")
+
+    # 정수 컬럼에 결측값이 있으면 NaN을 담을 수 있도록 float64로 둠
+    dtype = spec['dtype']
+    if dtype.startswith('int') and missing.any():
+        dtype = 'float64'
+    return converted.astype(dtype)
+
+def _apply_label(series, spec, col_name, issues):
+    converted = series.astype('string')
+
+    if converted.isna().any() and not spec.get('nullable', True):
+        issues.append(f"'{col_name}': 결측값이 허용되지 않지만 {int(converted.isna().sum())}개가 있습니다.")
+
+    if spec.get('categories'):
+        unknown = sorted(set(converted.dropna()) - set(spec['categories']))
+        if unknown:
+            issues.append(f"'{col_name}': 허용되지 않은 값 {unknown}")
+
+    if spec['dtype'] == 'category':
+        categories = list(spec.get('categories') or pd.unique(converted.dropna()))
+        categories += [value for value in pd.unique(converted.dropna()) if value not in categories]
+        return pd.Categorical(converted, categories=categories)
+    return converted
+
+def apply_schema(df, dataset):
+    """
+    데이터셋 스키마에 따라 DataFrame의 자료형을 한 번에 변환하고 검증 결과를 반환합니다.
+    시각화 함수는 변환된 DataFrame을 그대로 사용하므로 그릴 때마다 숫자 변환을 할 필요가 없습니다.
+
+    Returns:
+        tuple: (변환된 DataFrame, 검증 보고서 dict)
+               보고서는 {'dataset', 'rows', 'columns', 'issues'} 항목을 가집니다.
+    """
+    schema = schemas[dataset]
+    issues = []
+    typed = {}
+
+    for col_name in df.columns:
+        spec = column_spec(schema, col_name)
+        if spec is None:
+            issues.append(f"'{col_name}': 스키마에 정의되지 않은 컬럼입니다.")
+            typed[col_name] = df[col_name]
+        elif spec['dtype'] in ('string', 'category'):
+            typed[col_name] = _apply_label(df[col_name], spec, col_name, issues)
+        else:
+            typed[col_name] = _apply_numeric(df[col_name], spec, col_name, issues)
+
+    for col_name in schema['columns']:
+        if col_name not in df.columns:
+            issues.append(f"'{col_name}': 필수 컬럼이 없습니다.")
+
+    typed_df = pd.DataFrame(typed, index=df.index)
+    report = {
+        'dataset': dataset,
+        'rows': int(len(typed_df)),
+        'columns': int(typed_df.shape[1]),
+        'issues': issues,
+    }
+    return typed_df, report
+
+def print_report(report):
+    """검증 보고서를 출력합니다."""
+    if not report['issues']:
+        print(f"[{report['dataset']}] 스키마 검증 통과 ({report['rows']}행, {report['columns']}열)")
+        return
+    print(f"[{report['dataset']}] 스키마 검증 경고 {len(report['issues'])}건:")
+    for issue in report['issues']:
+        print(f"  - {issue}")
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from employ_analysis.load_data import results_dir
+
+# 여러 Streamlit 프로세스가 함께 쓰는 Arrow IPC 파일 디렉토리
+# 압축하지 않은 IPC 파일은 메모리 매핑으로 읽을 수 있어, 각 프로세스가 데이터를 복사하거나 파싱하지 않고
+# 운영체제의 페이지 캐시를 공유합니다.
+shared_dir = os.path.join(results_dir, 'shared')
+
+# 스키마 메타데이터에 원본 파일 정보를 기록하는 키
+SOURCE_METADATA_KEY = b'employ_analysis.source'
+
+def shared_table_path(name):
+    """데이터셋의 공유 Arrow 파일 경로를 반환합니다. 예: 'disable_age' -> 'results/shared/disable_age.arrow'"""
+    return os.path.join(shared_dir, f"{name}.arrow")
+
+def _to_arrow(df):
+    """
+    DataFrame을 Arrow 테이블로 바꿉니다.
+    실수 컬럼의 결측값은 null 대신 NaN으로 저장하여, 읽을 때 pandas float64 배열로 복사 없이 바로 쓸 수 있도록 합니다.
+    """
+    table = pa.Table.from_pandas(df)
+    for i, field in enumerate(table.schema):
+        column = table.column(i)
+        if pa.types.is_floating(field.type) and column.null_count:
+            table = table.set_column(i, field, pc.fill_null(column, np.nan))
+    return table
+
+def read_source_info(path):
+    """
+    공유 Arrow 파일에 기록된 원본 파일 정보({'size', 'mtime_ns', 'sha256', 'compact', 'version'})를 반환합니다.
+    없으면 None을 반환합니다.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        with pa.memory_map(path, 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return None
+    if SOURCE_METADATA_KEY not in metadata:
+        return None
+    return json.loads(metadata[SOURCE_METADATA_KEY])
+
+def write_shared_table(path, df, source_info):
+    """
+    DataFrame을 압축하지 않은 Arrow IPC 파일로 저장합니다.
+    source_info(원본 파일의 크기, 수정 시각, 해시, 로딩 모드, loader 버전)를 함께 기록하여
+    원본이나 읽는 방식이 바뀌었는지 확인할 수 있도록 합니다.
+    임시 파일에 쓴 뒤 교체하므로, 파일을 매핑해서 쓰고 있는 프로세스에 영향을 주지 않습니다.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = _to_arrow(df)
+    metadata = dict(table.schema.metadata or {})
+    metadata[SOURCE_METADATA_KEY] = json.dumps(source_info).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+
+    tmp_path = path + '.tmp'
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+def read_shared_table(path):
+    """
+    공유 Arrow 파일을 읽기 전용으로 메모리 매핑하여 DataFrame으로 반환합니다.
+    결측값이 없는 숫자 컬럼은 매핑된 메모리를 그대로 가리키므로(읽기 전용 배열) 프로세스마다 복사본이 생기지 않습니다.
+    """
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    # split_blocks: 컬럼들을 하나의 2차원 블록으로 합치지 않아야 복사 없이 변환됨
+    return table.to_pandas(split_blocks=True)
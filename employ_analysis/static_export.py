@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+import argparse
+import hashlib
+import html
+import inspect
+import json
+import os
+import shutil
+import sys
+
+# 스크립트로 실행할 때도 employ_analysis 패키지를 불러올 수 있도록 상위 디렉토리를 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+from employ_analysis.load_data import results_dir
+from employ_analysis.figure_artifacts import chart_params, artifact_key
+from employ_analysis.visualize_total_eco_activity_time_series import create_total_activity_time_series_chart
+from employ_analysis.visualize_age_plotly import create_age_plotly_chart
+from employ_analysis.visualize_edu_plotly import create_edu_plotly_chart
+from employ_analysis.visualize_sex_plotly import create_sex_plotly_chart
+from employ_analysis.visualize_sex_pie_plotly import create_sex_pie_chart
+from employ_analysis.visualize_type_plotly import create_type_plotly_chart
+from employ_analysis.visualize_region_plotly import create_region_plotly_chart
+from employ_analysis.assistance_charts import create_assistance_line_chart
+from employ_analysis.facility_charts import create_facility_need_map, facility_kinds
+from disable_pop.visualize_animated_pie_chart import create_animated_pie_chart
+from disable_pop.visualize_national_trend_line_chart import create_national_trend_line_chart
+from disable_pop.visualize_regional_map_chart import create_regional_map_chart
+from disable_pop.visualize_gender_trend_line_chart import create_gender_trend_line_chart
+
+# 대시보드 정적 내보내기
+# 트래픽이 몰릴 때 Streamlit 서버 대신 정적 파일 서버(또는 로컬 파일)로 볼 수 있도록, 모든 페이지의 모든 차트와
+# 인자 조합(연도, 시도, 지표 등)을 HTML 사이트로 저장합니다. 인자는 페이지의 선택 상자로 고르며 브라우저에서 바로 바뀝니다.
+#
+# static_site/
+#   index.html, employ.html, ...       페이지 (app.py, pages/*.py)
+#   assets/plotly.min.js               모든 페이지가 함께 쓰는 plotly.js (설치된 plotly 패키지에 포함된 파일, 네트워크 불필요)
+#   assets/site.js, assets/site.css    선택 상자와 차트를 이어 주는 스크립트와 스타일
+#   assets/geometry-<해시>.js          지도 경계 (같은 경계를 쓰는 Figure가 여러 개여도 한 번만 저장)
+#   figures/<차트>-<해시>.js            Figure 한 개 (선택했을 때만 불러옴)
+#
+# 모든 데이터는 <script>로 불러오므로 웹 서버 없이 file://로 열어도 동작합니다.
+# (지도 배경 타일(carto-positron)은 외부 서버에서 받으므로 오프라인에서는 경계와 값만 보입니다)
+
+static_site_dir = os.path.join(results_dir, 'static_site')
+
+# 내보낸 디렉토리 표시 (다시 내보낼 때 이 파일이 있는 디렉토리만 지우고 새로 만듦)
+marker_file = '.static_export'
+
+# 인자 이름 -> 선택 상자 이름
+param_labels = {
+    'year': '연도',
+    'city': '시도',
+    'column': '지표',
+    'kind': '시설',
+    'selected_palette': '색상 팔레트',
+}
+
+def _page(file_name, source, title, description, sections):
+    return {'file': file_name, 'source': source, 'title': title, 'description': description, 'sections': sections}
+
+def _section(title, chart, description='', value_labels=None):
+    # value_labels: {인자 이름: {값: 표시 이름}}
+    return {'title': title, 'chart': chart, 'description': description, 'value_labels': value_labels or {}}
+
+# 페이지 구성 (제목과 설명은 각 Streamlit 페이지와 같게 유지)
+static_pages = [
+    _page('index.html', 'app.py', '♿ 장애인 관련 데이터 분석 및 시각화',
+          '장애인 관련 공공 데이터를 활용하여 복지, 인구 분포, 고용 및 경제활동, 관련 시설을 분석하고 시각화한 결과입니다.',
+          []),
+    _page('employ.html', 'pages/employ.py', '📈 시각화 자료',
+          '이 페이지에서는 Plotly를 이용한 인터랙티브한 장애인 경제활동 데이터를 시각화한 결과를 볼 수 있습니다.', [
+              _section('연도별 장애인 경제활동 및 비경제활동인구수', create_total_activity_time_series_chart,
+                       '연도별 장애인 경제활동 및 비경제활동인구수를 보여주는 라인 그래프입니다.'),
+              _section('연령별 고용률 및 실업률', create_age_plotly_chart,
+                       '장애인의 연령대별 고용률과 실업률을 보여주는 인터랙티브 막대 그래프입니다.'),
+              _section('학력 수준별 고용률 및 실업률', create_edu_plotly_chart,
+                       '장애인의 학력 수준에 따른 고용률과 실업률을 비교하는 인터랙티브 막대 그래프입니다.'),
+              _section('성별 경제활동참가율 (막대 그래프)', create_sex_plotly_chart,
+                       '남성 장애인과 여성 장애인의 경제활동참가율을 비교하는 인터랙티브 그래프입니다.'),
+              _section('성별 경제활동참가율 분포 (파이 차트)', create_sex_pie_chart),
+              _section('장애 유형별 고용률', create_type_plotly_chart,
+                       '다양한 장애 유형별 고용률을 보여주는 인터랙티브 막대 그래프입니다.'),
+              _section('권역별 장애인 취업자 수 분포', create_region_plotly_chart,
+                       '대한민국 주요 권역별 장애인 취업자 수의 상대적 비율을 시각화한 인터랙티브 트리맵입니다.'),
+          ]),
+    _page('disabled_population_statistics.html', 'pages/disabled_population_statistics.py', '장애인구 통계 분석', '', [
+        _section('연도별 장애인구 비율', create_animated_pie_chart),
+        _section('전국 장애인구 추이', create_national_trend_line_chart),
+        _section('시도별 장애인구 분포', create_regional_map_chart),
+        _section('성별 장애인구 추이', create_gender_trend_line_chart),
+    ]),
+    _page('disability_assistant.html', 'pages/disability_assistant.py', '기초생활수급자 및 차상위계층 현황', '', [
+        _section('시도별 수급자 변화 추이', create_assistance_line_chart,
+                 value_labels={'column': {' 차상위초과': '차상위초과'}}),
+    ]),
+    _page('facility.html', 'pages/facility.py', '🗺️ 장애인 시설 필요도 지도',
+          '이 페이지에서는 보건복지부 데이터를 기반으로 한 장애인 시설의 필요도를 지도에서 확인할 수 있습니다.', [
+              _section('시군구별 장애인구수 대비 시설 필요도', create_facility_need_map,
+                       '(시군구별 장애인 인구 수) / (시군구별 시설 수 + 1). 지수가 높을수록 시설 확충이 더 시급함을 의미합니다.',
+                       value_labels={'kind': {kind: name for kind, (_, name, _) in facility_kinds.items()}}),
+          ]),
+]
+
+site_css = """
+body { font-family: "Malgun Gothic", AppleGothic, NanumGothic, sans-serif; margin: 0; color: #262730; }
+nav { background: #f0f2f6; padding: 10px 20px; }
+nav a { margin-right: 16px; color: #262730; text-decoration: none; }
+nav a.active { font-weight: bold; }
+main { max-width: 1200px; margin: 0 auto; padding: 10px 20px 40px; }
+section.chart { margin-top: 30px; }
+.controls label { margin-right: 16px; }
+.message { color: #9c6500; }
+"""
+
+site_js = """
+// 선택 상자에서 고른 인자에 맞는 Figure를 불러와 그립니다.
+(function () {
+  var figures = {}, geometries = {}, loading = {};
+  window.registerFigure = function (id, figure) { figures[id] = figure; };
+  window.registerGeometry = function (id, geojson) { geometries[id] = geojson; };
+
+  function loadScript(src) {
+    if (!loading[src]) {
+      loading[src] = new Promise(function (resolve, reject) {
+        var script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = function () { reject(new Error(src + ' 파일을 불러오지 못했습니다.')); };
+        document.head.appendChild(script);
+      });
+    }
+    return loading[src];
+  }
+
+  // {"$geometry": 해시} 자리에 공유 경계 데이터를 넣음
+  function attachGeometry(traces) {
+    (traces || []).forEach(function (trace) {
+      if (trace.geojson && typeof trace.geojson.$geometry === 'string') {
+        trace.geojson = geometries[trace.geojson.$geometry];
+      }
+    });
+  }
+
+  function show(section, config) {
+    var key = Array.prototype.map.call(section.querySelectorAll('select'), function (select) {
+      return select.value;
+    }).join(',');
+    var entry = config.figures[key];
+    var plot = section.querySelector('.plot');
+    var message = section.querySelector('.message');
+    if (!entry) {
+      Plotly.purge(plot);
+      message.textContent = config.missing;
+      return;
+    }
+    message.textContent = '';
+    Promise.all(entry.geometry.map(function (id) { return loadScript('assets/geometry-' + id + '.js'); }))
+      .then(function () { return loadScript('figures/' + entry.id + '.js'); })
+      .then(function () {
+        var figure = figures[entry.id];
+        attachGeometry(figure.data);
+        (figure.frames || []).forEach(function (frame) { attachGeometry(frame.data); });
+        return Plotly.newPlot(plot, {data: figure.data, layout: figure.layout, frames: figure.frames,
+                                     config: {responsive: true}});
+      })
+      .catch(function (error) { message.textContent = error.message; });
+  }
+
+  document.addEventListener('DOMContentLoaded', function () {
+    document.querySelectorAll('section.chart').forEach(function (section) {
+      var config = JSON.parse(section.querySelector('script[type="application/json"]').textContent);
+      section.querySelectorAll('select').forEach(function (select) {
+        select.addEventListener('change', function () { show(section, config); });
+      });
+      show(section, config);
+    });
+  });
+})();
+"""
+
+def _digest(text, length=16):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:length]
+
+def _script_json(data):
+    """<script> 안에 넣어도 태그가 닫히지 않도록 만든 JSON 문자열"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+def _write_text(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return len(text.encode('utf-8'))
+
+def _value_label(name, value, value_labels):
+    if value in value_labels.get(name, {}):
+        return value_labels[name][value]
+    if name == 'year':
+        return f"{value}년"
+    return str(value)
+
+def _combination_label(params, varying, defaults, value_labels):
+    # 기본값(예: year=None, animate=False)은 이름에서 빼고, 애니메이션은 '모든 연도'로 표시
+    parts = []
+    for name in varying:
+        value = params[name]
+        if name == 'animate':
+            if value:
+                parts.append('모든 연도 (차트 안에서 연도 바꾸기)')
+        elif not (name in defaults and value == defaults[name]):
+            parts.append(_value_label(name, value, value_labels))
+    return ' · '.join(parts) or '기본'
+
+def _default_index(combinations, defaults):
+    """함수 기본값과 가장 많이 같은 조합 (같으면 가장 최근 연도)"""
+    def score(params):
+        matches = sum(1 for name, value in defaults.items() if params.get(name) == value)
+        year = params.get('year')
+        return (matches, year is not None, year or 0)
+    return max(range(len(combinations)), key=lambda i: score(combinations[i]))
+
+def _controls(chart_function, combinations, value_labels):
+    """
+    인자 조합으로 선택 상자 목록과 (선택 값 -> 조합 위치) 표를 만듭니다.
+    조합이 인자별 값의 곱(예: 시도 x 지표)이면 인자마다 선택 상자를 만들고, 아니면(예: 연도별 + 애니메이션) 조합 하나를 고르는 상자를 만듭니다.
+    """
+    if not combinations:
+        return [], {}
+    names = list(combinations[0])
+    values = {name: list(dict.fromkeys(json.dumps(params[name], ensure_ascii=False) for params in combinations)) for name in names}
+    varying = [name for name in names if len(values[name]) > 1]
+    defaults = {name: parameter.default for name, parameter in inspect.signature(chart_function).parameters.items()
+                if parameter.default is not inspect.Parameter.empty}
+    if not varying:
+        return [], {'': 0}
+
+    product = 1
+    for name in varying:
+        product *= len(values[name])
+    default = combinations[_default_index(combinations, defaults)]
+
+    if product == len(combinations):
+        selects, lookup = [], {}
+        for name in varying:
+            options = [json.loads(value) for value in values[name]]
+            selects.append({
+                'label': param_labels.get(name, name),
+                'options': [_value_label(name, value, value_labels) for value in options],
+                'selected': options.index(default[name]),
+            })
+        for index, params in enumerate(combinations):
+            lookup[','.join(str(values[name].index(json.dumps(params[name], ensure_ascii=False))) for name in varying)] = index
+        return selects, lookup
+
+    select = {
+        'label': ' · '.join(param_labels.get(name, name) for name in varying if name != 'animate') or '보기',
+        'options': [_combination_label(params, varying, defaults, value_labels) for params in combinations],
+        'selected': combinations.index(default),
+    }
+    return [select], {str(index): index for index in range(len(combinations))}
+
+class _SiteWriter:
+    """Figure와 공유 경계를 한 번씩만 파일로 쓰고 크기를 기록합니다."""
+
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.geometry_ids = set()
+        self.stats = {'figures': 0, 'figure_bytes': 0, 'geometry_refs': 0, 'geometry_bytes': 0, 'asset_bytes': 0, 'page_bytes': 0}
+
+    def geometry_ref(self, geojson):
+        text = json.dumps(geojson, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        geometry_id = _digest(text)
+        self.stats['geometry_refs'] += 1
+        if geometry_id not in self.geometry_ids:
+            self.geometry_ids.add(geometry_id)
+            self.stats['geometry_bytes'] += _write_text(
+                os.path.join(self.out_dir, 'assets', f'geometry-{geometry_id}.js'),
+                f'registerGeometry("{geometry_id}", {text});\n')
+        return geometry_id
+
+    def _detach_geometry(self, traces, used):
+        for trace in traces or []:
+            if isinstance(trace.get('geojson'), dict):
+                geometry_id = self.geometry_ref(trace['geojson'])
+                trace['geojson'] = {'$geometry': geometry_id}
+                used.append(geometry_id)
+
+    def figure(self, chart, params, fig):
+        """Figure를 figures/에 쓰고 {'id', 'geometry'}를 반환합니다. 지도 경계는 assets/의 공유 파일로 뺍니다."""
+        key = artifact_key(chart, params)
+        figure_id = f"{chart.rsplit('.', 1)[-1]}-{_digest(key, 12)}"
+        spec = json.loads(pio.to_json(fig, validate=False))
+        used = []
+        self._detach_geometry(spec.get('data'), used)
+        for frame in spec.get('frames', []):
+            self._detach_geometry(frame.get('data'), used)
+        self.stats['figures'] += 1
+        self.stats['figure_bytes'] += _write_text(os.path.join(self.out_dir, 'figures', f'{figure_id}.js'),
+                                                  f'registerFigure("{figure_id}", {_script_json(spec)});\n')
+        return {'id': figure_id, 'geometry': list(dict.fromkeys(used))}
+
+def _render_section(writer, section):
+    chart_function = section['chart']
+    chart = chart_function.chart_name
+    combinations = chart_params(chart)
+    figures = {}
+    # 만들 수 있는 조합만 남김 (예: 시군구 경계가 없으면 시설 지도는 없음)
+    available = []
+    for params in combinations:
+        fig = chart_function(**params)
+        if fig is not None:
+            available.append((params, writer.figure(chart, params, fig)))
+    selects, lookup = _controls(chart_function, [params for params, _ in available], section['value_labels'])
+    for selection, index in lookup.items():
+        figures[selection] = available[index][1]
+
+    config = {'figures': figures, 'missing': f"{section['title']} 자료가 없습니다."}
+    controls = []
+    for select in selects:
+        options = ''.join(f'<option value="{i}"{" selected" if i == select["selected"] else ""}>{html.escape(label)}</option>'
+                          for i, label in enumerate(select['options']))
+        controls.append(f'<label>{html.escape(select["label"])} <select>{options}</select></label>')
+    description = f'<p>{html.escape(section["description"])}</p>' if section['description'] else ''
+    return (f'<section class="chart"><h2>{html.escape(section["title"])}</h2>{description}'
+            f'<div class="controls">{"".join(controls)}</div><p class="message"></p><div class="plot"></div>'
+            f'<script type="application/json">{_script_json(config)}</script></section>')
+
+def _render_page(writer, page):
+    active = ' class="active"'
+    nav = ''.join(f'<a href="{other["file"]}"{active if other is page else ""}>{html.escape(other["title"])}</a>'
+                  for other in static_pages)
+    body = ''.join(_render_section(writer, section) for section in page['sections'])
+    if not page['sections']:
+        body = '<ul>' + ''.join(f'<li><a href="{other["file"]}">{html.escape(other["title"])}</a></li>'
+                                for other in static_pages if other['sections']) + '</ul>'
+    description = f'<p>{html.escape(page["description"])}</p>' if page['description'] else ''
+    return ('<!DOCTYPE html>\n<html lang="ko"><head><meta charset="utf-8">'
+            '<meta name="viewport" content="width=device-width, initial-scale=1">'
+            f'<title>{html.escape(page["title"])}</title>'
+            '<link rel="stylesheet" href="assets/site.css">'
+            '<script src="assets/plotly.min.js"></script><script src="assets/site.js"></script></head>'
+            f'<body><nav>{nav}</nav><main><h1>{html.escape(page["title"])}</h1>{description}{body}</main></body></html>\n')
+
+def export_static_site(out_dir=static_site_dir):
+    """
+    모든 페이지를 out_dir에 정적 HTML 사이트로 저장하고 크기 통계(dict)를 반환합니다.
+    Figure는 run_analysis.py가 미리 만들어 둔 것이 있으면 그것을 쓰고, 없으면 직접 만듭니다.
+    out_dir가 이미 있으면 예전에 내보낸 디렉토리일 때만 지우고 다시 만듭니다.
+    """
+    if os.path.exists(out_dir) and os.listdir(out_dir) and not os.path.exists(os.path.join(out_dir, marker_file)):
+        raise FileExistsError(f"'{out_dir}'는 정적 내보내기 디렉토리가 아니어서 덮어쓰지 않습니다. 빈 디렉토리를 지정하세요.")
+
+    tmp_dir = out_dir.rstrip(os.sep) + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_dir, 'assets'))
+    os.makedirs(os.path.join(tmp_dir, 'figures'))
+    writer = _SiteWriter(tmp_dir)
+
+    for name, text in [('plotly.min.js', get_plotlyjs()), ('site.js', site_js), ('site.css', site_css)]:
+        writer.stats['asset_bytes'] += _write_text(os.path.join(tmp_dir, 'assets', name), text)
+    for page in static_pages:
+        writer.stats['page_bytes'] += _write_text(os.path.join(tmp_dir, page['file']), _render_page(writer, page))
+    _write_text(os.path.join(tmp_dir, marker_file), '')
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return {**writer.stats, 'pages': len(static_pages), 'geometries': len(writer.geometry_ids)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대시보드의 모든 페이지와 차트를 정적 HTML 사이트로 저장합니다.")
+    parser.add_argument('--out', default=static_site_dir, help=f"저장할 디렉토리 (기본값: {static_site_dir})")
+    args = parser.parse_args(argv)
+
+    try:
+        stats = export_static_site(os.path.abspath(args.out))
+    except Exception as e:
+        print(f"정적 사이트 내보내기 중 오류 발생: {e}")
+        return 1
+    print(f"정적 사이트 저장 완료 -> '{os.path.abspath(args.out)}'")
+    print(f"- 페이지 {stats['pages']}개: {stats['page_bytes'] / 1024:,.0f} KB")
+    print(f"- Figure {stats['figures']}개: {stats['figure_bytes'] / 1024:,.0f} KB")
+    print(f"- 지도 경계 {stats['geometries']}개 (Figure {stats['geometry_refs']}곳에서 참조): {stats['geometry_bytes'] / 1024:,.0f} KB")
+    print(f"- 공유 스크립트와 스타일: {stats['asset_bytes'] / 1024:,.0f} KB")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,50 +3,35 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.io as pio # Not used directly in the function, but kept for consistency if needed elsewhere
 import os
+from employ_analysis.employ_tables import category_rows
+from employ_analysis.figure_cache import cached_figure
+from employ_analysis.figure_artifacts import year_params
+from employ_analysis.period_index import resolve_column, available_years
+from employ_analysis.year_animation import animate_years
 
-def _get_column_for_year(df, base_col_name, year):
-    """지정된 연도와 기본 컬럼명에 따라 가장 적합한 컬럼명을 찾습니다.
-    하반기(2/2) -> 상반기(1/2) -> 전체 연도 순으로 우선순위를 가집니다.
+@cached_figure('disable_edu', params=lambda: year_params('disable_edu', ['고용률 (%)', '실업률 (%)']))
+def create_edu_plotly_chart(year=None, animate=False):
     """
-    # 2/2 (하반기) 데이터 시도
-    col_name_2_2 = f'{year}.2/2_{base_col_name}'
-    if col_name_2_2 in df.columns:
-        return col_name_2_2
-
-    # 1/2 (상반기) 데이터 시도
-    col_name_1_2 = f'{year}.1/2_{base_col_name}'
-    if col_name_1_2 in df.columns:
-        return col_name_1_2
-
-    # 전체 연도 데이터 시도 (2013-2021년 데이터 형식)
-    col_name_full_year = f'{year}_{base_col_name}'
-    if col_name_full_year in df.columns:
-        return col_name_full_year
-
-    return None # 해당 연도의 컬럼을 찾을 수 없음
+    지정된 연도의 학력 수준별 고용률 및 실업률 데이터를 Plotly로 시각화하여 Figure 객체를 반환합니다.
+    animate가 True이면 모든 연도를 frame으로 담고 연도 슬라이더를 Figure 안에 붙여, 브라우저에서 연도를 바꿀 수 있도록 합니다.
+    (이때 year는 처음 보여 줄 연도이며, 없으면 가장 최근 연도)
+    """
+    if animate:
+        return animate_years(create_edu_plotly_chart, available_years('disable_edu', ['고용률 (%)', '실업률 (%)']), year)
 
-def create_edu_plotly_chart(year):
-    """지정된 연도의 학력 수준별 고용률 및 실업률 데이터를 Plotly로 시각화하여 Figure 객체를 반환합니다."""
-    file_path = 'results/processed_disable_edu.xlsx'
-    if not os.path.exists(file_path):
-        print(f"오류: '{file_path}' 파일을 찾을 수 없습니다.")
+    # '전체' 행을 뺀 구분별 행 (데이터 버전마다 한 번만 만들어 다른 차트와 함께 씀)
+    category_col, df = category_rows('disable_edu')
+    if df is None:
         return None
 
-    df = pd.read_excel(file_path)
-    category_col = df.columns[0]
-    df = df[df[category_col] != '전체'].copy()
-
     # 연도에 맞는 고용률 및 실업률 컬럼 찾기
-    employment_col_name = _get_column_for_year(df, '고용률 (%)', year)
-    unemployment_col_name = _get_column_for_year(df, '실업률 (%)', year)
+    employment_col_name = resolve_column('disable_edu', '고용률 (%)', year)
+    unemployment_col_name = resolve_column('disable_edu', '실업률 (%)', year)
 
     if employment_col_name is None or unemployment_col_name is None:
         print(f"오류: {year}년도에 해당하는 고용률 또는 실업률 컬럼을 찾을 수 없습니다.")
         return None
 
-    df[employment_col_name] = pd.to_numeric(df[employment_col_name], errors='coerce')
-    df[unemployment_col_name] = pd.to_numeric(df[unemployment_col_name], errors='coerce')
-
     fig = go.Figure()
 
     fig.add_trace(go.Bar(
@@ -3,69 +3,55 @@ from pathlib import Path
 import pandas as pd
 import plotly.graph_objects as go
 import os
-
-def _get_column_for_year(df, base_col_name, year):
-    """지정된 연도와 기본 컬럼명에 따라 가장 적합한 컬럼명을 찾습니다.
-    하반기(2/2) -> 상반기(1/2) -> 전체 연도 순으로 우선순위를 가집니다.
+from employ_analysis.employ_tables import category_rows
+from employ_analysis.figure_cache import cached_figure
+from employ_analysis.figure_artifacts import year_params
+from employ_analysis.hover_text import format_template
+from employ_analysis.period_index import resolve_column, available_years
+from employ_analysis.year_animation import animate_years
+
+@cached_figure('disable_sex', params=lambda: year_params('disable_sex', ['경활률 (%)']))
+def create_sex_pie_chart(year=None, animate=False):
     """
-    # 2/2 (하반기) 데이터 시도
-    col_name_2_2 = f'{year}.2/2_{base_col_name}'
-    if col_name_2_2 in df.columns:
-        return col_name_2_2
-
-    # 1/2 (상반기) 데이터 시도
-    col_name_1_2 = f'{year}.1/2_{base_col_name}'
-    if col_name_1_2 in df.columns:
-        return col_name_1_2
-
-    # 전체 연도 데이터 시도 (2013-2021년 데이터 형식)
-    col_name_full_year = f'{year}_{base_col_name}'
-    if col_name_full_year in df.columns:
-        return col_name_full_year
-
-    return None # 해당 연도의 컬럼을 찾을 수 없음
+    지정된 연도의 성별 경제활동참가율 데이터를 Plotly 파이 차트로 시각화하여 Figure 객체를 반환합니다.
+    animate가 True이면 모든 연도를 frame으로 담고 연도 슬라이더를 Figure 안에 붙여, 브라우저에서 연도를 바꿀 수 있도록 합니다.
+    (이때 year는 처음 보여 줄 연도이며, 없으면 가장 최근 연도)
+    """
+    if animate:
+        return animate_years(create_sex_pie_chart, available_years('disable_sex', ['경활률 (%)', '경제활동인구 (명)', '취업자 (명)', '실업자 (명)']), year)
 
-def create_sex_pie_chart(year):
-    """지정된 연도의 성별 경제활동참가율 데이터를 Plotly 파이 차트로 시각화하여 Figure 객체를 반환합니다."""
-    file_path = f"{Path(__file__).parent.parent}/results/processed_disable_sex.xlsx"
-    if not os.path.exists(file_path):
-        print(f"오류: '{file_path}' 파일을 찾을 수 없습니다.")
+    # '전체' 행을 뺀 구분별 행 (데이터 버전마다 한 번만 만들어 다른 차트와 함께 씀)
+    category_col, df = category_rows('disable_sex')
+    if df is None:
         return None
 
-    df = pd.read_excel(file_path)
-    category_col = df.columns[0]
-    df = df[df[category_col] != '전체'].copy() # '전체' 행 제외
-
     # 연도에 맞는 경제활동참가율 컬럼 찾기
-    participation_col_name = _get_column_for_year(df, '경활률 (%)', year)
+    participation_col_name = resolve_column('disable_sex', '경활률 (%)', year)
 
     if participation_col_name is None:
         print(f"오류: {year}년도에 해당하는 경제활동참가율 컬럼을 찾을 수 없습니다.")
         return None
 
-    df[participation_col_name] = pd.to_numeric(df[participation_col_name], errors='coerce')
-    df.dropna(subset=[participation_col_name], inplace=True) # NaN 값 제거
+    df = df.dropna(subset=[participation_col_name]) # NaN 값 제거
 
     # 파이 차트 생성
     # 경제활동인구, 취업자, 실업자 컬럼 찾기
-    eco_active_col_name = _get_column_for_year(df, '경제활동인구 (명)', year)
-    employed_col_name = _get_column_for_year(df, '취업자 (명)', year)
-    unemployed_col_name = _get_column_for_year(df, '실업자 (명)', year)
+    eco_active_col_name = resolve_column('disable_sex', '경제활동인구 (명)', year)
+    employed_col_name = resolve_column('disable_sex', '취업자 (명)', year)
+    unemployed_col_name = resolve_column('disable_sex', '실업자 (명)', year)
 
     if any(col is None for col in [eco_active_col_name, employed_col_name, unemployed_col_name]):
         print(f"오류: {year}년도에 해당하는 경제활동인구, 취업자, 실업자 컬럼 중 일부를 찾을 수 없습니다.")
         return None
 
-    # 숫자형으로 변환 및 NaN 값 제거
-    for col in [eco_active_col_name, employed_col_name, unemployed_col_name]:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    df.dropna(subset=[eco_active_col_name, employed_col_name, unemployed_col_name], inplace=True)
+    # NaN 값 제거 (숫자형 변환은 전처리 단계에서 완료됨)
+    df = df.dropna(subset=[eco_active_col_name, employed_col_name, unemployed_col_name])
 
-    # customdata 준비
-    df_custom = df.apply(
-        lambda row: f"""경제활동인구: {row[eco_active_col_name]:,}명<br>
-        취업자: {row[employed_col_name]:,}명<br>실업자: {row[unemployed_col_name]:,}명""",
-        axis=1)
+    # customdata 준비 (열마다 한 번에 형식화)
+    df_custom = format_template(
+        """경제활동인구: {eco_active:,}명<br>
+        취업자: {employed:,}명<br>실업자: {unemployed:,}명""",
+        eco_active=df[eco_active_col_name], employed=df[employed_col_name], unemployed=df[unemployed_col_name])
 
     fig = go.Figure(data=[go.Pie(
         labels=df[category_col],
@@ -3,52 +3,30 @@ from pathlib import Path
 import pandas as pd
 import plotly.graph_objects as go
 import os
+from employ_analysis.employ_tables import total_row
+from employ_analysis.figure_cache import cached_figure
+from employ_analysis.period_index import resolve_column, available_years
 
-def _get_column_for_year(df, base_col_name, year):
-    """지정된 연도와 기본 컬럼명에 따라 가장 적합한 컬럼명을 찾습니다.
-    하반기(2/2) -> 상반기(1/2) -> 전체 연도 순으로 우선순위를 가집니다.
-    """
-    # 2/2 (하반기) 데이터 시도
-    col_name_2_2 = f'{year}.2/2_{base_col_name}'
-    if col_name_2_2 in df.columns:
-        return col_name_2_2
-
-    # 1/2 (상반기) 데이터 시도
-    col_name_1_2 = f'{year}.1/2_{base_col_name}'
-    if col_name_1_2 in df.columns:
-        return col_name_1_2
-
-    # 전체 연도 데이터 시도 (2013-2021년 데이터 형식)
-    col_name_full_year = f'{year}_{base_col_name}'
-    if col_name_full_year in df.columns:
-        return col_name_full_year
-
-    return None # 해당 연도의 컬럼을 찾을 수 없음
-
+@cached_figure('disable_age', params=lambda: [{}])
 def create_total_activity_time_series_chart():
     """전체 장애인 경제활동인구 및 비경제활동인구의 시계열 데이터를 Plotly 라인 차트로 시각화하여 Figure 객체를 반환합니다."""
-    file_path = f"{Path(__file__).parent.parent}/results/processed_disable_age.xlsx"
-    
-    if not os.path.exists(file_path):
-        print(f"오류: '{file_path}' 파일을 찾을 수 없습니다.")
+    # '전체' 행에서 데이터 추출 (연령별 차트와 같은 데이터를 함께 씀)
+    total_df = total_row('disable_age')
+    if total_df is None:
         return None
 
-    df = pd.read_excel(file_path)
-    
-    # '전체' 행에서 데이터 추출
-    total_df = df[df[df.columns[0]] == '전체'].copy()
-
     if total_df.empty:
         print("오류: '전체' 데이터를 찾을 수 없습니다. 파일 구조를 확인하세요.")
         return None
 
-    years = list(range(2013, 2025))
+    # 두 지표가 모두 있는 연도만 사용
+    years = available_years('disable_age', ['경제활동인구 (명)', '비경제활동인구 (명)'])
     eco_values = []
     none_eco_values = []
 
     for year in years:
-        eco_col = _get_column_for_year(total_df, "경제활동인구 (명)", year)
-        none_eco_col = _get_column_for_year(total_df, "비경제활동인구 (명)", year)
+        eco_col = resolve_column('disable_age', "경제활동인구 (명)", year)
+        none_eco_col = resolve_column('disable_age', "비경제활동인구 (명)", year)
         
         if eco_col and none_eco_col:
             eco_values.append(int(total_df[eco_col].iloc[0]))
@@ -65,8 +43,6 @@ def create_total_activity_time_series_chart():
         '경제활동인구': eco_values,
         '비경제활동인구': none_eco_values
     })
-    time_series_data['경제활동인구'] = pd.to_numeric(time_series_data['경제활동인구'], errors='coerce')
-    time_series_data['비경제활동인구'] = pd.to_numeric(time_series_data['비경제활동인구'], errors='coerce')
     time_series_data.dropna(subset=['경제활동인구', '비경제활동인구'], inplace=True)
 
     if time_series_data.empty:
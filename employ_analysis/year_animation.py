@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import plotly.graph_objects as go
+
+# 연도별 차트를 하나의 Figure로 묶는 도우미
+# 연도마다 만든 Figure의 trace를 Plotly frame으로 넣고 Figure 안에 연도 슬라이더를 붙이므로,
+# 연도를 바꿀 때 Streamlit이 다시 실행되지 않고 브라우저에서 바로 전환됩니다.
+# (disable_pop의 plot_animated_pie_chart와 같은 방식)
+
+# 슬라이더로 연도를 옮길 때의 전환 시간 (ms)
+FRAME_DURATION = 300
+
+def _frame_layout(fig):
+    """연도마다 바뀌는 레이아웃(제목, 서브플롯 제목)만 골라 frame 레이아웃으로 만듭니다."""
+    layout = {'title_text': fig.layout.title.text}
+    if fig.layout.annotations:
+        layout['annotations'] = fig.layout.annotations
+    return layout
+
+def animate_years(build_year, years, active_year=None):
+    """
+    build_year(연도)로 만든 연도별 Figure들을 frame으로 묶은 Figure를 반환합니다.
+    차트를 만들 수 없는 연도는 건너뛰며, 한 해도 없으면 None을 반환합니다.
+    처음 보여 줄 연도(active_year)를 주지 않으면 가장 최근 연도를 보여 줍니다.
+
+    build_year가 반환한 Figure는 수정하지 않으므로 캐시된 Figure를 그대로 넘겨도 됩니다.
+    """
+    figures = {}
+    for year in years:
+        fig = build_year(year)
+        if fig is not None:
+            figures[year] = fig
+    if not figures:
+        return None
+
+    years = list(figures)
+    if active_year not in figures:
+        active_year = years[-1]
+
+    # 처음 보여 줄 연도의 Figure를 복사하여 바탕으로 사용
+    animated = go.Figure(figures[active_year])
+    animated.frames = [go.Frame(data=fig.data, layout=_frame_layout(fig), name=str(year))
+                       for year, fig in figures.items()]
+
+    # 막대 외의 차트(파이, 트리맵)도 바뀌도록 redraw
+    frame_args = dict(mode='immediate',
+                      frame=dict(duration=FRAME_DURATION, redraw=True),
+                      transition=dict(duration=FRAME_DURATION))
+    animated.update_layout(
+        updatemenus=[dict(
+            type="buttons",
+            # 슬라이더 왼쪽에 붙여 표시
+            x=0.08,
+            y=0,
+            xanchor='right',
+            yanchor='top',
+            pad=dict(r=10, t=87),
+            buttons=[dict(label="Play",
+                          method="animate",
+                          args=[None, {**frame_args, "fromcurrent": True}])])
+        ],
+        sliders=[dict(
+            active=years.index(active_year),
+            steps=[dict(method='animate', args=[[str(year)], frame_args], label=str(year)) for year in years],
+            x=0.08,
+            len=0.92,
+            currentvalue=dict(prefix="연도: ", visible=True, xanchor="right"),
+            pad=dict(t=50)
+        )],
+        # 슬라이더가 들어갈 자리를 아래쪽에 확보
+        height=animated.layout.height + 100 if animated.layout.height else None,
+        margin_b=140,
+    )
+    return animated
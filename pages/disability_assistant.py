@@ -1,64 +1,19 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from pathlib import Path
-
-# 데이터 불러오기
-file_path = f"{Path(__file__).parent.parent}/data/Disability_Assistance.csv"
-
-# CSV 데이터 DataFrame으로 변환
-df = pd.read_csv(file_path)
-
-# 전국 데이터 집계
-df_national = df.groupby('년도')[['기초생활수급자 수급자-일반', '기초생활수급자 수급자-중증', '차상위계층 수급자-일반', ' 차상위초과']].sum().reset_index()
-df_national['시도'] = '전국'
+from employ_analysis.assistance_charts import assistance_cities, create_assistance_line_chart
 
 # 시도 선택을 위한 selectbox
-available_cities = df['시도'].unique()
+available_cities = assistance_cities()
 selected_city = st.selectbox('시도를 선택하세요:', ['전국'] + list(available_cities))
 
-# 선택된 시도에 따라 DataFrame 필터링
-if selected_city == '전국':
-    df_selected = df_national
-else:
-    df_selected = df[df['시도'] == selected_city]
-
 # Streamlit 제목
 st.title(f'{selected_city} 기초생활수급자 및 차상위계층 현황')
 
-# y축 범위 조정 함수
-def create_line_chart(df, y_column, title, y_label):
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df['년도'], y=df[y_column], mode='lines', name=y_column))
-
-    # y축 범위 자동 조정
-    min_val = df[y_column].min()
-    max_val = df[y_column].max()
-    range_extension = (max_val - min_val) * 0.1  # 10% 여유
-
-    # X축 범위 설정
-    x_min = df['년도'].min()
-    x_max = 2022  # 2022년도 추가
-    x_range = [x_min, x_max]
-
-    # x축 눈금 값 명시적으로 설정
-    tickvals = sorted(list(df['년도'].unique()) + [x_max])
-    ticktext = [str(year) for year in tickvals]  # 연도를 문자열로 변환
-
-    fig.update_layout(
-        title=title,
-        xaxis_title='년도',
-        yaxis_title=y_label,
-        yaxis=dict(range=[min_val - range_extension, max_val + range_extension]),
-        xaxis = dict(
-            tickmode = 'array',  # tickmode를 'array'로 설정
-            tickvals = tickvals,   # 눈금 값을 명시적으로 설정
-            ticktext = ticktext,   # 눈금 텍스트를 눈금 값과 동일하게 설정
-            range=x_range,          # x축 범위 설정
-        ),
-        font=dict(size=12)  # 폰트 크기를 12pt로 설정 (기본 크기)
-    )
+# 시도와 지표별 차트 (run_analysis.py가 미리 만들어 둔 Figure가 있으면 그것을 사용)
+def create_line_chart(y_column):
+    fig = create_assistance_line_chart(selected_city, y_column)
+    if fig is None:
+        st.warning(f"{selected_city} {y_column.strip()} 자료가 없습니다.")
+        return
     st.plotly_chart(fig)
 
 # 설명 텍스트
@@ -190,13 +145,13 @@ with st.container(): # 전체 컨테이너
         "차상위초과"
     ])
     with tab1:
-        create_line_chart(df_selected, '기초생활수급자 수급자-일반', f'{selected_city} 기초생활수급자 수급자-일반 변화 추이', '수급자 수')
+        create_line_chart('기초생활수급자 수급자-일반')
 
     with tab2:
-        create_line_chart(df_selected, '기초생활수급자 수급자-중증', f'{selected_city} 기초생활수급자 수급자-중증 변화 추이', '수급자 수')
+        create_line_chart('기초생활수급자 수급자-중증')
 
     with tab3:
-        create_line_chart(df_selected, '차상위계층 수급자-일반', f'{selected_city} 차상위계층 수급자-일반 변화 추이', '수급자 수')
+        create_line_chart('차상위계층 수급자-일반')
 
     with tab4:
-        create_line_chart(df_selected, ' 차상위초과', f'{selected_city} 차상위초과 변화 추이', '수급자 수')
+        create_line_chart(' 차상위초과')
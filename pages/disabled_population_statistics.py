@@ -1,30 +1,20 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from employ_analysis.load_data import load_disabled_population_data, load_korea_geojson
+from disable_pop.population_table import population_regions, population_years, population_table
 from disable_pop.visualize_population import plot_animated_pie_chart, plot_national_trend_line_chart, plot_regional_map_chart, plot_gender_trend_line_chart
+from disable_pop.visualize_regional_map_chart import load_regional_map_geometry
 
 st.set_page_config(layout="wide")
 
 st.title("장애인구 통계 분석")
 
-@st.cache_data
-def load_data():
-    return load_disabled_population_data()
-
-@st.cache_data
-def load_geojson():
-    return load_korea_geojson()
-
-df = load_data()
-geojson_data = load_geojson()
-
-if df is not None and geojson_data is not None:
-    # '전국' 데이터 필터링
-    df_national = df[df['시도별'] == '전국'].copy()
-    df_national_total = df_national[df_national['성별'] == '계'].copy()
+# 원본 데이터 탭에서 고를 시도와 연도 (분석 DB에서 목록만 조회)
+# 차트는 미리 만든 Figure를 쓰고, 없을 때만 장애인구 큐브에서 필요한 부분을 잘라 직접 그림
+regions = population_regions()
+years = population_years()
+# 지도 확대 수준에 맞게 단순화한 시도 경계 (단순화 파일이 없으면 원본)
+geojson_data = load_regional_map_geometry()
 
+if regions and years and geojson_data is not None:
     # 탭 생성
     tab1, tab2, tab3, tab4, tab5 = st.tabs([
         "연도별 장애인구 비율",
@@ -35,20 +25,25 @@ if df is not None and geojson_data is not None:
     ])
 
     with tab1:
-        plot_animated_pie_chart(df_national_total)
+        plot_animated_pie_chart()
 
     with tab2:
-        plot_national_trend_line_chart(df_national_total)
+        plot_national_trend_line_chart()
 
     with tab3:
-        plot_regional_map_chart(df, geojson_data)
+        plot_regional_map_chart()
 
     with tab4:
-        plot_gender_trend_line_chart(df)
+        plot_gender_trend_line_chart()
 
     with tab5:
         st.header("원본 데이터 미리보기")
-        st.dataframe(df)
+        col1, col2 = st.columns(2)
+        with col1:
+            region = st.selectbox("시도를 선택하세요:", regions, key='population_region')
+        with col2:
+            year = st.selectbox("연도를 선택하세요:", years, index=len(years) - 1, key='population_year')
+        st.dataframe(population_table(region, year))
 
 else:
     st.error("데이터 또는 GeoJSON 파일을 불러오는데 실패했습니다. 파일 경로 및 내용을 확인해주세요.")
@@ -2,8 +2,6 @@
 import streamlit as st
 import os
 import sys
-from plotly.subplots import make_subplots
-import plotly.graph_objects as go
 
 # 상위 디렉토리를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -16,8 +14,8 @@ from employ_analysis.visualize_type_plotly import create_type_plotly_chart
 from employ_analysis.visualize_region_plotly import create_region_plotly_chart
 from employ_analysis.visualize_sex_pie_plotly import create_sex_pie_chart
 from employ_analysis.visualize_total_eco_activity_time_series import create_total_activity_time_series_chart
-import employ_analysis.visualize_total_eco_activity_time_series as vteats
-print(f"Available in visualize_total_eco_activity_time_series: {dir(vteats)}")
+from employ_analysis.period_index import available_years
+from employ_analysis.employ_tables import dimension_labels, fact_years, fact_table
 
 st.set_page_config(
     page_title="시각화 자료",
@@ -28,6 +26,34 @@ st.set_page_config(
 st.title("📈 시각화 자료")
 st.write("이 페이지에서는 Plotly를 이용한 인터랙티브한 장애인 경제활동 데이터를 시각화한 결과를 볼 수 있습니다.")
 
+# 켜면 각 차트가 모든 연도를 담고 차트 안의 슬라이더로 브라우저에서 연도를 바꿈 (서버에서 다시 그리지 않음)
+client_side_years = st.toggle(
+    "차트 안에서 연도 바꾸기",
+    value=False,
+    help="모든 연도를 한 번에 불러와 차트 안의 슬라이더로 연도를 바꿉니다. 연도를 바꿀 때 페이지를 다시 실행하지 않습니다."
+)
+
+def year_slider(label, dataset, metrics, key):
+    """
+    데이터에 실제로 있는 연도만 고를 수 있는 슬라이더를 그리고 선택된 연도를 반환합니다.
+    차트 안에서 연도를 바꾸는 모드에서는 슬라이더를 그리지 않고 None을 반환합니다.
+    """
+    if client_side_years:
+        return None
+    years = available_years(dataset, metrics)
+    if not years:
+        return None
+    return st.select_slider(
+        label,
+        options=years,
+        value=years[-1], # 기본값은 최신 연도
+        key=key # 고유한 키 추가
+    )
+
+def missing_chart_warning(year, description):
+    """차트를 그릴 자료가 없을 때 경고를 표시합니다."""
+    st.warning(f"{year}년 {description} 자료가 없습니다." if year is not None else f"{description} 자료가 없습니다.")
+
 # 탭 생성
 tab_titles = [
     "0. 연도별 경제활동 및 비경제활동인구수",
@@ -35,7 +61,8 @@ tab_titles = [
     "2. 학력 수준별 고용률 및 실업률",
     "3. 성별 경제활동 지표",
     "4. 장애 유형별 고용률",
-    "5. 권역별 취업자 수 분포"
+    "5. 권역별 취업자 수 분포",
+    "6. 원본 데이터"
 ]
 
 tabs = st.tabs(tab_titles)
@@ -52,98 +79,77 @@ with tabs[0]:
 with tabs[1]:
     st.header("연령별 고용률 및 실업률")
     st.write("장애인의 연령대별 고용률과 실업률을 보여주는 인터랙티브 막대 그래프입니다.")
-    age_year = st.slider(
-        "연령별 데이터를 보고 싶은 연도를 선택하세요:",
-        min_value=2013,
-        max_value=2024,
-        value=2024, # 기본값은 최신 연도
-        step=1,
-        key='age_year_slider' # 고유한 키 추가
-    )
-    fig_age = create_age_plotly_chart(age_year)
+    age_year = year_slider("연령별 데이터를 보고 싶은 연도를 선택하세요:", 'disable_age', ['고용률 (%)', '실업률 (%)'], 'age_year_slider')
+    fig_age = create_age_plotly_chart(age_year, animate=client_side_years)
     if fig_age:
         st.plotly_chart(fig_age, use_container_width=True)
     else:
-        st.warning(f"{age_year}년 연령별 고용률 및 실업률 자료가 없습니다.")
+        missing_chart_warning(age_year, "연령별 고용률 및 실업률")
 
 with tabs[2]:
     st.header("학력 수준별 고용률 및 실업률")
     st.write("장애인의 학력 수준에 따른 고용률과 실업률을 비교하는 인터랙티브 막대 그래프입니다.")
-    edu_year = st.slider(
-        "학력별 데이터를 보고 싶은 연도를 선택하세요:",
-        min_value=2013,
-        max_value=2024,
-        value=2024, # 기본값은 최신 연도
-        step=1,
-        key='edu_year_slider' # 고유한 키 추가
-    )
-    fig_edu = create_edu_plotly_chart(edu_year)
+    edu_year = year_slider("학력별 데이터를 보고 싶은 연도를 선택하세요:", 'disable_edu', ['고용률 (%)', '실업률 (%)'], 'edu_year_slider')
+    fig_edu = create_edu_plotly_chart(edu_year, animate=client_side_years)
     if fig_edu:
         st.plotly_chart(fig_edu, use_container_width=True)
     else:
-        st.warning(f"{edu_year}년 학력 수준별 고용률 및 실업률 자료가 없습니다.")
+        missing_chart_warning(edu_year, "학력 수준별 고용률 및 실업률")
 
 with tabs[3]:
     st.header("성별 경제활동 지표")
     st.write("남성 장애인과 여성 장애인의 경제활동참가율 및 분포를 비교하는 인터랙티브 그래프입니다.")
-    sex_year = st.slider(
-        "성별 데이터를 보고 싶은 연도를 선택하세요:",
-        min_value=2013,
-        max_value=2024,
-        value=2024, # 기본값은 최신 연도
-        step=1,
-        key='sex_year_slider' # 고유한 키 추가
-    )
+    sex_year = year_slider("성별 데이터를 보고 싶은 연도를 선택하세요:", 'disable_sex', ['경활률 (%)'], 'sex_year_slider')
 
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("성별 경제활동참가율 (막대 그래프)")
-        fig_sex_bar = create_sex_plotly_chart(sex_year)
+        fig_sex_bar = create_sex_plotly_chart(sex_year, animate=client_side_years)
         if fig_sex_bar:
             st.plotly_chart(fig_sex_bar, use_container_width=True)
         else:
-            st.warning(f"{sex_year}년 성별 경제활동참가율 자료가 없습니다.")
+            missing_chart_warning(sex_year, "성별 경제활동참가율")
 
     with col2:
         st.subheader("성별 경제활동참가율 분포 (파이 차트)")
-        fig_sex_pie = create_sex_pie_chart(sex_year)
+        fig_sex_pie = create_sex_pie_chart(sex_year, animate=client_side_years)
         if fig_sex_pie:
             st.plotly_chart(fig_sex_pie, use_container_width=True)
         else:
-            st.warning(f"{sex_year}년 성별 경제활동참가율 분포 자료가 없습니다.")
+            missing_chart_warning(sex_year, "성별 경제활동참가율 분포")
 
 with tabs[4]:
     st.header("장애 유형별 고용률")
     st.write("다양한 장애 유형별 고용률을 보여주는 인터랙티브 막대 그래프입니다.")
-    type_year = st.slider(
-        "장애 유형별 데이터를 보고 싶은 연도를 선택하세요:",
-        min_value=2013,
-        max_value=2024,
-        value=2024, # 기본값은 최신 연도
-        step=1,
-        key='type_year_slider' # 고유한 키 추가
-    )
-    fig_type = create_type_plotly_chart(type_year)
+    type_year = year_slider("장애 유형별 데이터를 보고 싶은 연도를 선택하세요:", 'disable_type', ['고용률 (%)'], 'type_year_slider')
+    fig_type = create_type_plotly_chart(type_year, animate=client_side_years)
     if fig_type:
         st.plotly_chart(fig_type, use_container_width=True)
     else:
-        st.warning(f"{type_year}년 장애 유형별 고용률 자료가 없습니다.")
+        missing_chart_warning(type_year, "장애 유형별 고용률")
 
 with tabs[5]:
     st.header("권역별 장애인 취업자 수 분포")
     st.write("대한민국 주요 권역별 장애인 취업자 수의 상대적 비율을 시각화한 인터랙티브 트리맵입니다.")
-    region_year = st.slider(
-        "권역별 데이터를 보고 싶은 연도를 선택하세요:",
-        min_value=2020,
-        max_value=2024,
-        value=2024, # 기본값은 최신 연도
-        step=1,
-        key='region_year_slider' # 고유한 키 추가
-    )
-    fig_region = create_region_plotly_chart(region_year)
+    region_year = year_slider("권역별 데이터를 보고 싶은 연도를 선택하세요:", 'disable_region', ['취업자 (명)'], 'region_year_slider')
+    fig_region = create_region_plotly_chart(region_year, animate=client_side_years)
     if fig_region:
         st.plotly_chart(fig_region, use_container_width=True)
     else:
-        st.warning(f"{region_year}년 권역별 장애인 취업자 수 분포 자료가 없습니다.")
+        missing_chart_warning(region_year, "권역별 장애인 취업자 수 분포")
 
+with tabs[6]:
+    st.header("원본 데이터")
+    st.write("고른 구분과 연도의 고용 지표만 분석 DB에서 조회하여 보여줍니다.")
+    col1, col2 = st.columns(2)
+    with col1:
+        dimension = st.selectbox("구분을 선택하세요:", list(dimension_labels), format_func=dimension_labels.get, key='facts_dimension')
+    fact_year_options = fact_years(dimension)
+    with col2:
+        fact_year = st.selectbox("연도를 선택하세요:", fact_year_options, index=len(fact_year_options) - 1, key='facts_year') if fact_year_options else None
+    df_facts = fact_table(dimension, fact_year) if fact_year is not None else None
+    if df_facts is not None and not df_facts.empty:
+        st.dataframe(df_facts)
+    else:
+        missing_chart_warning(fact_year, f"{dimension_labels[dimension]} 고용 지표")
@@ -1,10 +1,6 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import json
-import requests
-import os
-from pathlib import Path
+from employ_analysis.facility_charts import create_facility_need_map
+from employ_analysis.geometry import fetch_status
 
 # 페이지 설정
 st.set_page_config(
@@ -27,95 +23,23 @@ st.markdown(
 st.title("🗺️ 장애인 시설 필요도 지도")
 st.write("이 페이지에서는 보건복지부 데이터를 기반으로 한 장애인 시설의 필요도를 지도에서 확인할 수 있습니다.")
 
-# Define data paths
-data_dir = f"{Path(__file__).parent.parent}/data/"
-sigungu_population_file = data_dir + '시군구별_장애정도별_성별_등록장애인수_20250717111030.csv'
-weekly_facilities_file   = data_dir + 'disability_facilities.csv'
-welfare_facilities_file  = data_dir + '보건복지부_장애인복지관 현황_20240425_utf8.csv'
-
-# --- Load Data ---
-@st.cache_data
-def load_data():
-    try:
-        df_sigungu_population = pd.read_csv(sigungu_population_file, encoding='utf-8-sig', header=2)
-        df_weekly_facilities  = pd.read_csv(weekly_facilities_file, encoding='utf-8-sig')
-        df_welfare_facilities = pd.read_csv(welfare_facilities_file, encoding='utf-8-sig')
-        return df_sigungu_population, df_weekly_facilities, df_welfare_facilities
-    except Exception as e:
-        st.error(f"데이터 파일을 읽는 중 오류가 발생했습니다: {e}")
-        return None, None, None
-
-df_sigungu_population, df_weekly_facilities, df_welfare_facilities = load_data()
-
-# --- Load GeoJSON ---
-@st.cache_data
-def load_geojson():
-    geojson_url ="https://raw.githubusercontent.com/southkorea/southkorea-maps/master/kostat/2013/json/skorea_municipalities_geo_simple.json"  
-    try:
-        resp = requests.get(geojson_url)
-        resp.raise_for_status()
-        return json.loads(resp.content.decode('utf-8'))
-    except Exception as e:
-        st.error(f"GeoJSON 데이터를 불러오는 중 오류가 발생했습니다: {e}")
-        return None
-
-geojson = load_geojson()
-
-#--- Common Data Standardization Function ---
-def standardize_facilities_data(df_raw, facility_type, level='province'):
-    short_to_full = {
-        '서울':'서울특별시','부산':'부산광역시','대구':'대구광역시',
-        '인천':'인천광역시','광주':'광주광역시','대전':'대전광역시',
-        '울산':'울산광역시','세종':'세종시','경기':'경기도',
-        '강원':'강원도','충북':'충청북도','충남':'충청남도',
-        '전북':'전라북도','전남':'전라남도','경북':'경상북도',
-        '경남':'경상남도','제주':'제주특별자치도'
-    }
-    df_raw['시도_전체이름'] = df_raw['시도'].str.strip().map(short_to_full)
-    if level=='province':
-        df = (df_raw.groupby('시도_전체이름')
-                     .size()
-                     .reset_index(name=f'{facility_type}수')
-                     .rename(columns={'시도_전체이름':'시도'}))
-    else:
-        df_raw['시군구_전체이름'] = df_raw['시도_전체이름'] + ' ' + df_raw['시군구']
-        df = (df_raw.groupby('시군구_전체이름')
-                  .size()
-                  .reset_index(name=f'{facility_type}수'))
-    return df
-
-# --- Process Sigungu Population Data ---
-@st.cache_data
-def process_sigungu_population_data(df_pop):
-    df_pop.columns = [
-        '시도_대분류','시군구','총인구_소계','총인구_남자','총인구_여자',
-        '심한장애_소계','심한장애_남자','심한장애_여자',
-        '심하지않은장애_소계','심하지않은장애_남자','심하지않은장애_여자'
-    ]
-    df = df_pop[~df_pop['시도_대분류'].isin(['전국'])]
-    df = df[~df['시군구'].isin(['소계'])]
-    df = df[['시도_대분류','시군구','총인구_소계']].copy()
-    df['총인구_소계'] = pd.to_numeric(df['총인구_소계'], errors='coerce')
-    df.dropna(subset=['총인구_소계'], inplace=True)
-    return df
-
-if df_sigungu_population is not None and df_weekly_facilities is not None and df_welfare_facilities is not None and geojson:
-    # 인구 데이터 전처리
-    df_pop = process_sigungu_population_data(df_sigungu_population)
-    df_pop['시군구_전체이름'] = df_pop['시도_대분류'] + ' ' + df_pop['시군구']
-
-    # 주간시설 필요도 계산
-    df_weekly = standardize_facilities_data(df_weekly_facilities, '주간이용시설', level='sigungu')
-    df_weekly = pd.merge(df_pop, df_weekly, on='시군구_전체이름', how='left')
-    df_weekly['주간이용시설수']      = df_weekly['주간이용시설수'].fillna(0).astype(int)
-    df_weekly['주간이용시설필요지수'] = df_weekly['총인구_소계'] / (df_weekly['주간이용시설수'] + 1)
-
-    # 복지관 필요도 계산
-    df_welfare = standardize_facilities_data(df_welfare_facilities, '복지관', level='sigungu')
-    df_welfare = pd.merge(df_pop, df_welfare, on='시군구_전체이름', how='left')
-    df_welfare['복지관수']      = df_welfare['복지관수'].fillna(0).astype(int)
-    df_welfare['복지관필요지수'] = df_welfare['총인구_소계'] / (df_welfare['복지관수'] + 1)
-
+# --- Load Figures ---
+# 시군구별 필요도 지도 (run_analysis.py가 미리 만들어 둔 Figure가 있으면 그것을 사용)
+# 시군구 경계는 로컬 파일(배포 파일 또는 검증된 캐시)에서만 읽고, 없으면 백그라운드 다운로드를 시작한 뒤 바로 반환
+fig = create_facility_need_map('weekly')
+fig2 = create_facility_need_map('welfare')
+
+def show_geometry_status():
+    state, message = fetch_status('municipalities')
+    if state == 'fetching':
+        st.info("시군구 경계 데이터를 백그라운드에서 내려받는 중입니다. 잠시 후 페이지를 새로고침해 주세요.")
+    elif state == 'failed':
+        st.error(f"GeoJSON 데이터를 불러오는 중 오류가 발생했습니다: {message}")
+    elif state == 'missing':
+        st.error("시군구 경계 파일(data/skorea_municipalities_geo_simple.json)이 없습니다. "
+                 "python employ_analysis/municipal_geometry.py를 실행하여 다시 만드세요.")
+
+if fig is not None and fig2 is not None:
     # 탭 생성 및 지도 그리기
     tab3, tab4 = st.tabs(["시군구별 주간이용시설 필요도", "시군구별 장애인복지관 필요도"])
     with tab3:
@@ -139,30 +63,6 @@ if df_sigungu_population is not None and df_weekly_facilities is not None and df
               경우 0으로 나누는 것을 방지하고, 시설이 없는
               지역의 필요도를 가장 높게 평가하기 위함입니다.
             """)
-        fig = px.choropleth(
-            df_weekly,
-            geojson=geojson,
-            locations='시군구',
-            featureidkey="properties.name",
-            color='주간이용시설필요지수',
-            hover_name='시군구',
-            hover_data={
-                '총인구_소계':':,',
-                '주간이용시설수':':,',
-                '주간이용시설필요지수':':.2f'
-            },
-            color_continuous_scale="Reds"
-        )
-        fig.update_geos(visible=False,
-                        projection_type="mercator",
-                        center=dict(lat=36, lon=127.5),
-                        lonaxis_range=[124,132],
-                        lataxis_range=[33,39])
-        fig.update_layout(
-            margin={"r":0,"t":0,"l":0,"b":0},
-            height=800,
-            coloraxis_colorbar=dict(len=0.7, y=0.6)
-        )
         st.plotly_chart(fig, use_container_width=True)
 
     with tab4:
@@ -185,31 +85,8 @@ if df_sigungu_population is not None and df_weekly_facilities is not None and df
               경우 0으로 나누는 것을 방지하고, 시설이 없는
               지역의 필요도를 가장 높게 평가하기 위함입니다.
             """)
-        fig2 = px.choropleth(
-            df_welfare,
-            geojson=geojson,
-            locations='시군구',
-            featureidkey="properties.name",
-            color='복지관필요지수',
-            hover_name='시군구',
-            hover_data={
-                '총인구_소계':':,',
-                '복지관수':':,',
-                '복지관필요지수':':.2f'
-            },
-            color_continuous_scale="Blues"
-        )
-        fig2.update_geos(visible=False,
-                         projection_type="mercator",
-                         center=dict(lat=36, lon=127.5),
-                         lonaxis_range=[124,132],
-                         lataxis_range=[33,39])
-        fig2.update_layout(
-            margin={"r":0,"t":0,"l":0,"b":0},
-            height=800,
-            coloraxis_colorbar=dict(len=0.7, y=0.6)
-        )
         st.plotly_chart(fig2, use_container_width=True)
 
 else:
+    show_geometry_status()
     st.warning("데이터 또는 GeoJSON을 불러오지 못하여 지도를 표시할 수 없습니다.")
\ No newline at end of file